@@ -1,10 +1,17 @@
+import asyncio
 from contextlib import asynccontextmanager
 import os
 
 from fastapi import FastAPI
 
 from services.database import create_db_and_tables
-from utils.get_env import get_app_data_directory_env
+from services.docling_pool_service import DOCLING_POOL_SERVICE
+from services.http_client_service import HTTP_CLIENT
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
+from services.pptx_presentation_creator import reset_picture_process_pool
+from services.presentation_generation_worker import PresentationGenerationWorker
+from utils.get_env import get_app_data_directory_env, get_run_presentation_worker_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
 )
@@ -19,5 +26,23 @@ async def app_lifespan(_: FastAPI):
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)  # 创建应用数据目录
     await create_db_and_tables()  # 创建数据库表
+    ICON_FINDER_SERVICE.start_initialization()  # 后台加载图标索引，不阻塞启动
+    DOCLING_POOL_SERVICE.start_warm_up()  # 后台预热文档解析进程
     await check_llm_and_image_provider_api_or_model_availability()  # 检查LLM模型和图片提供者API的可用性
+
+    # 默认在 API 进程内处理异步生成任务，单独运行 worker.py 时可关闭
+    worker = None
+    worker_task = None
+    if get_run_presentation_worker_env() != "false":
+        worker = PresentationGenerationWorker()
+        worker_task = asyncio.create_task(worker.run())
+
     yield
+
+    if worker:
+        worker.stop()
+        await worker_task
+    reset_picture_process_pool()  # 关闭导出图片处理进程池
+    DOCLING_POOL_SERVICE.shutdown()  # 关闭文档解析进程池
+    PPTX_EXPORT_SERVICE.shutdown()
+    await HTTP_CLIENT.close()
@@ -1,14 +1,19 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from utils.get_env import get_can_change_keys_env
-from utils.user_config import update_env_with_user_config
+from services.user_config_service import USER_CONFIG_SERVICE
 
 
-class UserConfigEnvUpdateMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # 如果可以更改密钥，则更新用户配置
-        if get_can_change_keys_env() != "false":
-            update_env_with_user_config()
-        return await call_next(request)
+class UserConfigEnvUpdateMiddleware:
+    """
+    Plain ASGI middleware, messages of the response are passed through as
+    they are so streamed responses aren't buffered or wrapped in a task.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            # 配置文件变化时才重新加载，并丢弃缓存的 LLM 客户端
+            USER_CONFIG_SERVICE.refresh()
+        await self.app(scope, receive, send)
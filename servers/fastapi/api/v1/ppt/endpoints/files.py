@@ -5,6 +5,8 @@ from fastapi import APIRouter, Body, File, UploadFile
 
 from constants.documents import UPLOAD_ACCEPTED_FILE_TYPES
 from models.decomposed_file_info import DecomposedFileInfo
+from models.docling_pool_status import DoclingPoolStatus
+from services.docling_pool_service import DOCLING_POOL_SERVICE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.documents_loader import DocumentsLoader
 import uuid
@@ -85,3 +87,8 @@ async def update_files(
         f.write(await file.read())
 
     return {"message": "File updated successfully"}
+
+
+@FILES_ROUTER.get("/parser/status", response_model=DoclingPoolStatus)
+async def get_parser_status():
+    return await DOCLING_POOL_SERVICE.check_health()
@@ -21,7 +21,10 @@ async def generate_image(
 ):
     images_directory = get_images_directory()
     image_prompt = ImagePrompt(prompt=prompt)
-    image_generation_service = ImageGenerationService(images_directory)
+    # 用户主动生成图片时总是生成新图
+    image_generation_service = ImageGenerationService(
+        images_directory, reuse_assets=False
+    )
 
     image = await image_generation_service.generate_image(image_prompt)
     if not isinstance(image, ImageAsset):
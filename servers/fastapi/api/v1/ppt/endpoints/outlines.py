@@ -16,7 +16,6 @@ from models.sse_response import (
     SSEResponse,
     SSEStatusResponse,
 )
-from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
 from services.documents_loader import DocumentsLoader
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
@@ -34,8 +33,6 @@ async def stream_outlines(
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-
     async def inner():
         yield SSEStatusResponse(
             status="Generating presentation outlines..."
@@ -43,11 +40,9 @@ async def stream_outlines(
 
         additional_context = ""
         if presentation.file_paths:
+            # Outlines start once the documents fill the context budget
             documents_loader = DocumentsLoader(file_paths=presentation.file_paths)
-            await documents_loader.load_documents(temp_dir)
-            documents = documents_loader.documents
-            if documents:
-                additional_context = "\n\n".join(documents)
+            additional_context = await documents_loader.load_context()
 
         presentation_outlines_text = ""
 
@@ -13,6 +13,7 @@ import xml.etree.ElementTree as ET
 import re
 
 from services.documents_loader import DocumentsLoader
+from services.http_client_service import HTTP_CLIENT
 from utils.asset_directory_utils import get_images_directory
 import uuid
 from constants.documents import POWERPOINT_TYPES
@@ -229,11 +230,10 @@ async def check_google_font_availability(font_name: str) -> bool:
         formatted_name = font_name.replace(" ", "+")
         url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
+        async with HTTP_CLIENT.head(
+            url, timeout=aiohttp.ClientTimeout(total=10), trust_env=False
+        ) as response:
+            return response.status == 200
 
     except Exception as e:
         print(f"Error checking Google Font availability for {font_name}: {e}")
@@ -7,12 +7,16 @@ import random
 import traceback
 from typing import Annotated, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy import delete
+from sqlalchemy import delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from constants.presentation import DEFAULT_TEMPLATES
+from constants.presentation import (
+    DEFAULT_PRESENTATION_PAGE_SIZE,
+    DEFAULT_TEMPLATES,
+    MAX_PRESENTATION_PAGE_SIZE,
+)
 from enums.webhook_event import WebhookEvent
 from models.api_error_model import APIErrorModel
 from models.generate_presentation_request import GeneratePresentationRequest
@@ -24,9 +28,16 @@ from models.presentation_outline_model import (
 )
 from enums.tone import Tone
 from enums.verbosity import Verbosity
+from models.pptx_export_status import PptxExportStatus
 from models.pptx_models import PptxPresentationModel
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
+from models.presentation_summary import (
+    PresentationCount,
+    PresentationSummary,
+    PresentationSummaryPage,
+    SlideThumbnail,
+)
 from models.presentation_with_slides import (
     PresentationWithSlides,
 )
@@ -45,7 +56,10 @@ from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSERespon
 from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.presentation_generation_queue import PRESENTATION_GENERATION_QUEUE
 from models.sql.presentation import PresentationModel
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
@@ -57,6 +71,9 @@ from utils.llm_calls.generate_presentation_structure import (
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
 )
+from utils.llm_provider import get_slide_generation_concurrency
+from utils.pagination import decode_cursor, encode_cursor
+from utils.slide_diff import save_slides_diff
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
     select_toc_or_list_slide_layout_index,
@@ -71,12 +88,24 @@ import uuid
 PRESENTATION_ROUTER = APIRouter(prefix="/presentation", tags=["Presentation"])
 
 
+# Columns listed instead of the whole model so outlines, layout and structure are never loaded
+PRESENTATION_LIST_COLUMNS = (
+    PresentationModel.id,
+    PresentationModel.content,
+    PresentationModel.n_slides,
+    PresentationModel.language,
+    PresentationModel.title,
+    PresentationModel.created_at,
+    PresentationModel.updated_at,
+    PresentationModel.tone,
+    PresentationModel.verbosity,
+)
+
+
 @PRESENTATION_ROUTER.get("/all", response_model=List[PresentationWithSlides])
 async def get_all_presentations(sql_session: AsyncSession = Depends(get_async_session)):
-    presentations_with_slides = []
-
     query = (
-        select(PresentationModel, SlideModel)
+        select(*PRESENTATION_LIST_COLUMNS, SlideModel)
         .join(
             SlideModel,
             (SlideModel.presentation == PresentationModel.id) & (SlideModel.index == 0),
@@ -85,17 +114,89 @@ async def get_all_presentations(sql_session: AsyncSession = Depends(get_async_se
     )
 
     results = await sql_session.execute(query)
-    rows = results.all()
     presentations_with_slides = [
         PresentationWithSlides(
-            **presentation.model_dump(),
-            slides=[first_slide],
+            **{
+                column.key: row[i] for i, column in enumerate(PRESENTATION_LIST_COLUMNS)
+            },
+            slides=[row[-1]],
         )
-        for presentation, first_slide in rows
+        for row in results.all()
     ]
     return presentations_with_slides
 
 
+@PRESENTATION_ROUTER.get("/list", response_model=PresentationSummaryPage)
+async def list_presentations(
+    limit: int = Query(
+        default=DEFAULT_PRESENTATION_PAGE_SIZE, ge=1, le=MAX_PRESENTATION_PAGE_SIZE
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor of the previous page"
+    ),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    query = (
+        select(
+            PresentationModel.id,
+            PresentationModel.title,
+            PresentationModel.n_slides,
+            PresentationModel.language,
+            PresentationModel.created_at,
+            PresentationModel.updated_at,
+            SlideModel.id,
+            SlideModel.layout_group,
+            SlideModel.layout,
+        )
+        .join(
+            SlideModel,
+            (SlideModel.presentation == PresentationModel.id) & (SlideModel.index == 0),
+        )
+        .order_by(PresentationModel.created_at.desc(), PresentationModel.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            (PresentationModel.created_at < cursor_created_at)
+            | (
+                (PresentationModel.created_at == cursor_created_at)
+                & (PresentationModel.id < cursor_id)
+            )
+        )
+
+    rows = (await sql_session.execute(query)).all()
+    items = [
+        PresentationSummary(
+            id=row[0],
+            title=row[1],
+            n_slides=row[2],
+            language=row[3],
+            created_at=row[4],
+            updated_at=row[5],
+            thumbnail=SlideThumbnail(id=row[6], layout_group=row[7], layout=row[8]),
+        )
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return PresentationSummaryPage(items=items, next_cursor=next_cursor)
+
+
+@PRESENTATION_ROUTER.get("/count", response_model=PresentationCount)
+async def count_presentations(sql_session: AsyncSession = Depends(get_async_session)):
+    count = await sql_session.scalar(
+        select(func.count(PresentationModel.id)).join(
+            SlideModel,
+            (SlideModel.presentation == PresentationModel.id) & (SlideModel.index == 0),
+        )
+    )
+    return PresentationCount(count=count)
+
+
 @PRESENTATION_ROUTER.get("/{id}", response_model=PresentationWithSlides)
 async def get_presentation(
     id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
@@ -124,6 +225,7 @@ async def delete_presentation(
 
     await sql_session.delete(presentation)
     await sql_session.commit()
+    await EXPORT_CACHE_SERVICE.invalidate(id)
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -257,7 +359,9 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream/{id}", response_model=PresentationWithSlides)
 async def stream_presentation(
-    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+    id: uuid.UUID,
+    concurrency: Optional[int] = None,
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
     presentation = await sql_session.get(PresentationModel, id)
     if not presentation:
@@ -272,8 +376,16 @@ async def stream_presentation(
             status_code=400,
             detail="Outlines can not be empty",
         )
+    if concurrency is not None and concurrency < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Concurrency must be greater than 0",
+        )
 
     image_generation_service = ImageGenerationService(get_images_directory())
+    slide_generation_semaphore = asyncio.Semaphore(
+        concurrency or get_slide_generation_concurrency()
+    )
 
     async def inner():
         structure = presentation.get_structure()
@@ -283,15 +395,9 @@ async def stream_presentation(
         # These tasks will be gathered and awaited after all slides are generated
         async_assets_generation_tasks = []
 
-        slides: List[SlideModel] = []
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
-        ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
+        async def generate_slide(i: int, slide_layout_index: int) -> SlideModel:
             slide_layout = layout.slides[slide_layout_index]
-
-            try:
+            async with slide_generation_semaphore:
                 slide_content = await get_slide_content_from_type_and_outline(
                     slide_layout,
                     outline.slides[i],
@@ -300,9 +406,6 @@ async def stream_presentation(
                     presentation.verbosity,
                     presentation.instructions,
                 )
-            except HTTPException as e:
-                yield SSEErrorResponse(detail=e.detail).to_string()
-                return
 
             slide = SlideModel(
                 presentation=id,
@@ -312,20 +415,52 @@ async def stream_presentation(
                 speaker_note=slide_content.get("__speaker_note__", ""),
                 content=slide_content,
             )
-            slides.append(slide)
 
             # This will mutate slide and add placeholder assets
             process_slide_add_placeholder_assets(slide)
+            return slide
 
-            # This will mutate slide
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
-            )
+        slides: List[Optional[SlideModel]] = [None] * len(structure.slides)
+        slide_generation_tasks = [
+            asyncio.create_task(generate_slide(i, slide_layout_index))
+            for i, slide_layout_index in enumerate(structure.slides)
+        ]
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+        yield SSEResponse(
+            event="response",
+            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
+        ).to_string()
+
+        try:
+            # Slides are emitted as soon as they finish, tagged with their index
+            for next_slide in asyncio.as_completed(slide_generation_tasks):
+                try:
+                    slide = await next_slide
+                except HTTPException as e:
+                    yield SSEErrorResponse(detail=e.detail).to_string()
+                    return
+
+                slides[slide.index] = slide
+
+                # This will mutate slide
+                async_assets_generation_tasks.append(
+                    process_slide_and_fetch_assets(image_generation_service, slide)
+                )
+
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps(
+                        {
+                            "type": "chunk",
+                            "index": slide.index,
+                            "chunk": slide.model_dump_json(),
+                        }
+                    ),
+                ).to_string()
+        finally:
+            # Stops pending generations on error or client disconnect
+            for task in slide_generation_tasks:
+                task.cancel()
 
         yield SSEResponse(
             event="response",
@@ -347,6 +482,7 @@ async def stream_presentation(
         sql_session.add_all(slides)
         sql_session.add_all(generated_assets)
         await sql_session.commit()
+        await EXPORT_CACHE_SERVICE.invalidate(id)
 
         response = PresentationWithSlides(
             **presentation.model_dump(),
@@ -379,8 +515,10 @@ async def update_presentation(
     if title:
         presentation_update_dict["title"] = title
 
+    is_changed = False
     if n_slides or title:
         presentation.sqlmodel_update(presentation_update_dict)
+        is_changed = True
 
     if slides:
         # Just to make sure id is UUID
@@ -388,12 +526,12 @@ async def update_presentation(
             slide.presentation = uuid.UUID(slide.presentation)
             slide.id = uuid.UUID(slide.id)
 
-        await sql_session.execute(
-            delete(SlideModel).where(SlideModel.presentation == presentation.id)
-        )
-        sql_session.add_all(slides)
+        slides_diff = await save_slides_diff(sql_session, presentation.id, slides)
+        is_changed = is_changed or not slides_diff.is_empty()
 
     await sql_session.commit()
+    if is_changed:
+        await EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return PresentationWithSlides(
         **presentation.model_dump(),
@@ -407,18 +545,22 @@ async def export_presentation_as_pptx(
 ):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
-
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+
+    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    await pptx_creator.create_and_save_ppt(pptx_path)
 
     return pptx_path
 
 
+@PRESENTATION_ROUTER.get("/export/status", response_model=PptxExportStatus)
+async def get_pptx_export_status():
+    return PPTX_EXPORT_SERVICE.get_status()
+
+
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
 async def export_presentation_as_pptx_or_pdf(
     id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
@@ -492,6 +634,7 @@ async def generate_presentation_handler(
     presentation_id: uuid.UUID,
     async_status: Optional[AsyncPresentationGenerationTaskModel],
     sql_session: AsyncSession = Depends(get_async_session),
+    is_last_attempt: bool = True,
 ):
     try:
         using_slides_markdown = False
@@ -512,10 +655,7 @@ async def generate_presentation_handler(
 
             if request.files:
                 documents_loader = DocumentsLoader(file_paths=request.files)
-                await documents_loader.load_documents()
-                documents = documents_loader.documents
-                if documents:
-                    additional_context = "\n\n".join(documents)
+                additional_context = await documents_loader.load_context()
 
             # Finding number of slides to generate by considering table of contents
             n_slides_to_generate = request.n_slides
@@ -665,72 +805,57 @@ async def generate_presentation_handler(
 
         # Updating async status
         if async_status:
-            async_status.message = "Generating slides"
+            async_status.message = "Generating slides and fetching assets"
             async_status.updated_at = datetime.now()
             sql_session.add(async_status)
             await sql_session.commit()
 
-        image_generation_service = ImageGenerationService(get_images_directory())
-        async_assets_generation_tasks = []
-
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[SlideModel] = []
+        image_generation_service = ImageGenerationService(
+            get_images_directory(), reuse_assets=request.reuse_assets
+        )
 
+        # 7. Generate slide content with bounded concurrency, then build slides and fetch assets
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
+        slides: List[Optional[SlideModel]] = [None] * len(slide_layouts)
 
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
-
-            print(f"Generating slides from {start} to {end}")
+        # Next slide starts as soon as any slot frees up instead of waiting for a whole batch
+        concurrency = get_slide_generation_concurrency()
+        slide_generation_semaphore = asyncio.Semaphore(concurrency)
+        print(
+            f"Generating {len(slide_layouts)} slides with concurrency of {concurrency}"
+        )
 
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
-                    slide_layouts[i],
+        async def generate_slide_and_fetch_assets(i: int):
+            slide_layout = slide_layouts[i]
+            async with slide_generation_semaphore:
+                slide_content = await get_slide_content_from_type_and_outline(
+                    slide_layout,
                     presentation_outlines.slides[i],
                     request.language,
                     request.tone.value,
                     request.verbosity.value,
                     request.instructions,
+                    use_cache=request.use_cache,
                 )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-            # Build slides for this batch
-            batch_slides: List[SlideModel] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = SlideModel(
-                    presentation=presentation_id,
-                    layout_group=layout_model.name,
-                    layout=slide_layout.id,
-                    index=i,
-                    speaker_note=slide_content.get("__speaker_note__"),
-                    content=slide_content,
-                )
-                slides.append(slide)
-                batch_slides.append(slide)
 
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+            slide = SlideModel(
+                presentation=presentation_id,
+                layout_group=layout_model.name,
+                layout=slide_layout.id,
+                index=i,
+                speaker_note=slide_content.get("__speaker_note__"),
+                content=slide_content,
+            )
+            slides[i] = slide
 
-        if async_status:
-            async_status.message = "Fetching assets for slides"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
+            # Asset fetch starts as soon as the content arrives and runs outside the semaphore
+            return await process_slide_and_fetch_assets(image_generation_service, slide)
+
+        generated_assets_list = await asyncio.gather(
+            *[generate_slide_and_fetch_assets(i) for i in range(len(slide_layouts))]
+        )
 
-        # Run all asset tasks concurrently while batches may still be generating content
-        generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
         generated_assets = []
         for assets_list in generated_assets_list:
             generated_assets.extend(assets_list)
@@ -779,6 +904,10 @@ async def generate_presentation_handler(
             traceback.print_exc()
             e = HTTPException(status_code=500, detail="Presentation generation failed")
 
+        # Server side failures are left to the job queue to retry
+        if not is_last_attempt and e.status_code >= 500:
+            raise e
+
         api_error_model = APIErrorModel.from_exception(e)
 
         # Triggering webhook on failure
@@ -821,7 +950,6 @@ async def generate_presentation_sync(
 )
 async def generate_presentation_async(
     request: GeneratePresentationRequest,
-    background_tasks: BackgroundTasks,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
     try:
@@ -833,15 +961,12 @@ async def generate_presentation_async(
             data=None,
         )
         sql_session.add(async_status)
+        # Picked up by a presentation generation worker, see worker.py
+        PRESENTATION_GENERATION_QUEUE.enqueue(
+            sql_session, async_status.id, presentation_id, request
+        )
         await sql_session.commit()
 
-        background_tasks.add_task(
-            generate_presentation_handler,
-            request,
-            presentation_id,
-            async_status=async_status,
-            sql_session=sql_session,
-        )
         return async_status
 
     except Exception as e:
@@ -880,15 +1005,14 @@ async def edit_presentation_with_new_content(
         select(SlideModel).where(SlideModel.presentation == data.presentation_id)
     )
 
+    new_slides_data = {each.index: each for each in data.slides}
     new_slides = []
     slides_to_delete = []
     for each_slide in slides:
         updated_content = None
-        new_slide_data = list(
-            filter(lambda x: x.index == each_slide.index, data.slides)
-        )
+        new_slide_data = new_slides_data.get(each_slide.index)
         if new_slide_data:
-            updated_content = deep_update(each_slide.content, new_slide_data[0].content)
+            updated_content = deep_update(each_slide.content, new_slide_data.content)
             new_slides.append(
                 each_slide.get_new_slide(presentation.id, updated_content)
             )
@@ -900,6 +1024,7 @@ async def edit_presentation_with_new_content(
 
     sql_session.add_all(new_slides)
     await sql_session.commit()
+    await EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     presentation_and_path = await export_presentation(
         presentation.id, presentation.title or str(uuid.uuid4()), data.export_as
@@ -925,14 +1050,13 @@ async def derive_presentation_from_existing_one(
     )
 
     new_presentation = presentation.get_new_presentation()
+    new_slides_data = {each.index: each for each in data.slides}
     new_slides = []
     for each_slide in slides:
         updated_content = None
-        new_slide_data = list(
-            filter(lambda x: x.index == each_slide.index, data.slides)
-        )
+        new_slide_data = new_slides_data.get(each_slide.index)
         if new_slide_data:
-            updated_content = deep_update(each_slide.content, new_slide_data[0].content)
+            updated_content = deep_update(each_slide.content, new_slide_data.content)
         new_slides.append(
             each_slide.get_new_slide(new_presentation.id, updated_content)
         )
@@ -1,11 +1,14 @@
-from typing import Annotated, Optional
-from fastapi import APIRouter, Body, Depends, HTTPException
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
 import uuid
 
+from constants.presentation import MAX_PRESENTATION_PAGE_SIZE
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from services.database import get_async_session
+from services.export_cache_service import EXPORT_CACHE_SERVICE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 from utils.llm_calls.edit_slide import get_edited_slide_content
@@ -18,6 +21,26 @@ import uuid
 SLIDE_ROUTER = APIRouter(prefix="/slide", tags=["Slide"])
 
 
+# 批量获取幻灯片，首页一页的缩略图只需一次请求
+@SLIDE_ROUTER.get("/batch", response_model=List[SlideModel])
+async def get_slides(
+    ids: List[uuid.UUID] = Query(max_length=MAX_PRESENTATION_PAGE_SIZE),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    slides = await sql_session.scalars(select(SlideModel).where(SlideModel.id.in_(ids)))
+    return list(slides)
+
+
+@SLIDE_ROUTER.get("/{id}", response_model=SlideModel)
+async def get_slide(
+    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+):
+    slide = await sql_session.get(SlideModel, id)
+    if not slide:
+        raise HTTPException(status_code=404, detail="Slide not found")
+    return slide
+
+
 @SLIDE_ROUTER.post("/edit")
 async def edit_slide(
     id: Annotated[uuid.UUID, Body()],
@@ -58,6 +81,7 @@ async def edit_slide(
     slide.speaker_note = edited_slide_content.get("__speaker_note__", "")
     sql_session.add_all(new_assets)
     await sql_session.commit()
+    await EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return slide
 
@@ -86,5 +110,6 @@ async def edit_slide_html(
     sql_session.add(slide)
     slide.html_content = edited_slide_html
     await sql_session.commit()
+    await EXPORT_CACHE_SERVICE.invalidate(slide.presentation)
 
     return slide
@@ -10,6 +10,7 @@ from openai import APIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from utils.asset_directory_utils import get_images_directory
+from utils.get_layout_by_name import invalidate_layout_cache
 from services.database import get_async_session
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from .prompts import (
@@ -782,6 +783,8 @@ async def save_layouts(
             saved_count += 1
 
         await session.commit()
+        for layout_data in request.layouts:
+            invalidate_layout_cache(f"custom-{layout_data.presentation}")
 
         return SaveLayoutsResponse(
             success=True,
@@ -1001,6 +1004,7 @@ async def create_template(
                 )
             )
         await session.commit()
+        invalidate_layout_cache(f"custom-{request.id}")
 
         # Read back
         template = await session.get(TemplateModel, request.id)
@@ -1039,5 +1043,6 @@ async def delete_template(
             )
         )
         await session.commit()
+        invalidate_layout_cache(f"custom-{template_id}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete template")
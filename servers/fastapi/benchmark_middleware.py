@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.middlewares import UserConfigEnvUpdateMiddleware
+from services.user_config_service import USER_CONFIG_SERVICE
+
+
+# The middleware as it was before, for comparison
+class BaseHTTPUserConfigMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        USER_CONFIG_SERVICE.refresh()
+        return await call_next(request)
+
+
+def create_app(middleware, chunks: int) -> tuple[FastAPI, list]:
+    app = FastAPI()
+    # Time each chunk was yielded by the endpoint
+    yielded_at = []
+
+    @app.get("/status")
+    async def status():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def inner():
+            for i in range(chunks):
+                yielded_at.append(time.perf_counter())
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(inner(), media_type="text/event-stream")
+
+    if middleware:
+        app.add_middleware(middleware)
+    return app, yielded_at
+
+
+async def call(app: FastAPI, path: str, on_body=None):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 80),
+    }
+
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            # Client disconnects once the response is complete
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] != "http.response.body":
+            return
+        if on_body and message["body"]:
+            on_body(time.perf_counter())
+        if not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+
+
+async def benchmark_requests(app: FastAPI, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, "/status")
+    return requests / (time.perf_counter() - start)
+
+
+async def benchmark_stream(app: FastAPI, yielded_at: list, streams: int) -> float:
+    latencies = []
+    for _ in range(streams):
+        yielded_at.clear()
+        received_at = []
+        await call(app, "/stream", received_at.append)
+        latencies.extend(
+            (received - yielded) * 1_000_000
+            for yielded, received in zip(yielded_at, received_at)
+        )
+    return statistics.median(latencies)
+
+
+async def main(requests: int, streams: int, chunks: int):
+    print(f"{'middleware':<16}{'requests/s':>12}{'chunk latency (us)':>22}")
+    for name, middleware in (
+        ("none", None),
+        ("BaseHTTP", BaseHTTPUserConfigMiddleware),
+        ("ASGI", UserConfigEnvUpdateMiddleware),
+    ):
+        app, yielded_at = create_app(middleware, chunks)
+        # Warm up routing and the config snapshot
+        await benchmark_requests(app, 100)
+
+        requests_per_second = await benchmark_requests(app, requests)
+        chunk_latency = await benchmark_stream(app, yielded_at, streams)
+        print(f"{name:<16}{requests_per_second:>12.0f}{chunk_latency:>22.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the user config middleware as BaseHTTPMiddleware and as plain ASGI"
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.streams, args.chunks))
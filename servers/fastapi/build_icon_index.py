@@ -0,0 +1,31 @@
+import argparse
+import time
+
+from constants.presentation import ICON_INDEX_EMBEDDINGS_PATH, ICON_INDEX_IDS_PATH
+from services.icon_vector_index import (
+    IconVectorIndex,
+    get_icon_documents,
+    get_icon_embedding_function,
+)
+
+
+def main(embeddings_path: str, ids_path: str):
+    start = time.perf_counter()
+    documents, ids = get_icon_documents()
+    index = IconVectorIndex.build(documents, ids, get_icon_embedding_function())
+    index.save(embeddings_path, ids_path)
+    print(
+        f"Embedded {len(ids)} icons into {embeddings_path} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute the icon embeddings used by the numpy icon search"
+    )
+    parser.add_argument("--embeddings", type=str, default=ICON_INDEX_EMBEDDINGS_PATH)
+    parser.add_argument("--ids", type=str, default=ICON_INDEX_IDS_PATH)
+    args = parser.parse_args()
+
+    main(args.embeddings, args.ids)
@@ -18,3 +18,40 @@ WEBP_MIME_TYPES = ["image/webp"]
 UPLOAD_ACCEPTED_FILE_TYPES = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
+
+# Processes converting documents with Docling, overridable with DOCUMENT_PARSE_WORKERS
+DEFAULT_DOCUMENT_PARSE_WORKERS = 2
+
+# Disk quota of parsed documents, overridable with DOCUMENT_CACHE_MAX_SIZE_MB (0 disables the cache)
+DEFAULT_DOCUMENT_CACHE_MAX_SIZE_MB = 256
+
+# Part of the document cache key, bump when the conversion output changes
+DOCUMENT_CACHE_VERSION = 1
+
+# Documents a Docling worker converts before it is replaced, overridable with
+# DOCLING_MAX_DOCUMENTS_PER_WORKER (0 keeps workers forever)
+DEFAULT_DOCLING_MAX_DOCUMENTS_PER_WORKER = 50
+
+# Seconds a Docling worker has to answer a health check
+DOCLING_HEALTH_CHECK_TIMEOUT_SECONDS = 10
+
+# Pools a conversion is tried on when workers die, e.g. out of memory
+DOCLING_BROKEN_POOL_ATTEMPTS = 2
+
+# Tokens of attached documents sent with the outline prompt, overridable with
+# DOCUMENT_CONTEXT_TOKEN_BUDGET (0 sends the whole documents)
+DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET = 24000
+
+# Documents are read up to this multiple of the token budget, the best scored
+# sections of what was read are kept
+DOCUMENT_CONTEXT_READ_FACTOR = 2
+
+# Score of the text before the first heading of a document, about that of a
+# top level heading
+DOCUMENT_CONTEXT_PREAMBLE_SCORE = 10.0
+
+# Rough token estimate of markdown, good enough for a budget
+DOCUMENT_CONTEXT_CHARS_PER_TOKEN = 4
+
+# Pages of a PDF Docling converts at once when documents are streamed
+PDF_PAGES_PER_BATCH = 10
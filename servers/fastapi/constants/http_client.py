@@ -0,0 +1,22 @@
+# Shared HTTP client connection pool
+DEFAULT_HTTP_CLIENT_LIMIT = 100
+# Overridable with HTTP_CLIENT_LIMIT_PER_HOST
+DEFAULT_HTTP_CLIENT_LIMIT_PER_HOST = 10
+HTTP_CLIENT_DNS_CACHE_TTL = 5 * 60
+
+# Seconds, total is overridable with HTTP_CLIENT_TIMEOUT
+DEFAULT_HTTP_CLIENT_TIMEOUT = 5 * 60
+DEFAULT_HTTP_CLIENT_CONNECT_TIMEOUT = 10
+
+# Retries of GET and HEAD requests, overridable with HTTP_CLIENT_RETRIES
+DEFAULT_HTTP_CLIENT_RETRIES = 2
+HTTP_CLIENT_RETRY_BACKOFF_SECONDS = 0.5
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Files downloaded at once by download_files
+DOWNLOAD_FILES_CONCURRENCY = 16
+
+# Images downloaded for exports, disk quota overridable with IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB (0 disables the cache)
+DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB = 1024
+# Seconds a download is used without revalidation when the response has no max-age
+DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_AGE = 24 * 60 * 60
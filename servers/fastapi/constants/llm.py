@@ -4,3 +4,17 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Maximum number of slides generated concurrently per provider
+# Can be overridden with SLIDE_GENERATION_CONCURRENCY
+DEFAULT_SLIDE_GENERATION_CONCURRENCY = {
+    "openai": 10,
+    "google": 10,
+    "anthropic": 5,
+    "ollama": 1,
+    "custom": 4,
+}
+
+# Structured response cache, enabled with LLM_RESPONSE_CACHE=true
+DEFAULT_LLM_RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES = 2000
@@ -1 +1,51 @@
 DEFAULT_TEMPLATES = ["general", "modern", "standard", "swift"]
+
+# Seconds a fetched template layout stays cached, overridable with LAYOUT_CACHE_TTL
+DEFAULT_LAYOUT_CACHE_TTL = 10 * 60
+
+# Maximum number of prompt to asset entries kept for reuse, overridable with ASSET_CACHE_MAX_ENTRIES
+DEFAULT_ASSET_CACHE_MAX_ENTRIES = 2000
+
+# Maximum number of generated images indexed for reuse across restarts, least
+# recently used first out, overridable with GENERATED_IMAGE_CACHE_MAX_ENTRIES
+DEFAULT_GENERATED_IMAGE_CACHE_MAX_ENTRIES = 5000
+
+# Async generation job queue
+DEFAULT_PRESENTATION_WORKER_CONCURRENCY = 2
+DEFAULT_PRESENTATION_JOB_MAX_ATTEMPTS = 3
+DEFAULT_PRESENTATION_JOB_LEASE_SECONDS = 120
+PRESENTATION_JOB_POLL_INTERVAL_SECONDS = 2
+PRESENTATION_JOB_RETRY_DELAY_SECONDS = 10
+
+# Presentation listing page size
+DEFAULT_PRESENTATION_PAGE_SIZE = 20
+MAX_PRESENTATION_PAGE_SIZE = 100
+
+# Disk quota of cached exports, overridable with EXPORT_CACHE_MAX_SIZE_MB (0 disables the cache)
+DEFAULT_EXPORT_CACHE_MAX_SIZE_MB = 1024
+
+# Processes transforming pictures for PPTX exports, overridable with PPTX_IMAGE_WORKERS
+DEFAULT_PPTX_IMAGE_WORKERS = 4
+
+# PPTX exports assembled at the same time, overridable with PPTX_EXPORT_CONCURRENCY
+DEFAULT_PPTX_EXPORT_CONCURRENCY = 2
+
+# Concurrent icon searches are collected for this long and searched in one query
+ICON_SEARCH_BATCH_WINDOW_SECONDS = 0.005
+ICON_SEARCH_MAX_BATCH_SIZE = 64
+
+# Icon search backend, "chroma" or "numpy", overridable with ICON_SEARCH_BACKEND
+DEFAULT_ICON_SEARCH_BACKEND = "chroma"
+
+# Prebuilt icon embeddings, written by build_icon_index.py
+ICON_INDEX_EMBEDDINGS_PATH = "assets/icon_index/embeddings.npy"
+ICON_INDEX_IDS_PATH = "assets/icon_index/ids.json"
+
+# Query embeddings kept so repeated icon queries skip the embedding model
+ICON_QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Icon used while the icon index is still loading
+ICON_PLACEHOLDER_URL = "/static/icons/placeholder.svg"
+
+# Seconds slide generation waits for the icon index before using placeholders
+ICON_INDEX_WAIT_TIMEOUT_SECONDS = 60
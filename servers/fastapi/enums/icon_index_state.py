@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class IconIndexState(str, Enum):
+    PENDING = "pending"
+    INITIALIZING = "initializing"
+    READY = "ready"
+    FAILED = "failed"
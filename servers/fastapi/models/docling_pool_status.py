@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class DoclingPoolStatus(BaseModel):
+    workers: int
+    ready_workers: int
+    healthy: bool
+    documents_parsed: int
+    max_documents_per_worker: int
@@ -40,3 +40,15 @@ class GeneratePresentationRequest(BaseModel):
     trigger_webhook: bool = Field(
         default=False, description="Whether to trigger subscribed webhooks"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Whether to reuse cached LLM responses",
+    )
+    reuse_assets: bool = Field(
+        default=True,
+        description="Whether to reuse images previously generated for the same prompt",
+    )
+    priority: int = Field(
+        default=0,
+        description="Queue priority for async generation, higher runs first",
+    )
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from enums.icon_index_state import IconIndexState
+
+
+class IconIndexStatus(BaseModel):
+    state: IconIndexState
+    backend: str
+    error: Optional[str] = None
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class PptxExportStatus(BaseModel):
+    running: int
+    waiting: int
+    concurrency: int
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from fastapi import HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from models.presentation_structure_model import PresentationStructureModel
 
@@ -11,12 +11,17 @@ class SlideLayoutModel(BaseModel):
     description: Optional[str] = None
     json_schema: dict # json schema定义幻灯片结构
 
+    # Hash of json_schema, set by utils.schema_cache on first use
+    _schema_hash: Optional[str] = PrivateAttr(default=None)
+
 
 class PresentationLayoutModel(BaseModel):
     name: str
     ordered: bool = Field(default=False)
     slides: List[SlideLayoutModel]
 
+    _string: Optional[str] = PrivateAttr(default=None)
+
     def get_slide_layout_index(self, slide_layout_id: str) -> int:
         for index, slide in enumerate(self.slides):
             if slide.id == slide_layout_id:
@@ -31,9 +36,13 @@ class PresentationLayoutModel(BaseModel):
         )
 
     def to_string(self):
+        if self._string is not None:
+            return self._string
+
         message = f"## Presentation Layout\n\n"
         for index, slide in enumerate(self.slides):
             message += f"### Slide Layout: {index}: \n"
             message += f"- Name: {slide.name or slide.json_schema.get('title')} \n"
             message += f"- Description: {slide.description} \n\n"
+        self._string = message
         return message
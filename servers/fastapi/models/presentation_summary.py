@@ -0,0 +1,31 @@
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel
+
+
+# 首页幻灯片引用，一页的内容通过 GET /slide/batch 一次获取
+class SlideThumbnail(BaseModel):
+    id: uuid.UUID
+    layout_group: str
+    layout: str
+
+
+class PresentationSummary(BaseModel):
+    id: uuid.UUID
+    title: Optional[str] = None
+    n_slides: int
+    language: str
+    created_at: datetime
+    updated_at: datetime
+    thumbnail: SlideThumbnail
+
+
+class PresentationSummaryPage(BaseModel):
+    items: List[PresentationSummary]
+    next_cursor: Optional[str] = None
+
+
+class PresentationCount(BaseModel):
+    count: int
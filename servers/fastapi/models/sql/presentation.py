@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 import uuid
-from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy import JSON, Column, DateTime, Index, String
 from sqlmodel import Boolean, Field, SQLModel
 
 from models.presentation_layout import PresentationLayoutModel
@@ -12,6 +12,8 @@ from utils.datetime_utils import get_current_utc_datetime
 # PPT主表
 class PresentationModel(SQLModel, table=True):
     __tablename__ = "presentations"
+    # 列表按 (created_at, id) 做 keyset 分页
+    __table_args__ = (Index("ix_presentations_created_at_id", "created_at", "id"),)
     # 主键 uuid，自动生成
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     # 演示内容
@@ -26,10 +28,12 @@ class PresentationModel(SQLModel, table=True):
     file_paths: Optional[List[str]] = Field(sa_column=Column(JSON), default=None)
     # 大纲
     outlines: Optional[dict] = Field(sa_column=Column(JSON), default=None)
-    # 创建时间
+    # 创建时间，列表按其分页
     created_at: datetime = Field(
         sa_column=Column(
-            DateTime(timezone=True), nullable=False, default=get_current_utc_datetime
+            DateTime(timezone=True),
+            nullable=False,
+            default=get_current_utc_datetime,
         ),
     )
     # 更新时间
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+# 异步生成任务队列，id 与 AsyncPresentationGenerationTaskModel 相同
+class PresentationGenerationJobModel(SQLModel, table=True):
+
+    __tablename__ = "presentation_generation_jobs"
+
+    id: str = Field(primary_key=True)
+    presentation_id: uuid.UUID
+    request: dict = Field(sa_column=Column(JSON))
+    # queued | leased | completed | failed
+    status: str = Field(default="queued", index=True)
+    priority: int = Field(default=0, index=True)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=True), default=None
+    )
+    available_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        default_factory=get_current_utc_datetime,
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class UserConfig(BaseModel):
@@ -38,3 +38,7 @@ class UserConfig(BaseModel):
 
     # Web Search
     WEB_GROUNDING: Optional[bool] = None
+
+
+class UserConfigSnapshot(UserConfig):
+    model_config = ConfigDict(frozen=True)
@@ -0,0 +1,84 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from constants.presentation import DEFAULT_ASSET_CACHE_MAX_ENTRIES
+from utils.get_env import get_asset_cache_max_entries_env
+from utils.parsers import parse_int_or_default
+
+
+# 按提示词复用已生成的图片/图标，避免同一提示词重复生成
+class AssetCacheService:
+    """
+    Bounded LRU of prompt keys to asset urls. Concurrent requests for the
+    same key share a single fetch instead of starting one each.
+    """
+
+    def __init__(self):
+        self._assets: OrderedDict[Hashable, Any] = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    def get_max_entries(self) -> int:
+        return parse_int_or_default(
+            get_asset_cache_max_entries_env(),
+            DEFAULT_ASSET_CACHE_MAX_ENTRIES,
+            0,
+            "ASSET_CACHE_MAX_ENTRIES",
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._assets.get(key)
+        if value is not None:
+            self._assets.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._assets[key] = value
+        self._assets.move_to_end(key)
+        max_entries = self.get_max_entries()
+        while len(self._assets) > max_entries:
+            self._assets.popitem(last=False)
+
+    def remove(self, key: Hashable):
+        self._assets.pop(key, None)
+
+    def invalidate(self):
+        self._assets.clear()
+
+    async def run_once(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Runs fetch unless the same key is already being fetched, in which
+        case its result is awaited instead. Returns the result and whether
+        this call was the one that ran fetch.
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending), False
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # The caller running fetch was cancelled, fetch again from here
+            return await self.run_once(key, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await fetch()
+            future.set_result(result)
+            return result, True
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting on the future, avoid "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+
+ASSET_CACHE_SERVICE = AssetCacheService()
@@ -15,6 +15,7 @@ from models.sql.image_asset import ImageAsset
 from models.sql.key_value import KeyValueSqlModel
 from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
 from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
@@ -59,30 +60,37 @@ async def get_container_db_async_session() -> AsyncGenerator[AsyncSession, None]
         yield session
 
 
+# create_all 不会给已存在的表补建索引，这里补建后来新增的索引
+def create_missing_indexes(sync_conn, tables):
+    for table in tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 # Create Database and Tables
 async def create_db_and_tables():
+    tables = [
+        PresentationModel.__table__,
+        SlideModel.__table__,
+        KeyValueSqlModel.__table__,
+        ImageAsset.__table__,
+        PresentationLayoutCodeModel.__table__,
+        TemplateModel.__table__,
+        WebhookSubscription.__table__,
+        AsyncPresentationGenerationTaskModel.__table__,
+        PresentationGenerationJobModel.__table__,
+        PptCreateSessionModel.__table__,
+        TeachingObjectiveModel.__table__,
+        TeachingOutlineModel.__table__,
+        TeachingDesignModel.__table__,
+        KnowledgeRecallModel.__table__,
+        WebSearchResultModel.__table__,
+    ]
     async with sql_engine.begin() as conn:
         await conn.run_sync(
-            lambda sync_conn: SQLModel.metadata.create_all(
-                sync_conn,
-                tables=[
-                    PresentationModel.__table__,
-                    SlideModel.__table__,
-                    KeyValueSqlModel.__table__,
-                    ImageAsset.__table__,
-                    PresentationLayoutCodeModel.__table__,
-                    TemplateModel.__table__,
-                    WebhookSubscription.__table__,
-                    AsyncPresentationGenerationTaskModel.__table__,
-                    PptCreateSessionModel.__table__,
-                    TeachingObjectiveModel.__table__,
-                    TeachingOutlineModel.__table__,
-                    TeachingDesignModel.__table__,
-                    KnowledgeRecallModel.__table__,
-                    WebSearchResultModel.__table__,
-                ],
-            )
+            lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables)
         )
+        await conn.run_sync(lambda sync_conn: create_missing_indexes(sync_conn, tables))
 
     # async with container_db_engine.begin() as conn:
     #     await conn.run_sync(
@@ -0,0 +1,264 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from constants.documents import (
+    DEFAULT_DOCLING_MAX_DOCUMENTS_PER_WORKER,
+    DEFAULT_DOCUMENT_PARSE_WORKERS,
+    DOCLING_BROKEN_POOL_ATTEMPTS,
+    DOCLING_HEALTH_CHECK_TIMEOUT_SECONDS,
+)
+from models.docling_pool_status import DoclingPoolStatus
+from services.docling_service import DoclingService
+from utils.get_env import (
+    get_docling_max_documents_per_worker_env,
+    get_docling_warm_up_env,
+    get_document_parse_workers_env,
+)
+from utils.parsers import parse_int_or_default
+
+# Converter of the current process, created when a worker starts
+_docling_service: Optional[DoclingService] = None
+_docling_service_lock = threading.Lock()
+
+
+def get_docling_service() -> DoclingService:
+    global _docling_service
+    with _docling_service_lock:
+        if _docling_service is None:
+            _docling_service = DoclingService()
+        return _docling_service
+
+
+def initialize_docling_worker(started_workers, ready_workers):
+    """
+    Runs in every new worker. The counters are shared with the pool owner,
+    so readiness is known without sending tasks to the workers.
+    """
+    try:
+        get_docling_service().warm_up()
+        with ready_workers.get_lock():
+            ready_workers.value += 1
+    except Exception as e:
+        # The worker still starts, conversions report the error
+        print(f"Error warming up Docling worker {os.getpid()}: {e}")
+    finally:
+        with started_workers.get_lock():
+            started_workers.value += 1
+
+
+def parse_document_to_markdown(file_path: str) -> str:
+    docling_service = get_docling_service()
+    with _docling_service_lock:
+        return docling_service.parse_to_markdown(file_path)
+
+
+def parse_pages_to_markdown(file_path: str, first_page: int, last_page: int) -> str:
+    docling_service = get_docling_service()
+    with _docling_service_lock:
+        return docling_service.parse_pages_to_markdown(file_path, first_page, last_page)
+
+
+def ping_docling_worker() -> int:
+    return os.getpid()
+
+
+# Docling 转换进程池，工作进程启动时预加载模型，转换一定数量文档后整体替换
+class DoclingPoolService:
+    """
+    Process pool of warm Docling converters shared by every request. Each
+    worker builds its converter and loads the models when it starts. The
+    pool is replaced once its workers converted DOCLING_MAX_DOCUMENTS_PER_WORKER
+    documents each on average, so memory held by the models can't grow
+    without bound. Only conversions count, health checks don't.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._documents_parsed = 0
+        # Conversions sent to the current pool
+        self._pool_conversions = 0
+        # Workers of the current pool done starting, and those with models loaded
+        self._started_workers = None
+        self._ready_workers = None
+
+    def get_workers(self) -> int:
+        return parse_int_or_default(
+            get_document_parse_workers_env(),
+            min(DEFAULT_DOCUMENT_PARSE_WORKERS, os.cpu_count() or 1),
+            1,
+            "DOCUMENT_PARSE_WORKERS",
+        )
+
+    def get_max_documents_per_worker(self) -> int:
+        return parse_int_or_default(
+            get_docling_max_documents_per_worker_env(),
+            DEFAULT_DOCLING_MAX_DOCUMENTS_PER_WORKER,
+            0,
+            "DOCLING_MAX_DOCUMENTS_PER_WORKER",
+        )
+
+    def get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            mp_context = multiprocessing.get_context("spawn")
+            self._started_workers = mp_context.Value("i", 0)
+            self._ready_workers = mp_context.Value("i", 0)
+            self._pool_conversions = 0
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.get_workers(),
+                mp_context=mp_context,
+                initializer=initialize_docling_worker,
+                initargs=(self._started_workers, self._ready_workers),
+            )
+        return self._pool
+
+    def get_ready_workers(self) -> int:
+        if self._ready_workers is None:
+            return 0
+        return self._ready_workers.value
+
+    def _release_pool(self, cancel_futures: bool):
+        if self._pool is not None:
+            # Without cancel_futures, conversions already sent still finish
+            self._pool.shutdown(wait=False, cancel_futures=cancel_futures)
+            self._pool = None
+            self._started_workers = None
+            self._ready_workers = None
+
+    def _release_broken_pool(self, pool: ProcessPoolExecutor):
+        # A late failure of an older pool must not release the current one
+        if self._pool is pool:
+            self._release_pool(cancel_futures=True)
+
+    def shutdown(self):
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+            self._warm_up_task = None
+        self._release_pool(cancel_futures=True)
+
+    def _recycle_pool_if_needed(self):
+        max_documents_per_worker = self.get_max_documents_per_worker()
+        if not max_documents_per_worker or self._pool is None:
+            return
+        if self._pool_conversions < max_documents_per_worker * self.get_workers():
+            return
+        print(f"Replacing Docling workers after {self._pool_conversions} conversions")
+        self._release_pool(cancel_futures=False)
+        # The new workers load their models before the next upload needs them
+        self.start_warm_up()
+
+    async def _run(self, func, *args) -> str:
+        """
+        Converts in a worker. When the pool is broken, e.g. a worker was
+        killed out of memory, the conversion is retried once on a new pool.
+        """
+        loop = asyncio.get_running_loop()
+        self._recycle_pool_if_needed()
+        for attempt in range(DOCLING_BROKEN_POOL_ATTEMPTS):
+            pool = self.get_pool()
+            self._pool_conversions += 1
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool as e:
+                print(f"Docling process pool failed: {e}")
+                self._release_broken_pool(pool)
+        raise HTTPException(
+            status_code=500, detail="Document parser workers stopped unexpectedly"
+        )
+
+    async def parse(self, file_path: str) -> str:
+        markdown = await self._run(parse_document_to_markdown, file_path)
+        self._documents_parsed += 1
+        return markdown
+
+    async def parse_pages(self, file_path: str, first_page: int, last_page: int) -> str:
+        """
+        Converts a range of pages of a PDF, pages counted from 1.
+        """
+        return await self._run(
+            parse_pages_to_markdown, file_path, first_page, last_page
+        )
+
+    async def _ping(self, timeout: Optional[float]) -> bool:
+        """
+        Returns whether a worker answered in time, a broken pool is shut
+        down so the next conversion starts a new one.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.get_pool()
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(pool, ping_docling_worker), timeout
+            )
+        except BrokenProcessPool as e:
+            print(f"Docling process pool failed: {e}")
+            self._release_broken_pool(pool)
+            return False
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def warm_up(self):
+        """
+        Starts every worker, so models are loaded before the first upload.
+        """
+        start = time.perf_counter()
+        try:
+            workers = self.get_workers()
+            pool = self.get_pool()
+            started_workers = self._started_workers
+            loop = asyncio.get_running_loop()
+            # A process is started for every task sent while none is idle
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, ping_docling_worker)
+                    for _ in range(workers)
+                ]
+            )
+            while started_workers.value < workers and self._pool is pool:
+                await asyncio.sleep(0.1)
+        except Exception as e:
+            print(f"Error warming up Docling workers: {e}")
+            return
+        print(
+            f"{self.get_ready_workers()} Docling workers warmed up "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+    def start_warm_up(self):
+        """
+        Warms up the workers in the background unless DOCLING_WARM_UP is
+        false, in which case they start with the first document.
+        """
+        if get_docling_warm_up_env() == "false":
+            return
+        try:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self.warm_up())
+        except RuntimeError:
+            # No event loop, workers start with the first document
+            pass
+
+    async def check_health(self) -> DoclingPoolStatus:
+        """
+        Workers busy converting long documents may not answer in time, the
+        pool is only replaced when it is broken.
+        """
+        healthy = await self._ping(DOCLING_HEALTH_CHECK_TIMEOUT_SECONDS)
+        return DoclingPoolStatus(
+            workers=self.get_workers(),
+            ready_workers=self.get_ready_workers(),
+            healthy=healthy,
+            documents_parsed=self._documents_parsed,
+            max_documents_per_worker=self.get_max_documents_per_worker(),
+        )
+
+
+DOCLING_POOL_SERVICE = DoclingPoolService()
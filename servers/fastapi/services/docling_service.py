@@ -28,9 +28,27 @@ class DoclingService:
             },
         )
 
+    def warm_up(self):
+        """
+        Loads the pipelines and their models now instead of on the first
+        conversion.
+        """
+        for input_format in (InputFormat.PDF, InputFormat.DOCX, InputFormat.PPTX):
+            self.converter.initialize_pipeline(input_format)
+
     def parse_to_markdown(self, file_path: str) -> str:
         """
         将文档转换为markdown格式
         """
         result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+    def parse_pages_to_markdown(
+        self, file_path: str, first_page: int, last_page: int
+    ) -> str:
+        """
+        Converts pages first_page to last_page of a PDF, both included and
+        counted from 1.
+        """
+        result = self.converter.convert(file_path, page_range=(first_page, last_page))
+        return result.document.export_to_markdown()
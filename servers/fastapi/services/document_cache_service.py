@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from constants.documents import (
+    DEFAULT_DOCUMENT_CACHE_MAX_SIZE_MB,
+    DOCUMENT_CACHE_VERSION,
+)
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import get_document_cache_max_size_mb_env
+from utils.parsers import parse_int_or_default
+
+
+def get_file_hash(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+# 文档解析结果缓存，按文件内容哈希存储，同一文件不会重复解析
+class DocumentCacheService:
+    """
+    Keeps the markdown Docling produced for every parsed document, keyed by
+    a hash of the file contents so the same upload is parsed once however
+    often it is loaded. Entries are evicted by least recent use once the
+    disk quota is hit.
+    """
+
+    def __init__(self):
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._directory: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_max_size(self) -> int:
+        max_size_mb = parse_int_or_default(
+            get_document_cache_max_size_mb_env(),
+            DEFAULT_DOCUMENT_CACHE_MAX_SIZE_MB,
+            0,
+            "DOCUMENT_CACHE_MAX_SIZE_MB",
+        )
+        return max_size_mb * 1024 * 1024
+
+    def is_enabled(self) -> bool:
+        return self.get_max_size() > 0
+
+    def get_key(self, file_path: str) -> str:
+        return f"{get_file_hash(file_path)}-v{DOCUMENT_CACHE_VERSION}"
+
+    # Builds the LRU index from the files already on disk, oldest first
+    def _load_index(self):
+        directory = get_cache_directory("documents")
+        if self._index is not None and self._directory == directory:
+            return
+
+        entries = []
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(".md"):
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, file_name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, file_name[:-3], stat.st_size))
+        entries.sort()
+
+        self._directory = directory
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.md")
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+
+            path = self._get_path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    markdown = f.read()
+            except FileNotFoundError:
+                self._remove(key)
+                return None
+
+            now = time.time()
+            os.utime(path, (now, now))
+            self._index.move_to_end(key)
+            return markdown
+
+    def _set_sync(self, key: str, markdown: str):
+        with self._lock:
+            self._load_index()
+
+            path = self._get_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+            os.replace(temp_path, path)
+
+            self._index[key] = os.path.getsize(path)
+            self._index.move_to_end(key)
+
+            max_size = self.get_max_size()
+            total_size = sum(self._index.values())
+            while total_size > max_size and self._index:
+                oldest_key = next(iter(self._index))
+                total_size -= self._index[oldest_key]
+                self._remove(oldest_key)
+
+    async def get_key_async(self, file_path: str) -> str:
+        return await asyncio.to_thread(self.get_key, file_path)
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.is_enabled():
+            return None
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except Exception as e:
+            print(f"Error reading document cache: {e}")
+            return None
+
+    async def set(self, key: str, markdown: str):
+        if not self.is_enabled():
+            return
+        try:
+            await asyncio.to_thread(self._set_sync, key, markdown)
+        except Exception as e:
+            print(f"Error writing document cache: {e}")
+
+
+DOCUMENT_CACHE_SERVICE = DocumentCacheService()
@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from constants.documents import (
+    DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET,
+    DOCUMENT_CONTEXT_CHARS_PER_TOKEN,
+    DOCUMENT_CONTEXT_PREAMBLE_SCORE,
+    DOCUMENT_CONTEXT_READ_FACTOR,
+)
+from services.score_based_chunker import ScoreBasedChunker
+from utils.get_env import get_document_context_token_budget_env
+from utils.parsers import parse_int_or_default
+
+
+def get_document_context_token_budget() -> int:
+    return parse_int_or_default(
+        get_document_context_token_budget_env(),
+        DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET,
+        0,
+        "DOCUMENT_CONTEXT_TOKEN_BUDGET",
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // DOCUMENT_CONTEXT_CHARS_PER_TOKEN)
+
+
+@dataclass
+class DocumentSection:
+    document_index: int
+    heading: Optional[str]
+    content: str
+    tokens: int
+
+
+# 文档上下文构建器，按标题切分流式到达的 markdown 并在 token 预算内保留得分最高的部分
+class DocumentContextBuilder:
+    """
+    Collects the markdown of attached documents as it is parsed, split into
+    sections at every heading. A section can continue over several parts of
+    a document. Once more than the token budget was read, the sections with
+    the best ScoreBasedChunker heading scores are kept, in document order.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = (
+            get_document_context_token_budget()
+            if token_budget is None
+            else token_budget
+        )
+        self.chunker = ScoreBasedChunker()
+        self._sections: List[DocumentSection] = []
+        # Last section of each document, continued by the next part
+        self._open_sections: Dict[int, DocumentSection] = {}
+        self._tokens = 0
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    def is_full(self) -> bool:
+        """
+        Whether enough was read to fill the budget, documents don't need to
+        be read any further.
+        """
+        return bool(self.token_budget) and (
+            self._tokens >= self.token_budget * DOCUMENT_CONTEXT_READ_FACTOR
+        )
+
+    def _extend_section(self, section: DocumentSection, content: str):
+        if section.content:
+            content = f"{section.content}\n{content}"
+        tokens = estimate_tokens(content)
+        self._tokens += tokens - section.tokens
+        section.content = content
+        section.tokens = tokens
+
+    def _add_section(
+        self, document_index: int, heading: Optional[str], lines: List[str]
+    ):
+        content = "\n".join(lines).strip()
+        if not content:
+            return
+        open_section = self._open_sections.get(document_index)
+        if heading is None and open_section is not None:
+            # 上一部分未结束的段落在这一部分继续
+            self._extend_section(open_section, content)
+            return
+        section = DocumentSection(document_index, heading, "", 0)
+        self._extend_section(section, content)
+        self._sections.append(section)
+        self._open_sections[document_index] = section
+
+    def add(self, document_index: int, markdown: str):
+        """
+        Adds the next part of a document, e.g. a batch of pages. Text before
+        its first heading continues the last section of the document.
+        """
+        headings = set(self.chunker.extract_headings(markdown))
+        heading = None
+        lines = []
+        for line in markdown.split("\n"):
+            if line.strip() in headings:
+                self._add_section(document_index, heading, lines)
+                heading = line.strip()
+                lines = []
+            lines.append(line)
+        self._add_section(document_index, heading, lines)
+
+    def _get_scores(self) -> List[float]:
+        # Headings are scored per document, the first one of each gets the bonus
+        headings: Dict[int, List[int]] = {}
+        for index, section in enumerate(self._sections):
+            if section.heading is not None:
+                headings.setdefault(section.document_index, []).append(index)
+
+        # Only the text before the first heading of a document has none
+        scores = [
+            DOCUMENT_CONTEXT_PREAMBLE_SCORE if section.heading is None else 0.0
+            for section in self._sections
+        ]
+        for indices in headings.values():
+            heading_scores = self.chunker.score_headings(
+                [self._sections[index].heading for index in indices]
+            )
+            for index, score in zip(indices, heading_scores):
+                scores[index] = score
+        return scores
+
+    def _in_document_order(self, indices: List[int]) -> List[int]:
+        # Parts of different documents arrive interleaved
+        return sorted(
+            indices, key=lambda index: (self._sections[index].document_index, index)
+        )
+
+    def get_context(self) -> str:
+        if not self.token_budget or self._tokens <= self.token_budget:
+            return "\n\n".join(
+                self._sections[index].content
+                for index in self._in_document_order(range(len(self._sections)))
+            )
+
+        # A single section can't take more than the whole budget
+        max_chars = self.token_budget * DOCUMENT_CONTEXT_CHARS_PER_TOKEN
+        contents = [section.content[:max_chars] for section in self._sections]
+        scores = self._get_scores()
+        order = sorted(range(len(contents)), key=lambda index: (-scores[index], index))
+        remaining = self.token_budget
+        selected_indices = []
+        for index in order:
+            tokens = estimate_tokens(contents[index])
+            if tokens <= remaining:
+                selected_indices.append(index)
+                remaining -= tokens
+
+        return "\n\n".join(
+            contents[index] for index in self._in_document_order(selected_indices)
+        )
@@ -1,16 +1,81 @@
 import mimetypes
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 import pdfplumber
 
 from constants.documents import (
     PDF_MIME_TYPES,
+    PDF_PAGES_PER_BATCH,
     POWERPOINT_TYPES,
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.docling_pool_service import DOCLING_POOL_SERVICE
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE
+from services.document_context_builder import DocumentContextBuilder
+from services.temp_file_service import TEMP_FILE_SERVICE
+
+
+async def parse_document(file_path: str) -> str:
+    """
+    Converts a PDF, DOCX or PPTX file to markdown with the shared Docling
+    workers, reusing the markdown of a file with the same contents.
+    """
+    key = await DOCUMENT_CACHE_SERVICE.get_key_async(file_path)
+    markdown = await DOCUMENT_CACHE_SERVICE.get(key)
+    if markdown is not None:
+        return markdown
+
+    markdown = await DOCLING_POOL_SERVICE.parse(file_path)
+    await DOCUMENT_CACHE_SERVICE.set(key, markdown)
+    return markdown
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+async def iter_pdf_pages(file_path: str) -> AsyncIterator[str]:
+    """
+    Yields the markdown of a PDF PDF_PAGES_PER_BATCH pages at a time, the
+    next batch is converted while the current one is consumed. The whole
+    document is cached once every page was converted.
+    """
+    key = await DOCUMENT_CACHE_SERVICE.get_key_async(file_path)
+    markdown = await DOCUMENT_CACHE_SERVICE.get(key)
+    if markdown is not None:
+        yield markdown
+        return
+
+    page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+    batches = [
+        (first_page, min(first_page + PDF_PAGES_PER_BATCH - 1, page_count))
+        for first_page in range(1, page_count + 1, PDF_PAGES_PER_BATCH)
+    ]
+
+    def parse_batch(index: int) -> Optional[asyncio.Task]:
+        if index >= len(batches):
+            return None
+        return asyncio.create_task(
+            DOCLING_POOL_SERVICE.parse_pages(file_path, *batches[index])
+        )
+
+    pages = []
+    next_batch = parse_batch(0)
+    try:
+        for index in range(len(batches)):
+            batch = next_batch
+            next_batch = parse_batch(index + 1)
+            pages.append(await batch)
+            yield pages[-1]
+    finally:
+        # Batches not started yet are dropped when the consumer stops early
+        if next_batch is not None:
+            next_batch.cancel()
+
+    await DOCUMENT_CACHE_SERVICE.set(key, "\n\n".join(pages))
 
 
 class DocumentsLoader:
@@ -18,8 +83,6 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
 
@@ -31,69 +94,164 @@ class DocumentsLoader:
     def images(self):
         return self._images
 
+    def check_files_exist(self):
+        for file_path in self._file_paths:
+            if not os.path.exists(file_path):
+                raise HTTPException(
+                    status_code=404, detail=f"File {file_path} not found"
+                )
+
     async def load_documents(
         self,
-        temp_dir: str,
+        temp_dir: Optional[str] = None,
         load_text: bool = True,
         load_images: bool = False,
     ):
-        documents: List[str] = []
-        images: List[str] = []
+        """
+        Loads all documents at once, each document is parsed by its own
+        worker of the document process pool.
+        """
+        self.check_files_exist()
 
-        for file_path in self._file_paths:
-            if not os.path.exists(file_path):
-                raise HTTPException(
-                    status_code=404, detail=f"File {file_path} not found"
+        results = await asyncio.gather(
+            *[
+                self.load_document(
+                    file_path,
+                    load_text,
+                    load_images,
+                    # Page images of different documents would have the same names
+                    os.path.join(temp_dir, str(index)) if temp_dir else None,
                 )
+                for index, file_path in enumerate(self._file_paths)
+            ]
+        )
 
-            document = ""
-            imgs = []
+        self._documents = [document for document, _ in results]
+        self._images = [images for _, images in results]
 
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+    async def iter_document(self, file_path: str) -> AsyncIterator[str]:
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            async for markdown in iter_pdf_pages(file_path):
+                yield markdown
+        else:
+            document, _ = await self.load_document(file_path, True, False, None)
+            yield document
 
-            documents.append(document)
-            images.append(imgs)
+    async def iter_sections(self) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yields (document index, markdown) as documents are parsed, PDFs a
+        batch of pages at a time. Each document is parsed at most one batch
+        ahead of the consumer and parsing stops when the iterator is closed.
+        """
+        self.check_files_exist()
 
-        self._documents = documents
-        self._images = images
+        queue = asyncio.Queue()
 
-    async def load_pdf(
+        async def produce(index: int, file_path: str):
+            try:
+                async for markdown in self.iter_document(file_path):
+                    await queue.put((index, markdown))
+                    # 消费者取下一项时才继续解析，只预取一个批次
+                    await queue.join()
+                await queue.put((index, None))
+            except Exception as e:
+                await queue.put(e)
+
+        tasks = [
+            asyncio.create_task(produce(index, file_path))
+            for index, file_path in enumerate(self._file_paths)
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                index, markdown = item
+                if markdown is None:
+                    remaining -= 1
+                elif markdown:
+                    yield index, markdown
+                queue.task_done()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def load_context(self, token_budget: Optional[int] = None) -> str:
+        """
+        Reads the documents until there is enough context for the token
+        budget and returns the best sections, the rest of the documents is
+        not parsed.
+        """
+        builder = DocumentContextBuilder(token_budget)
+        sections = self.iter_sections()
+        try:
+            async for index, markdown in sections:
+                builder.add(index, markdown)
+                if builder.is_full():
+                    break
+        finally:
+            await sections.aclose()
+        return builder.get_context()
+
+    async def load_document(
         self,
         file_path: str,
         load_text: bool,
         load_images: bool,
-        temp_dir: str,
+        temp_dir: Optional[str],
     ) -> Tuple[str, List[str]]:
-        image_paths = []
-        document: str = ""
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        return document, imgs
 
-        if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+    async def load_pdf(
+        self,
+        file_path: str,
+        load_text: bool,
+        load_images: bool,
+        temp_dir: Optional[str],
+    ) -> Tuple[str, List[str]]:
+        async def get_document() -> str:
+            if load_text:
+                return await parse_document(file_path)
+            return ""
 
-        if load_images:
-            image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
+        async def get_image_paths() -> List[str]:
+            if load_images:
+                # Page images need a directory, a fresh one when none is given
+                images_dir = temp_dir or TEMP_FILE_SERVICE.create_temp_dir()
+                os.makedirs(images_dir, exist_ok=True)
+                return await self.get_page_images_from_pdf_async(file_path, images_dir)
+            return []
 
+        document, image_paths = await asyncio.gather(get_document(), get_image_paths())
         return document, image_paths
 
     async def load_text(self, file_path: str) -> str:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await parse_document(file_path)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await parse_document(file_path)
 
     @classmethod
     def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Literal, Optional
+import uuid
+
+from constants.presentation import DEFAULT_EXPORT_CACHE_MAX_SIZE_MB
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import get_export_cache_max_size_mb_env
+from utils.parsers import parse_int_or_default
+
+
+# 导出文件缓存，内容未变化的演示文稿直接复用上次导出的文件
+class ExportCacheService:
+    """
+    Keeps a copy of every exported pptx/pdf under the cache directory, keyed
+    by the presentation id and a hash of everything the export is rendered
+    from. Copies are evicted by least recent use once the disk quota is hit.
+    """
+
+    def __init__(self):
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._directory: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_max_size(self) -> int:
+        max_size_mb = parse_int_or_default(
+            get_export_cache_max_size_mb_env(),
+            DEFAULT_EXPORT_CACHE_MAX_SIZE_MB,
+            0,
+            "EXPORT_CACHE_MAX_SIZE_MB",
+        )
+        return max_size_mb * 1024 * 1024
+
+    def is_enabled(self) -> bool:
+        return self.get_max_size() > 0
+
+    def get_key(
+        self,
+        presentation: PresentationModel,
+        slides: List[SlideModel],
+        export_as: Literal["pptx", "pdf"],
+        layout_codes: Optional[List[PresentationLayoutCodeModel]] = None,
+    ) -> str:
+        """
+        layout_codes are the custom template layouts the slides are rendered
+        with, editing the template changes the key.
+        """
+        payload = json.dumps(
+            {
+                "presentation": presentation.model_dump(
+                    mode="json", exclude={"created_at", "updated_at"}
+                ),
+                "slides": [
+                    slide.model_dump(mode="json")
+                    for slide in sorted(slides, key=lambda slide: slide.index)
+                ],
+                "export_as": export_as,
+                "layout_codes": sorted(
+                    [
+                        [
+                            str(layout_code.presentation),
+                            layout_code.layout_id,
+                            layout_code.layout_code,
+                            layout_code.fonts,
+                        ]
+                        for layout_code in layout_codes or []
+                    ],
+                    key=lambda layout_code: layout_code[:2],
+                ),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_file_name(
+        self, presentation_id: uuid.UUID, key: str, export_as: str
+    ) -> str:
+        return f"{presentation_id}-{key}.{export_as}"
+
+    # Builds the LRU index from the files already on disk, oldest first
+    def _load_index(self):
+        directory = get_cache_directory("exports")
+        if self._index is not None and self._directory == directory:
+            return
+
+        entries = []
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, file_name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, file_name, stat.st_size))
+        entries.sort()
+
+        self._directory = directory
+        self._index = OrderedDict((file_name, size) for _, file_name, size in entries)
+
+    def _remove(self, file_name: str):
+        self._index.pop(file_name, None)
+        try:
+            os.remove(os.path.join(self._directory, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _get_sync(self, file_name: str, destination_path: str) -> bool:
+        with self._lock:
+            self._load_index()
+            if file_name not in self._index:
+                return False
+
+            path = os.path.join(self._directory, file_name)
+            try:
+                # Copied, the exported file is overwritten in place on the next export
+                shutil.copyfile(path, destination_path)
+            except FileNotFoundError:
+                self._remove(file_name)
+                return False
+
+            now = time.time()
+            os.utime(path, (now, now))
+            self._index.move_to_end(file_name)
+            return True
+
+    def _set_sync(self, file_name: str, source_path: str):
+        with self._lock:
+            self._load_index()
+
+            path = os.path.join(self._directory, file_name)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+
+            self._index[file_name] = os.path.getsize(path)
+            self._index.move_to_end(file_name)
+
+            max_size = self.get_max_size()
+            total_size = sum(self._index.values())
+            while total_size > max_size and self._index:
+                oldest_file_name = next(iter(self._index))
+                total_size -= self._index[oldest_file_name]
+                self._remove(oldest_file_name)
+
+    def _invalidate_sync(self, presentation_id: uuid.UUID):
+        with self._lock:
+            self._load_index()
+            prefix = f"{presentation_id}-"
+            for file_name in list(self._index.keys()):
+                if file_name.startswith(prefix):
+                    self._remove(file_name)
+
+    async def get(
+        self,
+        presentation_id: uuid.UUID,
+        key: str,
+        export_as: Literal["pptx", "pdf"],
+        destination_path: str,
+    ) -> bool:
+        """
+        Copies the cached export to destination_path, returns whether there
+        was one.
+        """
+        if not self.is_enabled():
+            return False
+        try:
+            return await asyncio.to_thread(
+                self._get_sync,
+                self._get_file_name(presentation_id, key, export_as),
+                destination_path,
+            )
+        except Exception as e:
+            print(f"Error reading export cache: {e}")
+            return False
+
+    async def set(
+        self,
+        presentation_id: uuid.UUID,
+        key: str,
+        export_as: Literal["pptx", "pdf"],
+        source_path: str,
+    ):
+        if not self.is_enabled():
+            return
+        try:
+            await asyncio.to_thread(
+                self._set_sync,
+                self._get_file_name(presentation_id, key, export_as),
+                source_path,
+            )
+        except Exception as e:
+            print(f"Error writing export cache: {e}")
+
+    async def invalidate(self, presentation_id: uuid.UUID):
+        try:
+            await asyncio.to_thread(self._invalidate_sync, presentation_id)
+        except Exception as e:
+            print(f"Error invalidating export cache: {e}")
+
+
+EXPORT_CACHE_SERVICE = ExportCacheService()
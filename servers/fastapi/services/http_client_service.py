@@ -0,0 +1,142 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import aiohttp
+
+from constants.http_client import (
+    DEFAULT_HTTP_CLIENT_CONNECT_TIMEOUT,
+    DEFAULT_HTTP_CLIENT_LIMIT,
+    DEFAULT_HTTP_CLIENT_LIMIT_PER_HOST,
+    DEFAULT_HTTP_CLIENT_RETRIES,
+    DEFAULT_HTTP_CLIENT_TIMEOUT,
+    HTTP_CLIENT_DNS_CACHE_TTL,
+    HTTP_CLIENT_RETRY_BACKOFF_SECONDS,
+    RETRYABLE_STATUS_CODES,
+)
+from utils.get_env import (
+    get_http_client_limit_per_host_env,
+    get_http_client_retries_env,
+    get_http_client_timeout_env,
+)
+from utils.parsers import parse_int_or_default
+
+
+# 应用级共享 HTTP 客户端，复用连接池和 DNS 缓存
+class HttpClientService:
+    """
+    One pooled aiohttp session per event loop for the lifetime of the app.
+    Connections are capped per host, DNS lookups are cached and idempotent
+    requests are retried with exponential backoff on connection errors and
+    retryable statuses.
+
+    Sessions with trust_env pick up proxy settings from the environment,
+    requests to the local Next.js server use a session without them.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[
+            Tuple[bool, asyncio.AbstractEventLoop], aiohttp.ClientSession
+        ] = {}
+
+    def get_retries(self) -> int:
+        return parse_int_or_default(
+            get_http_client_retries_env(),
+            DEFAULT_HTTP_CLIENT_RETRIES,
+            0,
+            "HTTP_CLIENT_RETRIES",
+        )
+
+    def get_timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=parse_int_or_default(
+                get_http_client_timeout_env(),
+                DEFAULT_HTTP_CLIENT_TIMEOUT,
+                0,
+                "HTTP_CLIENT_TIMEOUT",
+            ),
+            # Only opening a connection, waiting for a pooled one is covered by total
+            sock_connect=DEFAULT_HTTP_CLIENT_CONNECT_TIMEOUT,
+        )
+
+    def get_session(self, trust_env: bool = True) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        key = (trust_env, loop)
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            # Sessions of event loops that are gone can't be used anymore
+            for other_key in list(self._sessions.keys()):
+                if other_key[1].is_closed():
+                    self._sessions.pop(other_key)
+
+            connector = aiohttp.TCPConnector(
+                limit=DEFAULT_HTTP_CLIENT_LIMIT,
+                limit_per_host=parse_int_or_default(
+                    get_http_client_limit_per_host_env(),
+                    DEFAULT_HTTP_CLIENT_LIMIT_PER_HOST,
+                    0,
+                    "HTTP_CLIENT_LIMIT_PER_HOST",
+                ),
+                ttl_dns_cache=HTTP_CLIENT_DNS_CACHE_TTL,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.get_timeout(),
+                trust_env=trust_env,
+            )
+            self._sessions[key] = session
+        return session
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retries: Optional[int] = None,
+        trust_env: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Same as session.get/head/post/..., retries default to
+        HTTP_CLIENT_RETRIES for GET and HEAD and to none for other methods.
+        """
+        if retries is None:
+            retries = self.get_retries() if method.upper() in ("GET", "HEAD") else 0
+
+        session = self.get_session(trust_env)
+        attempt = 0
+        while True:
+            try:
+                response = await getattr(session, method.lower())(url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                response.release()
+
+            await asyncio.sleep(HTTP_CLIENT_RETRY_BACKOFF_SECONDS * 2**attempt)
+            attempt += 1
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        for key in list(self._sessions.keys()):
+            if key[1] is loop:
+                await self._sessions.pop(key).close()
+
+
+HTTP_CLIENT = HttpClientService()
@@ -1,40 +1,146 @@
 import asyncio
-import json
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+from collections import OrderedDict
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from constants.presentation import (
+    DEFAULT_ICON_SEARCH_BACKEND,
+    ICON_INDEX_EMBEDDINGS_PATH,
+    ICON_INDEX_IDS_PATH,
+    ICON_INDEX_WAIT_TIMEOUT_SECONDS,
+    ICON_PLACEHOLDER_URL,
+    ICON_QUERY_EMBEDDING_CACHE_SIZE,
+    ICON_SEARCH_BATCH_WINDOW_SECONDS,
+    ICON_SEARCH_MAX_BATCH_SIZE,
+)
+from enums.icon_index_state import IconIndexState
+from models.icon_index_status import IconIndexStatus
+from services.asset_cache_service import ASSET_CACHE_SERVICE
+from services.icon_vector_index import (
+    IconVectorIndex,
+    get_icon_documents,
+    get_icon_embedding_function,
+)
+from utils.get_env import get_icon_search_backend_env
+
+
+def get_icon_search_backend() -> str:
+    backend = get_icon_search_backend_env()
+    if backend:
+        if backend.lower() in ("numpy", "chroma"):
+            return backend.lower()
+        print(f"Invalid ICON_SEARCH_BACKEND: {backend}")
+    return DEFAULT_ICON_SEARCH_BACKEND
 
 
 class IconFinderService:
+    """
+    Icon search over the icon catalogue. Nothing is loaded on import, the
+    embedding model and the index are loaded in a background thread started
+    at startup or by the first search. Searches made before the index is
+    ready get the placeholder icon, unless they wait for it.
+    """
+
     def __init__(self):
         self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
+        # Icon queries waiting to be searched together, per event loop and k
+        self._batches: Dict[
+            Tuple[asyncio.AbstractEventLoop, int], Dict[str, asyncio.Future]
+        ] = {}
+        self._background_tasks = set[asyncio.Task]()
+        # Embeddings of recent queries, least recently used first
+        self._query_embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.backend = get_icon_search_backend()
+        self.state = IconIndexState.PENDING
+        self.error: Optional[str] = None
+        self._state_lock = threading.Lock()
+
+    def start_initialization(self):
+        """
+        Starts loading the icon index in the background. Does nothing while
+        it is loading or once it is ready, retries after a failure.
+        """
+        with self._state_lock:
+            if self.state in (IconIndexState.INITIALIZING, IconIndexState.READY):
+                return
+            self.state = IconIndexState.INITIALIZING
+            self.error = None
+        threading.Thread(target=self.initialize, name="icon-index", daemon=True).start()
+
+    def initialize(self):
+        try:
+            self.embedding_function = get_icon_embedding_function()
+            if self.backend == "numpy":
+                print("Initializing icons index...")
+                self._initialize_icons_index()
+                print("Icons index initialized.")
+            else:
+                import chromadb
+                from chromadb.config import Settings
+
+                self.client = chromadb.PersistentClient(
+                    path="chroma", settings=Settings(anonymized_telemetry=False)
+                )
+                print("Initializing icons collection...")
+                self._initialize_icons_collection()
+                print("Icons collection initialized.")
+        except Exception as e:
+            print(f"Error initializing icons index: {e}")
+            with self._state_lock:
+                self.state = IconIndexState.FAILED
+                self.error = str(e)
+            return
+
+        with self._state_lock:
+            self.state = IconIndexState.READY
+
+    def is_ready(self) -> bool:
+        return self.state == IconIndexState.READY
+
+    async def wait_until_ready(self, timeout: float) -> bool:
+        """
+        Waits up to timeout seconds for the index, returns early if loading
+        it fails.
+        """
+        self.start_initialization()
+        deadline = time.monotonic() + timeout
+        while self.state == IconIndexState.INITIALIZING:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(0.1, remaining))
+        return self.is_ready()
+
+    def get_status(self) -> IconIndexStatus:
+        return IconIndexStatus(state=self.state, backend=self.backend, error=self.error)
+
+    # 优先使用构建镜像时生成的索引文件，缺失时现场计算并保存
+    def _initialize_icons_index(self):
+        if os.path.exists(ICON_INDEX_EMBEDDINGS_PATH) and os.path.exists(
+            ICON_INDEX_IDS_PATH
+        ):
+            self.index = IconVectorIndex.load(
+                ICON_INDEX_EMBEDDINGS_PATH, ICON_INDEX_IDS_PATH
+            )
+            return
+
+        documents, ids = get_icon_documents()
+        self.index = IconVectorIndex.build(documents, ids, self.embedding_function)
+        try:
+            self.index.save(ICON_INDEX_EMBEDDINGS_PATH, ICON_INDEX_IDS_PATH)
+        except OSError as e:
+            print(f"Error saving icons index: {e}")
 
     def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
         try:
             self.collection = self.client.get_collection(
                 self.collection_name, embedding_function=self.embedding_function
             )
         except Exception:
-            with open("assets/icons.json", "r") as f:
-                icons = json.load(f)
-
-            documents = []
-            ids = []
-
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
+            documents, ids = get_icon_documents()
 
             if documents:
                 self.collection = self.client.create_collection(
@@ -44,13 +150,129 @@ class IconFinderService:
                 )
                 self.collection.add(documents=documents, ids=ids)
 
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
-        )
-        return [f"/static/icons/bold/{each}.svg" for each in result["ids"][0]]
+    async def search_icons(self, query: str, k: int = 1) -> List[str]:
+        return (await self.search_icons_many([query], k))[0]
+
+    async def search_icons_many(
+        self, queries: List[str], k: int = 1, wait_for_index: bool = False
+    ) -> List[List[str]]:
+        """
+        Searches icons for many queries at once. Queries that aren't cached
+        join the current batch, which is embedded and searched in a single
+        collection query together with concurrent searches from other slides.
+        Slides saved with the results pass wait_for_index, so they only get
+        placeholders when the index isn't ready within
+        ICON_INDEX_WAIT_TIMEOUT_SECONDS.
+        """
+        if queries and not self.is_ready():
+            if wait_for_index:
+                await self.wait_until_ready(ICON_INDEX_WAIT_TIMEOUT_SECONDS)
+            else:
+                self.start_initialization()
+        if not self.is_ready():
+            # 索引加载完成前返回占位图标，且不写入缓存
+            if queries and wait_for_index:
+                print(f"Icon index is {self.state.value}, using placeholder icons")
+            return [[ICON_PLACEHOLDER_URL] for _ in queries]
+
+        unique_queries = list(dict.fromkeys(queries))
+
+        async def get_icons(query: str) -> List[str]:
+            cache_key = ("icons", query, k)
+            icons = ASSET_CACHE_SERVICE.get(cache_key)
+            if icons is None:
+                icons, _ = await ASSET_CACHE_SERVICE.run_once(
+                    cache_key, lambda: self._add_to_batch(query, k)
+                )
+                ASSET_CACHE_SERVICE.set(cache_key, icons)
+            return icons
+
+        results = await asyncio.gather(*[get_icons(each) for each in unique_queries])
+        icons_by_query = dict(zip(unique_queries, results))
+        return [list(icons_by_query[each]) for each in queries]
+
+    async def _add_to_batch(self, query: str, k: int) -> List[str]:
+        loop = asyncio.get_running_loop()
+        batch_key = (loop, k)
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = {}
+            self._batches[batch_key] = batch
+            loop.call_later(
+                ICON_SEARCH_BATCH_WINDOW_SECONDS,
+                lambda: self._flush_batch(batch_key, batch),
+            )
+
+        future = batch.get(query)
+        if future is None:
+            future = loop.create_future()
+            batch[query] = future
+            if len(batch) >= ICON_SEARCH_MAX_BATCH_SIZE:
+                self._flush_batch(batch_key, batch)
+
+        # Shielded so a cancelled caller doesn't cancel the result for the others
+        return await asyncio.shield(future)
+
+    def _flush_batch(self, batch_key: Tuple[asyncio.AbstractEventLoop, int], batch):
+        # Already flushed when it reached the maximum size
+        if self._batches.get(batch_key) is not batch:
+            return
+        self._batches.pop(batch_key)
+        task = asyncio.ensure_future(self._run_batch(batch_key[1], batch))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _run_batch(self, k: int, batch: Dict[str, asyncio.Future]):
+        queries = list(batch.keys())
+        try:
+            results = await self._search_icons_many(queries, k)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Nobody may be waiting on the future anymore
+                    future.exception()
+        else:
+            for future, icons in zip(batch.values(), results):
+                if not future.done():
+                    future.set_result(icons)
+
+    async def _get_query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """
+        Embeds only the queries that aren't in the LRU cache, in one call.
+        """
+        embeddings = {}
+        for query in queries:
+            embedding = self._query_embeddings.get(query)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(query)
+                embeddings[query] = embedding
+
+        missing = [each for each in queries if each not in embeddings]
+        if missing:
+            computed = await asyncio.to_thread(self.embedding_function, missing)
+            for query, embedding in zip(missing, computed):
+                embedding = np.asarray(embedding, dtype=np.float32)
+                embeddings[query] = embedding
+                self._query_embeddings[query] = embedding
+            while len(self._query_embeddings) > ICON_QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+
+        return np.stack([embeddings[each] for each in queries])
+
+    async def _search_icons_many(self, queries: List[str], k: int) -> List[List[str]]:
+        query_embeddings = await self._get_query_embeddings(queries)
+        if self.backend == "numpy":
+            # Exact search over a few thousand rows, cheaper than a thread hop
+            ids_list = self.index.search(query_embeddings, k)
+        else:
+            result = await asyncio.to_thread(
+                self.collection.query,
+                query_embeddings=list(query_embeddings),
+                n_results=k,
+            )
+            ids_list = result["ids"]
+        return [[f"/static/icons/bold/{each}.svg" for each in ids] for ids in ids_list]
 
 
 ICON_FINDER_SERVICE = IconFinderService()
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.clip(norms, 1e-12, None)
+
+
+def get_icon_documents() -> Tuple[List[str], List[str]]:
+    with open("assets/icons.json", "r") as f:
+        icons = json.load(f)
+
+    documents = []
+    ids = []
+
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] == "bold":
+            doc_text = f"{each['name']} {each['tags']}"
+            documents.append(doc_text)
+            ids.append(each["name"])
+
+    return documents, ids
+
+
+def get_icon_embedding_function():
+    # Imported here, loading chromadb takes about a second
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = "chroma/models"
+    embedding_function._download_model_if_not_exists()
+    return embedding_function
+
+
+# 图标向量的精确检索索引，嵌入矩阵以 mmap 方式从 .npy 文件加载
+class IconVectorIndex:
+    """
+    Exact cosine search over the embeddings of the icon catalogue. The
+    embeddings are a normalized float32 matrix with one row per icon id, so
+    the top k of a batch of queries is a single matrix product.
+    """
+
+    def __init__(self, embeddings: np.ndarray, ids: List[str]):
+        if len(embeddings) != len(ids):
+            raise ValueError(
+                f"Icon index has {len(embeddings)} embeddings for {len(ids)} ids"
+            )
+        self.embeddings = embeddings
+        self.ids = ids
+
+    @classmethod
+    def build(
+        cls,
+        documents: List[str],
+        ids: List[str],
+        embedding_function: Callable[[List[str]], List[np.ndarray]],
+    ) -> "IconVectorIndex":
+        embeddings = normalize_embeddings(np.asarray(embedding_function(documents)))
+        return cls(embeddings, ids)
+
+    @classmethod
+    def load(cls, embeddings_path: str, ids_path: str) -> "IconVectorIndex":
+        with open(ids_path, "r") as f:
+            ids = json.load(f)
+        # Memory-mapped, pages are shared between workers and loaded on demand
+        return cls(np.load(embeddings_path, mmap_mode="r"), ids)
+
+    def save(self, embeddings_path: str, ids_path: str):
+        os.makedirs(os.path.dirname(embeddings_path) or ".", exist_ok=True)
+        os.makedirs(os.path.dirname(ids_path) or ".", exist_ok=True)
+
+        temp_embeddings_path = f"{embeddings_path}.tmp"
+        with open(temp_embeddings_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        temp_ids_path = f"{ids_path}.tmp"
+        with open(temp_ids_path, "w") as f:
+            json.dump(self.ids, f)
+
+        os.replace(temp_embeddings_path, embeddings_path)
+        os.replace(temp_ids_path, ids_path)
+
+    def search(self, query_embeddings: np.ndarray, k: int = 1) -> List[List[str]]:
+        """
+        Returns the ids of the k closest icons for every query embedding,
+        closest first.
+        """
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        scores = normalize_embeddings(query_embeddings) @ self.embeddings.T
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        top = np.take_along_axis(top, np.argsort(-top_scores, axis=1), axis=1)
+        return [[self.ids[each] for each in row] for row in top]
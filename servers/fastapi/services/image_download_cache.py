@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from urllib.parse import urlparse
+import uuid
+
+from constants.http_client import (
+    DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_AGE,
+    DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB,
+    DOWNLOAD_FILES_CONCURRENCY,
+)
+from services.http_client_service import HTTP_CLIENT
+from utils.asset_directory_utils import get_cache_directory
+from utils.download_helpers import download_file
+from utils.get_env import get_image_download_cache_max_size_mb_env
+from utils.parsers import parse_int_or_default
+
+
+def get_max_age(headers) -> int:
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match:
+        return int(match.group(1))
+    return DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_AGE
+
+
+def get_extension(url: str, content_type: str) -> str:
+    extension = os.path.splitext(os.path.basename(urlparse(url).path))[1]
+    if extension and len(extension) <= 5:
+        return extension
+    if content_type:
+        return mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+    return ""
+
+
+# 导出图片下载缓存，按 URL 存储并通过 ETag/Last-Modified 重新验证
+class ImageDownloadCache:
+    """
+    Persistent cache of images downloaded for exports, keyed by url. Each
+    entry is the image file plus a json file with its validators. Fresh
+    entries are used without touching the network, stale ones are
+    revalidated with a conditional GET. Entries are hardlinked into the
+    export directory and evicted by least recent use over the disk quota.
+    """
+
+    def __init__(self):
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._directory: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_max_size(self) -> int:
+        max_size_mb = parse_int_or_default(
+            get_image_download_cache_max_size_mb_env(),
+            DEFAULT_IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB,
+            0,
+            "IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB",
+        )
+        return max_size_mb * 1024 * 1024
+
+    def is_enabled(self) -> bool:
+        return self.get_max_size() > 0
+
+    def get_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _get_data_path(self, key: str) -> str:
+        return os.path.join(self._directory, key)
+
+    def _get_metadata_path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.json")
+
+    # Builds the LRU index from the metadata files already on disk, oldest first
+    def _load_index(self):
+        directory = get_cache_directory("image_downloads")
+        if self._index is not None and self._directory == directory:
+            return
+
+        entries = []
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, "r") as f:
+                    size = json.load(f)["size"]
+                entries.append((os.path.getmtime(path), file_name[:-5], size))
+            except (OSError, ValueError, KeyError):
+                continue
+        entries.sort()
+
+        self._directory = directory
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        for path in (self._get_metadata_path(key), self._get_data_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _write_metadata(self, key: str, metadata: dict):
+        path = self._get_metadata_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(temp_path, path)
+
+    def _get_metadata_sync(self, key: str) -> Optional[dict]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+            try:
+                with open(self._get_metadata_path(key), "r") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            if not os.path.exists(self._get_data_path(key)):
+                self._remove(key)
+                return None
+            return metadata
+
+    def _get_temp_path_sync(self) -> str:
+        with self._lock:
+            self._load_index()
+            return os.path.join(self._directory, f"{uuid.uuid4()}.download.tmp")
+
+    def _set_sync(self, key: str, metadata: dict, temp_path: str):
+        with self._lock:
+            self._load_index()
+            os.replace(temp_path, self._get_data_path(key))
+            self._write_metadata(key, metadata)
+
+            self._index[key] = metadata["size"]
+            self._index.move_to_end(key)
+
+            max_size = self.get_max_size()
+            total_size = sum(self._index.values())
+            while total_size > max_size and len(self._index) > 1:
+                oldest_key = next(iter(self._index))
+                total_size -= self._index[oldest_key]
+                self._remove(oldest_key)
+
+    def _revalidated_sync(self, key: str, metadata: dict):
+        with self._lock:
+            self._load_index()
+            self._write_metadata(key, metadata)
+
+    def _link_sync(
+        self, key: str, metadata: dict, save_directory: str
+    ) -> Optional[str]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+
+            os.makedirs(save_directory, exist_ok=True)
+            destination_path = os.path.join(
+                save_directory, f"{key}{metadata.get('extension', '')}"
+            )
+            if not os.path.exists(destination_path):
+                try:
+                    os.link(self._get_data_path(key), destination_path)
+                except OSError:
+                    # Different filesystem or no hardlink support
+                    shutil.copyfile(self._get_data_path(key), destination_path)
+
+            # Metadata mtime is the recency used when the index is rebuilt
+            now = time.time()
+            os.utime(self._get_metadata_path(key), (now, now))
+            self._index.move_to_end(key)
+            return destination_path
+
+    async def _link(
+        self, key: str, metadata: dict, save_directory: str
+    ) -> Optional[str]:
+        return await asyncio.to_thread(self._link_sync, key, metadata, save_directory)
+
+    async def download(self, url: str, save_directory: str) -> Optional[str]:
+        if not self.is_enabled():
+            return await download_file(url, save_directory)
+
+        key = self.get_key(url)
+        metadata = await asyncio.to_thread(self._get_metadata_sync, key)
+        now = time.time()
+        if metadata and now - metadata["fetched_at"] < metadata["max_age"]:
+            return await self._link(key, metadata, save_directory)
+
+        headers = {}
+        if metadata and metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata and metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
+        temp_path = None
+        try:
+            async with HTTP_CLIENT.get(url, headers=headers) as response:
+                if response.status == 304 and metadata:
+                    metadata["fetched_at"] = now
+                    metadata["max_age"] = get_max_age(response.headers)
+                    await asyncio.to_thread(self._revalidated_sync, key, metadata)
+                    return await self._link(key, metadata, save_directory)
+
+                if response.status != 200:
+                    print(f"Failed to download file. HTTP status: {response.status}")
+                    return None
+
+                temp_path = await asyncio.to_thread(self._get_temp_path_sync)
+                size = 0
+                with open(temp_path, "wb") as file:
+                    async for chunk in response.content.iter_chunked(65536):
+                        file.write(chunk)
+                        size += len(chunk)
+
+                metadata = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": now,
+                    "max_age": get_max_age(response.headers),
+                    "extension": get_extension(
+                        url, response.headers.get("Content-Type", "")
+                    ),
+                    "size": size,
+                }
+            await asyncio.to_thread(self._set_sync, key, metadata, temp_path)
+            return await self._link(key, metadata, save_directory)
+
+        except Exception as e:
+            print(f"Error downloading file from {url}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            # A stale copy is better than a missing picture
+            if metadata:
+                return await self._link(key, metadata, save_directory)
+            return None
+
+    async def download_many(
+        self, urls: List[str], save_directory: str
+    ) -> List[Optional[str]]:
+        """
+        Downloads every distinct url once, results are in the order of urls.
+        """
+        semaphore = asyncio.Semaphore(DOWNLOAD_FILES_CONCURRENCY)
+
+        async def download_with_limit(url: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.download(url, save_directory)
+                except Exception as e:
+                    print(f"Exception during download of {url}: {e}")
+                    return None
+
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *[download_with_limit(url) for url in unique_urls]
+        )
+        paths = dict(zip(unique_urls, results))
+        return [paths[url] for url in urls]
+
+
+IMAGE_DOWNLOAD_CACHE = ImageDownloadCache()
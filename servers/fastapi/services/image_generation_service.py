@@ -1,12 +1,22 @@
-import asyncio
+import hashlib
+import json
 import os
-import aiohttp
-from google import genai
+import time
+from typing import Optional
 from google.genai.types import GenerateContentConfig
-from openai import AsyncOpenAI
+from sqlalchemy import and_, func
+from sqlmodel import select
+from constants.presentation import DEFAULT_GENERATED_IMAGE_CACHE_MAX_ENTRIES
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from models.sql.key_value import KeyValueSqlModel
+from services.asset_cache_service import ASSET_CACHE_SERVICE
+from services.database import async_session_maker
+from services.http_client_service import HTTP_CLIENT
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
 from utils.download_helpers import download_file
+from utils.get_env import get_generated_image_cache_max_entries_env
+from utils.get_env import get_google_api_key_env, get_openai_api_key_env
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
 from utils.image_provider import (
@@ -15,14 +25,24 @@ from utils.image_provider import (
     is_gemini_flash_selected,
     is_dalle3_selected,
 )
+from utils.parsers import parse_int_or_default
 import uuid
 
+GENERATED_IMAGE_KEY_PREFIX = "generated_image:"
+
+# Range of the indexed key column holding every generated image entry
+GENERATED_IMAGE_KEY_RANGE = and_(
+    KeyValueSqlModel.key >= GENERATED_IMAGE_KEY_PREFIX,
+    KeyValueSqlModel.key < GENERATED_IMAGE_KEY_PREFIX[:-1] + ";",
+)
+
 
 class ImageGenerationService:
 
-    def __init__(self, output_directory: str):
+    def __init__(self, output_directory: str, reuse_assets: bool = True):
         self.output_directory = output_directory
         self.image_gen_func = self.get_image_gen_func()
+        self.reuse_assets = reuse_assets
 
     def get_image_gen_func(self):
         if is_pixabay_selected():
@@ -45,6 +65,8 @@ class ImageGenerationService:
         - If the stock provider is selected, it uses the prompt directly,
         otherwise it uses the full image prompt with theme.
         - Output Directory is used for saving the generated image not the stock provider.
+        - Unless reuse_assets is disabled, an image already fetched or generated
+        for the same prompt is reused and returned as its path.
         """
         if not self.image_gen_func:
             print("No image generation function found. Using placeholder image.")
@@ -53,6 +75,138 @@ class ImageGenerationService:
         image_prompt = prompt.get_image_prompt(
             with_theme=not self.is_stock_provider_selected()
         )
+        if not self.reuse_assets:
+            return await self._generate_image(prompt, image_prompt)
+
+        cache_key = self.get_cache_key(image_prompt)
+        cached_image = ASSET_CACHE_SERVICE.get(cache_key)
+        if cached_image and self.is_image_available(cached_image):
+            print(f"Request - Reusing Image for {image_prompt}")
+            return cached_image
+
+        image, is_owner = await ASSET_CACHE_SERVICE.run_once(
+            cache_key, lambda: self._find_or_generate_image(prompt, image_prompt)
+        )
+        image_url = image.path if isinstance(image, ImageAsset) else image
+        if image_url != "/static/images/placeholder.jpg":
+            ASSET_CACHE_SERVICE.set(cache_key, image_url)
+
+        # 只有实际生成图片的调用返回 ImageAsset 用于入库，其余调用复用路径
+        return image if is_owner else image_url
+
+    def get_cache_key(self, image_prompt: str) -> tuple:
+        # 不同提供商或密钥的结果不共享
+        api_key = None
+        if is_pixabay_selected():
+            api_key = get_pixabay_api_key_env()
+        elif is_pixels_selected():
+            api_key = get_pexels_api_key_env()
+        elif is_gemini_flash_selected():
+            api_key = get_google_api_key_env()
+        elif is_dalle3_selected():
+            api_key = get_openai_api_key_env()
+        return (self.image_gen_func.__name__, api_key, image_prompt)
+
+    def is_image_available(self, image_url: str) -> bool:
+        return image_url.startswith("http") or os.path.exists(image_url)
+
+    async def _find_or_generate_image(
+        self, prompt: ImagePrompt, image_prompt: str
+    ) -> str | ImageAsset:
+        if not self.is_stock_provider_selected():
+            image_path = await self.find_generated_image(prompt)
+            if image_path:
+                print(f"Request - Reusing Image for {image_prompt}")
+                return image_path
+        return await self._generate_image(prompt, image_prompt)
+
+    def get_generated_image_key(self, prompt: ImagePrompt) -> str:
+        # 存入带索引的 key 列，避免扫描 image_assets 的 JSON 列
+        key = json.dumps(
+            [self.image_gen_func.__name__, prompt.prompt, prompt.theme_prompt]
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f"{GENERATED_IMAGE_KEY_PREFIX}{digest}"
+
+    def get_generated_image_max_entries(self) -> int:
+        return parse_int_or_default(
+            get_generated_image_cache_max_entries_env(),
+            DEFAULT_GENERATED_IMAGE_CACHE_MAX_ENTRIES,
+            0,
+            "GENERATED_IMAGE_CACHE_MAX_ENTRIES",
+        )
+
+    async def find_generated_image(self, prompt: ImagePrompt) -> Optional[str]:
+        """
+        Looks up an image previously generated for the same prompt, theme and
+        provider by its key in the key value table and marks it as used.
+        """
+        try:
+            async with async_session_maker() as sql_session:
+                key_value = await sql_session.scalar(
+                    select(KeyValueSqlModel).where(
+                        KeyValueSqlModel.key == self.get_generated_image_key(prompt)
+                    )
+                )
+                if not key_value:
+                    return None
+                image_path = (key_value.value or {}).get("path")
+                if image_path and os.path.exists(image_path):
+                    key_value.value = {"path": image_path, "used_at": time.time()}
+                    sql_session.add(key_value)
+                    await sql_session.commit()
+                    return image_path
+                await sql_session.delete(key_value)
+                await sql_session.commit()
+        except Exception as e:
+            print(f"Error finding generated image: {e}")
+        return None
+
+    async def save_generated_image(self, prompt: ImagePrompt, image_path: str):
+        max_entries = self.get_generated_image_max_entries()
+        if not max_entries:
+            return
+        try:
+            async with async_session_maker() as sql_session:
+                key = self.get_generated_image_key(prompt)
+                key_value = await sql_session.scalar(
+                    select(KeyValueSqlModel).where(KeyValueSqlModel.key == key)
+                )
+                if not key_value:
+                    key_value = KeyValueSqlModel(key=key, value={})
+                key_value.value = {"path": image_path, "used_at": time.time()}
+                sql_session.add(key_value)
+                await sql_session.commit()
+                await self.prune_generated_images(sql_session, max_entries)
+        except Exception as e:
+            print(f"Error saving generated image: {e}")
+
+    async def prune_generated_images(self, sql_session, max_entries: int):
+        """
+        Drops the least recently used entries above max_entries. Only the
+        entries are dropped, the image files belong to the presentations
+        using them.
+        """
+        count = await sql_session.scalar(
+            select(func.count())
+            .select_from(KeyValueSqlModel)
+            .where(GENERATED_IMAGE_KEY_RANGE)
+        )
+        if count <= max_entries:
+            return
+        key_values = list(
+            await sql_session.scalars(
+                select(KeyValueSqlModel).where(GENERATED_IMAGE_KEY_RANGE)
+            )
+        )
+        key_values.sort(key=lambda key_value: (key_value.value or {}).get("used_at", 0))
+        for key_value in key_values[: len(key_values) - max_entries]:
+            await sql_session.delete(key_value)
+        await sql_session.commit()
+
+    async def _generate_image(
+        self, prompt: ImagePrompt, image_prompt: str
+    ) -> str | ImageAsset:
         print(f"Request - Generating Image for {image_prompt}")
 
         try:
@@ -66,12 +220,14 @@ class ImageGenerationService:
                 if image_path.startswith("http"):
                     return image_path
                 elif os.path.exists(image_path):
+                    await self.save_generated_image(prompt, image_path)
                     return ImageAsset(
                         path=image_path,
                         is_uploaded=False,
                         extras={
                             "prompt": prompt.prompt,
                             "theme_prompt": prompt.theme_prompt,
+                            "generator": self.image_gen_func.__name__,
                         },
                     )
             raise Exception(f"Image not found at {image_path}")
@@ -81,7 +237,7 @@ class ImageGenerationService:
             return "/static/images/placeholder.jpg"
 
     async def generate_image_openai(self, prompt: str, output_directory: str) -> str:
-        client = AsyncOpenAI()
+        client = LLM_CLIENT_REGISTRY.get_openai_client(get_openai_api_key_env())
         result = await client.images.generate(
             model="dall-e-3",
             prompt=prompt,
@@ -93,9 +249,8 @@ class ImageGenerationService:
         return await download_file(image_url, output_directory)
 
     async def generate_image_google(self, prompt: str, output_directory: str) -> str:
-        client = genai.Client()
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        client = LLM_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash-image-preview",
             contents=[prompt],
             config=GenerateContentConfig(response_modalities=["TEXT", "IMAGE"]),
@@ -112,20 +267,18 @@ class ImageGenerationService:
         return image_path
 
     async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
-            )
+        async with HTTP_CLIENT.get(
+            f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        ) as response:
             data = await response.json()
             image_url = data["photos"][0]["src"]["large"]
             return image_url
 
     async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
-            )
+        async with HTTP_CLIENT.get(
+            f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
+        ) as response:
             data = await response.json()
             image_url = data["hits"][0]["largeImageURL"]
             return image_url
@@ -1,4 +1,3 @@
-import asyncio
 import dirtyjson
 import json
 from typing import AsyncGenerator, List, Optional
@@ -39,31 +38,19 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from services.llm_response_cache import LLM_RESPONSE_CACHE
 from services.llm_tool_calls_handler import LLMToolCallsHandler
-from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
-from utils.get_env import (
-    get_anthropic_api_key_env,
-    get_custom_llm_api_key_env,
-    get_custom_llm_url_env,
-    get_disable_thinking_env,
-    get_google_api_key_env,
-    get_ollama_url_env,
-    get_openai_api_key_env,
-    get_tool_calls_env,
-    get_web_grounding_env,
-)
+from services.user_config_service import USER_CONFIG_SERVICE
 from utils.llm_provider import get_llm_provider, get_model
-from utils.parsers import parse_bool_or_none
-from utils.schema_utils import (
-    ensure_strict_json_schema,
-    flatten_json_schema,
-    remove_titles_from_schema,
-)
+from utils.schema_cache import get_google_json_schema, get_strict_json_schema
 
 
 class LLMClient:
     def __init__(self):
+        # One config snapshot for the lifetime of the client
+        self.user_config = USER_CONFIG_SERVICE.get_snapshot()
         self.llm_provider = get_llm_provider()
         self._client = self._get_client()
         self.tool_calls_handler = LLMToolCallsHandler(self)
@@ -72,7 +59,7 @@ class LLMClient:
     def use_tool_calls_for_structured_output(self) -> bool:
         if self.llm_provider != LLMProvider.CUSTOM:
             return False
-        return parse_bool_or_none(get_tool_calls_env()) or False
+        return self.user_config.TOOL_CALLS or False
 
     # ? Web Grounding
     def enable_web_grounding(self) -> bool:
@@ -81,11 +68,11 @@ class LLMClient:
             or self.llm_provider == LLMProvider.CUSTOM
         ):
             return False
-        return parse_bool_or_none(get_web_grounding_env()) or False
+        return self.user_config.WEB_GROUNDING or False
 
     # ? Disable thinking
     def disable_thinking(self) -> bool:
-        return parse_bool_or_none(get_disable_thinking_env()) or False
+        return self.user_config.DISABLE_THINKING or False
 
     # ? Clients
     def _get_client(self):
@@ -107,44 +94,48 @@ class LLMClient:
                 )
 
     def _get_openai_client(self):
-        if not get_openai_api_key_env():
+        if not self.user_config.OPENAI_API_KEY:
             raise HTTPException(
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        return LLM_CLIENT_REGISTRY.get_openai_client(self.user_config.OPENAI_API_KEY)
 
     def _get_google_client(self):
-        if not get_google_api_key_env():
+        if not self.user_config.GOOGLE_API_KEY:
             raise HTTPException(
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_CLIENT_REGISTRY.get_google_client(self.user_config.GOOGLE_API_KEY)
 
     def _get_anthropic_client(self):
-        if not get_anthropic_api_key_env():
+        if not self.user_config.ANTHROPIC_API_KEY:
             raise HTTPException(
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_CLIENT_REGISTRY.get_anthropic_client(
+            self.user_config.ANTHROPIC_API_KEY
+        )
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
+        return LLM_CLIENT_REGISTRY.get_openai_client(
             api_key="ollama",
+            base_url=(self.user_config.OLLAMA_URL or "http://localhost:11434") + "/v1",
+            provider=LLMProvider.OLLAMA,
         )
 
     def _get_custom_client(self):
-        if not get_custom_llm_url_env():
+        if not self.user_config.CUSTOM_LLM_URL:
             raise HTTPException(
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
+        return LLM_CLIENT_REGISTRY.get_openai_client(
+            api_key=self.user_config.CUSTOM_LLM_API_KEY or "null",
+            base_url=self.user_config.CUSTOM_LLM_URL,
+            provider=LLMProvider.CUSTOM,
         )
 
     # ? Prompts
@@ -255,8 +246,7 @@ class LLMClient:
         if tools:
             google_tools = [GoogleTool(function_declarations=[tool]) for tool in tools]
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -464,11 +454,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = get_strict_json_schema(response_schema)
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
                 all_tools = []
@@ -579,16 +565,13 @@ class LLMClient:
                         {
                             "name": "ResponseSchema",
                             "description": "Provide response to the user",
-                            "parameters": remove_titles_from_schema(
-                                flatten_json_schema(response_format)
-                            ),
+                            "parameters": get_google_json_schema(response_format),
                         }
                     ]
                 )
             )
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -774,7 +757,28 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
+        use_cache: bool = True,
     ) -> dict:
+        # Tool calls can depend on external state, so only plain calls are cached
+        cache_key = None
+        if use_cache and not tools and LLM_RESPONSE_CACHE.is_enabled():
+            cache_key = LLM_RESPONSE_CACHE.get_key(
+                self.llm_provider.value,
+                model,
+                messages,
+                response_format,
+                strict,
+                max_tokens=max_tokens,
+                options={
+                    "disable_thinking": self.disable_thinking(),
+                    "extended_reasoning": self.user_config.EXTENDED_REASONING or False,
+                    "tool_calls": self.use_tool_calls_for_structured_output(),
+                },
+            )
+            cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+            if cached_content is not None:
+                return cached_content
+
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         content = None
@@ -825,6 +829,8 @@ class LLMClient:
                 status_code=400,
                 detail="LLM did not return any content",
             )
+        if cache_key:
+            await LLM_RESPONSE_CACHE.set(cache_key, content)
         return content
 
     # ? Stream Unstructured Content
@@ -941,7 +947,7 @@ class LLMClient:
 
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -1149,11 +1155,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = get_strict_json_schema(response_schema)
 
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
@@ -1300,9 +1302,7 @@ class LLMClient:
                         {
                             "name": "ResponseSchema",
                             "description": "Provide response to the user",
-                            "parameters": remove_titles_from_schema(
-                                flatten_json_schema(response_format)
-                            ),
+                            "parameters": get_google_json_schema(response_format),
                         }
                     ]
                 )
@@ -1313,7 +1313,7 @@ class LLMClient:
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
         has_response_schema_tool_call = False
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=parsed_messages,
             config=GenerateContentConfig(
@@ -1583,8 +1583,7 @@ class LLMClient:
         grounding_tool = GoogleTool(google_search=GoogleSearch())
         config = GenerateContentConfig(tools=[grounding_tool])
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=get_model(),
             contents=query,
             config=config,
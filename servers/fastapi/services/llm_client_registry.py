@@ -0,0 +1,80 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from anthropic import AsyncAnthropic
+from google import genai
+from openai import AsyncOpenAI
+
+from enums.llm_provider import LLMProvider
+
+
+# 进程级 LLM 客户端注册表，复用底层 HTTP 连接池
+class LLMClientRegistry:
+    """
+    Caches provider SDK clients by (provider, base url, api key) so every
+    LLMClient shares the same keep-alive connection pool instead of opening
+    a new one per call.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(
+        self,
+        provider: LLMProvider,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        factory: Callable[[], Any],
+    ):
+        key = (provider.value, base_url, api_key)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                self._clients[key] = client
+            return client
+
+    def get_openai_client(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        provider: LLMProvider = LLMProvider.OPENAI,
+    ) -> AsyncOpenAI:
+        return self._get_or_create(
+            provider,
+            base_url,
+            api_key,
+            lambda: AsyncOpenAI(api_key=api_key, base_url=base_url),
+        )
+
+    def get_google_client(self, api_key: Optional[str]) -> genai.Client:
+        return self._get_or_create(
+            LLMProvider.GOOGLE,
+            None,
+            api_key,
+            lambda: genai.Client(api_key=api_key),
+        )
+
+    def get_anthropic_client(self, api_key: Optional[str]) -> AsyncAnthropic:
+        return self._get_or_create(
+            LLMProvider.ANTHROPIC,
+            None,
+            api_key,
+            lambda: AsyncAnthropic(api_key=api_key),
+        )
+
+    def invalidate(self):
+        """
+        Drops every cached client. In-flight requests keep their reference
+        and the old connection pools are released once they finish.
+        """
+        with self._lock:
+            self._clients = {}
+
+
+LLM_CLIENT_REGISTRY = LLMClientRegistry()
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from constants.llm import (
+    DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_LLM_RESPONSE_CACHE_TTL,
+)
+from models.llm_message import LLMMessage
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_llm_response_cache_env,
+    get_llm_response_cache_max_entries_env,
+    get_llm_response_cache_ttl_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_default
+
+
+# 结构化输出的内容寻址缓存，相同输入直接复用之前的响应
+class LLMResponseCache:
+    """
+    Disk backed cache for structured LLM responses. Entries are stored as
+    one json file per key under the app data directory and evicted by TTL
+    and least recent use.
+    """
+
+    def __init__(self):
+        self._index: Optional[OrderedDict[str, float]] = None
+        self._directory: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        return parse_bool_or_none(get_llm_response_cache_env()) or False
+
+    def get_ttl(self) -> int:
+        return parse_int_or_default(
+            get_llm_response_cache_ttl_env(),
+            DEFAULT_LLM_RESPONSE_CACHE_TTL,
+            1,
+            "LLM_RESPONSE_CACHE_TTL",
+        )
+
+    def get_max_entries(self) -> int:
+        return parse_int_or_default(
+            get_llm_response_cache_max_entries_env(),
+            DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES,
+            1,
+            "LLM_RESPONSE_CACHE_MAX_ENTRIES",
+        )
+
+    def get_key(
+        self,
+        provider: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        max_tokens: Optional[int] = None,
+        options: Optional[dict] = None,
+    ) -> str:
+        """
+        Options are the client settings that change the response, e.g.
+        whether thinking is disabled.
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": [message.model_dump(mode="json") for message in messages],
+                "response_format": response_format,
+                "strict": strict,
+                "max_tokens": max_tokens,
+                "options": options or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.json")
+
+    # Builds the LRU index from the files already on disk, oldest first
+    def _load_index(self):
+        directory = get_cache_directory("llm_responses")
+        if self._index is not None and self._directory == directory:
+            return
+
+        entries = []
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                mtime = os.path.getmtime(os.path.join(directory, file_name))
+            except OSError:
+                continue
+            entries.append((mtime, file_name[:-5]))
+        entries.sort()
+
+        self._directory = directory
+        self._index = OrderedDict((key, mtime) for mtime, key in entries)
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _get_sync(self, key: str) -> Optional[dict]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+
+            path = self._get_path(key)
+            try:
+                with open(path, "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+
+            if time.time() - entry["created_at"] > self.get_ttl():
+                self._remove(key)
+                return None
+
+            now = time.time()
+            os.utime(path, (now, now))
+            self._index[key] = now
+            self._index.move_to_end(key)
+            return entry["response"]
+
+    def _set_sync(self, key: str, response: dict):
+        with self._lock:
+            self._load_index()
+
+            path = self._get_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"created_at": time.time(), "response": response}, f)
+            os.replace(temp_path, path)
+
+            self._index[key] = time.time()
+            self._index.move_to_end(key)
+
+            max_entries = self.get_max_entries()
+            while len(self._index) > max_entries:
+                oldest_key = next(iter(self._index))
+                self._remove(oldest_key)
+
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except Exception as e:
+            print(f"Error reading LLM response cache: {e}")
+            return None
+
+    async def set(self, key: str, response: dict):
+        try:
+            await asyncio.to_thread(self._set_sync, key, response)
+        except Exception as e:
+            print(f"Error writing LLM response cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._load_index()
+            for key in list(self._index.keys()):
+                self._remove(key)
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from constants.presentation import DEFAULT_PPTX_EXPORT_CONCURRENCY
+from models.pptx_export_status import PptxExportStatus
+from utils.get_env import get_pptx_export_concurrency_env
+from utils.parsers import parse_int_or_default
+
+
+# PPTX 组装与保存在独立线程池中执行，避免阻塞事件循环
+class PptxExportService:
+    """
+    Runs the python-pptx work of exports on a dedicated thread pool. At most
+    PPTX_EXPORT_CONCURRENCY exports run at once, the rest wait in line and
+    are counted in the queue depth.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+        self._running = 0
+
+    def get_concurrency(self) -> int:
+        return parse_int_or_default(
+            get_pptx_export_concurrency_env(),
+            DEFAULT_PPTX_EXPORT_CONCURRENCY,
+            1,
+            "PPTX_EXPORT_CONCURRENCY",
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.get_concurrency(), thread_name_prefix="pptx-export"
+            )
+        return self._executor
+
+    # Semaphores are bound to the event loop they are first used on
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.get_concurrency())
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        semaphore = self._get_semaphore()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            self._running -= 1
+            semaphore.release()
+
+    def get_status(self) -> PptxExportStatus:
+        return PptxExportStatus(
+            running=self._running,
+            waiting=self._waiting,
+            concurrency=self.get_concurrency(),
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+PPTX_EXPORT_SERVICE = PptxExportService()
@@ -1,5 +1,9 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -11,7 +15,6 @@ from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
 
 from pptx.util import Pt
@@ -19,7 +22,6 @@ from pptx.dml.color import RGBColor
 
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
-    PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
@@ -34,19 +36,65 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from utils.download_helpers import download_files
-from utils.image_utils import (
-    clip_image,
-    create_circle_image,
-    fit_image,
-    invert_image,
-    round_image_corners,
-    set_image_opacity,
-)
+from constants.presentation import DEFAULT_PPTX_IMAGE_WORKERS
+from services.image_download_cache import IMAGE_DOWNLOAD_CACHE
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
+from utils.get_env import get_pptx_image_workers_env
+from utils.image_utils import picture_needs_transform, transform_picture
+from utils.parsers import parse_int_or_default
 import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
+# Only the fields the image transform depends on, position on the slide is applied later
+PICTURE_TRANSFORM_FIELDS = {
+    "picture": {"path"},
+    "position": {"width", "height"},
+    "clip": True,
+    "opacity": True,
+    "invert": True,
+    "border_radius": True,
+    "shape": True,
+    "object_fit": True,
+}
+
+_picture_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pptx_image_workers() -> int:
+    return parse_int_or_default(
+        get_pptx_image_workers_env(),
+        min(DEFAULT_PPTX_IMAGE_WORKERS, os.cpu_count() or 1),
+        1,
+        "PPTX_IMAGE_WORKERS",
+    )
+
+
+# 图片处理进程池，所有导出共享
+def get_picture_process_pool() -> ProcessPoolExecutor:
+    global _picture_process_pool
+    if _picture_process_pool is None:
+        _picture_process_pool = ProcessPoolExecutor(
+            max_workers=get_pptx_image_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _picture_process_pool
+
+
+def reset_picture_process_pool(pool: Optional[ProcessPoolExecutor] = None):
+    """
+    Shuts the shared pool down. Given a pool, only if it is still the shared
+    one, so a late failure can't stop a pool other exports already use.
+    """
+    global _picture_process_pool
+    if _picture_process_pool is None:
+        return
+    if pool is not None and pool is not _picture_process_pool:
+        return
+    _picture_process_pool.shutdown(wait=False, cancel_futures=True)
+    _picture_process_pool = None
+
+
 # PPT创建服务
 class PptxPresentationCreator:
 
@@ -55,6 +103,8 @@ class PptxPresentationCreator:
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
+        # Transform key to processed png path, None if the image couldn't be opened
+        self._processed_pictures: Dict[str, Optional[str]] = {}
 
         self._ppt = Presentation()
         self._ppt.slide_width = Pt(1280)
@@ -102,7 +152,9 @@ class PptxPresentationCreator:
                         models_with_network_asset.append(each_shape)
 
         if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
+            image_paths = await IMAGE_DOWNLOAD_CACHE.download_many(
+                image_urls, self._temp_dir
+            )
 
             for each_shape, each_image_path in zip(
                 models_with_network_asset, image_paths
@@ -111,9 +163,79 @@ class PptxPresentationCreator:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
+    def get_picture_transform_key(self, picture_model: PptxPictureBoxModel) -> str:
+        return picture_model.model_dump_json(include=PICTURE_TRANSFORM_FIELDS)
+
+    async def process_pictures(self):
+        """
+        Runs the image transforms of every picture on every slide in the
+        picture process pool before the slides are assembled. Pictures with
+        the same source and transform are processed once.
+        """
+        pictures_to_process: Dict[str, PptxPictureBoxModel] = {}
+        for slide_model in self._slide_models:
+            for shape_model in slide_model.shapes:
+                if type(shape_model) is not PptxPictureBoxModel:
+                    continue
+                if not picture_needs_transform(shape_model):
+                    continue
+                key = self.get_picture_transform_key(shape_model)
+                if key not in self._processed_pictures:
+                    pictures_to_process.setdefault(key, shape_model)
+
+        if not pictures_to_process:
+            return
+
+        loop = asyncio.get_running_loop()
+        output_paths = [
+            os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
+            for _ in pictures_to_process
+        ]
+        pool = get_picture_process_pool()
+        try:
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        pool, transform_picture, picture_model, output_path
+                    )
+                    for picture_model, output_path in zip(
+                        pictures_to_process.values(), output_paths
+                    )
+                ]
+            )
+        except BrokenProcessPool as e:
+            # A worker was killed, transform in threads instead
+            print(f"Picture process pool failed, processing in threads: {e}")
+            reset_picture_process_pool(pool)
+            results = await asyncio.gather(
+                *[
+                    asyncio.to_thread(transform_picture, picture_model, output_path)
+                    for picture_model, output_path in zip(
+                        pictures_to_process.values(), output_paths
+                    )
+                ]
+            )
+
+        for key, output_path, is_processed in zip(
+            pictures_to_process.keys(), output_paths, results
+        ):
+            self._processed_pictures[key] = output_path if is_processed else None
+
     async def create_ppt(self):
         await self.fetch_network_assets()
+        await self.process_pictures()
+        await PPTX_EXPORT_SERVICE.run(self.add_slides)
+
+    async def create_and_save_ppt(self, path: str):
+        """
+        Same as create_ppt followed by save, with the assembly and save done
+        in a single slot of the export thread pool.
+        """
+        await self.fetch_network_assets()
+        await self.process_pictures()
+        await PPTX_EXPORT_SERVICE.run(self._add_slides_and_save, path)
 
+    def add_slides(self):
         for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
@@ -121,6 +243,10 @@ class PptxPresentationCreator:
 
             self.add_and_populate_slide(slide_model)
 
+    def _add_slides_and_save(self, path: str):
+        self.add_slides()
+        self.save(path)
+
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
         slide_master_part = slide_master.part
@@ -177,47 +303,19 @@ class PptxPresentationCreator:
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
         image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.invert
-            or picture_model.opacity
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
+        if picture_needs_transform(picture_model):
+            key = self.get_picture_transform_key(picture_model)
+            # Pictures not seen by process_pictures are transformed here
+            if key not in self._processed_pictures:
+                output_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
+                self._processed_pictures[key] = (
+                    output_path
+                    if transform_picture(picture_model, output_path)
+                    else None
                 )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+            image_path = self._processed_pictures[key]
+            if not image_path:
+                return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
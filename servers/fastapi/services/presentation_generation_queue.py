@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from typing import Optional
+import uuid
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from constants.presentation import (
+    DEFAULT_PRESENTATION_JOB_LEASE_SECONDS,
+    DEFAULT_PRESENTATION_JOB_MAX_ATTEMPTS,
+)
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.database import async_session_maker
+from utils.datetime_utils import get_current_utc_datetime
+from utils.get_env import (
+    get_presentation_job_lease_seconds_env,
+    get_presentation_job_max_attempts_env,
+)
+from utils.parsers import parse_int_or_default
+
+
+# 基于数据库的异步生成任务队列，通过租约字段认领任务
+class PresentationGenerationQueue:
+    """
+    Jobs are claimed with a compare-and-set update on their lease columns,
+    so any number of worker processes can share the same table. A job whose
+    lease expires without being completed is picked up again.
+    """
+
+    def get_max_attempts(self) -> int:
+        return parse_int_or_default(
+            get_presentation_job_max_attempts_env(),
+            DEFAULT_PRESENTATION_JOB_MAX_ATTEMPTS,
+            1,
+            "PRESENTATION_JOB_MAX_ATTEMPTS",
+        )
+
+    def get_lease_duration(self) -> timedelta:
+        return timedelta(
+            seconds=parse_int_or_default(
+                get_presentation_job_lease_seconds_env(),
+                DEFAULT_PRESENTATION_JOB_LEASE_SECONDS,
+                1,
+                "PRESENTATION_JOB_LEASE_SECONDS",
+            )
+        )
+
+    def enqueue(
+        self,
+        sql_session: AsyncSession,
+        task_id: str,
+        presentation_id: uuid.UUID,
+        request: GeneratePresentationRequest,
+    ) -> PresentationGenerationJobModel:
+        """
+        Adds the job to the session, the caller commits it together with
+        the task status so neither exists without the other.
+        """
+        job = PresentationGenerationJobModel(
+            id=task_id,
+            presentation_id=presentation_id,
+            request=request.model_dump(mode="json"),
+            priority=request.priority,
+            max_attempts=self.get_max_attempts(),
+        )
+        sql_session.add(job)
+        return job
+
+    def _is_claimable(self, now: datetime):
+        return or_(
+            and_(
+                PresentationGenerationJobModel.status == "queued",
+                PresentationGenerationJobModel.available_at <= now,
+            ),
+            and_(
+                PresentationGenerationJobModel.status == "leased",
+                PresentationGenerationJobModel.lease_expires_at < now,
+            ),
+        )
+
+    async def claim(self, worker_id: str) -> Optional[PresentationGenerationJobModel]:
+        """
+        Claims the highest priority job that is ready to run, including
+        jobs left behind by crashed workers.
+        """
+        async with async_session_maker() as sql_session:
+            while True:
+                now = get_current_utc_datetime()
+                job_id = await sql_session.scalar(
+                    select(PresentationGenerationJobModel.id)
+                    .where(self._is_claimable(now))
+                    .order_by(
+                        PresentationGenerationJobModel.priority.desc(),
+                        PresentationGenerationJobModel.created_at,
+                    )
+                    .limit(1)
+                )
+                if job_id is None:
+                    return None
+
+                # Another worker may have claimed it since the select
+                result = await sql_session.execute(
+                    update(PresentationGenerationJobModel)
+                    .where(
+                        PresentationGenerationJobModel.id == job_id,
+                        self._is_claimable(now),
+                    )
+                    .values(
+                        status="leased",
+                        leased_by=worker_id,
+                        lease_expires_at=now + self.get_lease_duration(),
+                        attempts=PresentationGenerationJobModel.attempts + 1,
+                        updated_at=now,
+                    )
+                )
+                await sql_session.commit()
+                if result.rowcount == 1:
+                    return await sql_session.get(PresentationGenerationJobModel, job_id)
+
+    async def _update_leased_job(self, job_id: str, worker_id: str, **values) -> bool:
+        async with async_session_maker() as sql_session:
+            result = await sql_session.execute(
+                update(PresentationGenerationJobModel)
+                .where(
+                    PresentationGenerationJobModel.id == job_id,
+                    PresentationGenerationJobModel.status == "leased",
+                    PresentationGenerationJobModel.leased_by == worker_id,
+                )
+                .values(updated_at=get_current_utc_datetime(), **values)
+            )
+            await sql_session.commit()
+            return result.rowcount == 1
+
+    async def extend_lease(self, job_id: str, worker_id: str) -> bool:
+        return await self._update_leased_job(
+            job_id,
+            worker_id,
+            lease_expires_at=get_current_utc_datetime() + self.get_lease_duration(),
+        )
+
+    async def complete(self, job_id: str, worker_id: str) -> bool:
+        return await self._update_leased_job(
+            job_id,
+            worker_id,
+            status="completed",
+            leased_by=None,
+            lease_expires_at=None,
+        )
+
+    async def fail(self, job_id: str, worker_id: str) -> bool:
+        return await self._update_leased_job(
+            job_id,
+            worker_id,
+            status="failed",
+            leased_by=None,
+            lease_expires_at=None,
+        )
+
+    async def retry(self, job_id: str, worker_id: str, delay: timedelta) -> bool:
+        return await self._update_leased_job(
+            job_id,
+            worker_id,
+            status="queued",
+            leased_by=None,
+            lease_expires_at=None,
+            available_at=get_current_utc_datetime() + delay,
+        )
+
+
+PRESENTATION_GENERATION_QUEUE = PresentationGenerationQueue()
@@ -0,0 +1,228 @@
+import asyncio
+from asyncio import Task
+from datetime import datetime, timedelta
+import os
+import socket
+import traceback
+from typing import Optional
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from api.v1.ppt.endpoints.presentation import generate_presentation_handler
+from constants.presentation import (
+    DEFAULT_PRESENTATION_WORKER_CONCURRENCY,
+    PRESENTATION_JOB_POLL_INTERVAL_SECONDS,
+    PRESENTATION_JOB_RETRY_DELAY_SECONDS,
+)
+from models.api_error_model import APIErrorModel
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.presentation_generation_queue import PRESENTATION_GENERATION_QUEUE
+from services.user_config_service import USER_CONFIG_SERVICE
+from utils.get_env import get_presentation_worker_concurrency_env
+from utils.parsers import parse_int_or_default
+
+
+def get_presentation_worker_concurrency() -> int:
+    return parse_int_or_default(
+        get_presentation_worker_concurrency_env(),
+        DEFAULT_PRESENTATION_WORKER_CONCURRENCY,
+        1,
+        "PRESENTATION_WORKER_CONCURRENCY",
+    )
+
+
+# 异步生成任务的工作进程，可在 API 进程内运行，也可通过 worker.py 单独运行
+class PresentationGenerationWorker:
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or get_presentation_worker_concurrency()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._running_tasks = set[Task]()
+        self._stop_event = asyncio.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    async def run(self):
+        print(
+            f"Presentation generation worker {self.worker_id} started with concurrency of {self.concurrency}"
+        )
+        stop_task = asyncio.create_task(self._stop_event.wait())
+        try:
+            while not self._stop_event.is_set():
+                if len(self._running_tasks) < self.concurrency:
+                    job = await self._claim_job()
+                    if job:
+                        task = asyncio.create_task(self.process_job(job))
+                        self._running_tasks.add(task)
+                        task.add_done_callback(self._running_tasks.discard)
+                        continue
+
+                # Waits for a free slot, a stop request or the next poll
+                await asyncio.wait(
+                    [stop_task, *self._running_tasks],
+                    timeout=PRESENTATION_JOB_POLL_INTERVAL_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        finally:
+            stop_task.cancel()
+            # Interrupted jobs are retried by the next worker once their lease expires
+            for task in self._running_tasks:
+                task.cancel()
+            await asyncio.gather(*self._running_tasks, return_exceptions=True)
+            print(f"Presentation generation worker {self.worker_id} stopped")
+
+    async def _claim_job(self) -> Optional[PresentationGenerationJobModel]:
+        try:
+            return await PRESENTATION_GENERATION_QUEUE.claim(self.worker_id)
+        except Exception as e:
+            print(f"Error claiming presentation generation job: {e}")
+            return None
+
+    async def _keep_lease(self, job_id: str):
+        """
+        Extends the lease until it is lost, returns once another worker may
+        claim the job.
+        """
+        interval = (
+            PRESENTATION_GENERATION_QUEUE.get_lease_duration().total_seconds() / 3
+        )
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await PRESENTATION_GENERATION_QUEUE.extend_lease(
+                    job_id, self.worker_id
+                ):
+                    print(f"Lost lease on presentation generation job {job_id}")
+                    return
+            except Exception as e:
+                print(f"Error extending lease on job {job_id}: {e}")
+
+    async def _owns_lease(self, job_id: str) -> bool:
+        try:
+            return await PRESENTATION_GENERATION_QUEUE.extend_lease(
+                job_id, self.worker_id
+            )
+        except Exception as e:
+            print(f"Error extending lease on job {job_id}: {e}")
+            return False
+
+    async def process_job(self, job: PresentationGenerationJobModel):
+        print(
+            f"Processing presentation generation job {job.id} (attempt {job.attempts} of {job.max_attempts})"
+        )
+        job_task = asyncio.create_task(self._run_job(job))
+        lease_task = asyncio.create_task(self._keep_lease(job.id))
+        try:
+            await asyncio.wait(
+                [job_task, lease_task], return_when=asyncio.FIRST_COMPLETED
+            )
+            if not job_task.done():
+                # Another worker can claim the job now, it must not run twice
+                print(f"Stopping presentation generation job {job.id}")
+                job_task.cancel()
+            (result,) = await asyncio.gather(job_task, return_exceptions=True)
+            if isinstance(result, Exception):
+                traceback.print_exception(result)
+        finally:
+            job_task.cancel()
+            lease_task.cancel()
+            await asyncio.gather(job_task, lease_task, return_exceptions=True)
+
+    async def _run_job(self, job: PresentationGenerationJobModel):
+        # Workers outside the API process don't go through the user config middleware
+        USER_CONFIG_SERVICE.refresh()
+
+        async with async_session_maker() as sql_session:
+            async_status = await sql_session.get(
+                AsyncPresentationGenerationTaskModel, job.id
+            )
+            if not async_status:
+                await PRESENTATION_GENERATION_QUEUE.fail(job.id, self.worker_id)
+                return
+
+            # Worker crashed or was stopped on every attempt
+            if job.attempts > job.max_attempts:
+                if not await self._owns_lease(job.id):
+                    return
+                self._set_status_error(async_status)
+                sql_session.add(async_status)
+                await sql_session.commit()
+                await PRESENTATION_GENERATION_QUEUE.fail(job.id, self.worker_id)
+                return
+
+            # Removes whatever a previous attempt managed to save
+            if job.attempts > 1:
+                await sql_session.execute(
+                    delete(SlideModel).where(
+                        SlideModel.presentation == job.presentation_id
+                    )
+                )
+                await sql_session.execute(
+                    delete(PresentationModel).where(
+                        PresentationModel.id == job.presentation_id
+                    )
+                )
+                await sql_session.commit()
+
+            try:
+                await generate_presentation_handler(
+                    GeneratePresentationRequest(**job.request),
+                    job.presentation_id,
+                    async_status,
+                    sql_session,
+                    is_last_attempt=job.attempts >= job.max_attempts,
+                )
+            except Exception as e:
+                print(f"Presentation generation job {job.id} failed, retrying: {e}")
+                await sql_session.rollback()
+                if not await self._owns_lease(job.id):
+                    # The job belongs to another worker now, its status too
+                    return
+                async_status = await sql_session.get(
+                    AsyncPresentationGenerationTaskModel, job.id
+                )
+                async_status.status = "pending"
+                async_status.message = f"Retrying presentation generation (attempt {job.attempts} of {job.max_attempts} failed)"
+                async_status.updated_at = datetime.now()
+                sql_session.add(async_status)
+                await sql_session.commit()
+
+                await PRESENTATION_GENERATION_QUEUE.retry(
+                    job.id,
+                    self.worker_id,
+                    timedelta(
+                        seconds=PRESENTATION_JOB_RETRY_DELAY_SECONDS
+                        * 2 ** (job.attempts - 1)
+                    ),
+                )
+                return
+
+            if async_status.status == "completed":
+                is_owner = await PRESENTATION_GENERATION_QUEUE.complete(
+                    job.id, self.worker_id
+                )
+            else:
+                is_owner = await PRESENTATION_GENERATION_QUEUE.fail(
+                    job.id, self.worker_id
+                )
+            if not is_owner:
+                print(
+                    f"Presentation generation job {job.id} finished after its lease was lost"
+                )
+
+    def _set_status_error(self, async_status: AsyncPresentationGenerationTaskModel):
+        async_status.status = "error"
+        async_status.message = "Presentation generation failed"
+        async_status.updated_at = datetime.now()
+        async_status.error = APIErrorModel.from_exception(
+            HTTPException(status_code=500, detail="Presentation generation failed")
+        ).model_dump(mode="json")
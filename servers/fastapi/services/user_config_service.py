@@ -0,0 +1,95 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+from models.user_config import UserConfig, UserConfigSnapshot
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from utils.get_env import get_can_change_keys_env, get_user_config_path_env
+from utils.user_config import get_user_config, update_env_with_user_config
+
+# Environment variables the snapshot depends on besides the config file
+USER_CONFIG_ENV_NAMES = (
+    "CAN_CHANGE_KEYS",
+    "USER_CONFIG_PATH",
+    *UserConfig.model_fields.keys(),
+)
+
+
+def get_user_config_file_state(
+    user_config_path: Optional[str],
+) -> Optional[Tuple[int, int]]:
+    if not user_config_path:
+        return None
+    try:
+        stat = os.stat(user_config_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# 用户配置快照，只在配置文件或相关环境变量变化时重新加载
+class UserConfigService:
+    """
+    Holds an immutable snapshot of the user config, the config file merged
+    over the environment. Checking for changes is a stat of the config file
+    and a few environment lookups, the file is only read again when its
+    mtime or size changed.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[UserConfigSnapshot] = None
+        self._state = None
+        self._applied: Optional[UserConfigSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _get_state(self) -> tuple:
+        return (
+            get_user_config_file_state(get_user_config_path_env()),
+            tuple(os.environ.get(name) for name in USER_CONFIG_ENV_NAMES),
+        )
+
+    def _load(self) -> UserConfigSnapshot:
+        # Keys can't be changed from the app, only the environment is used
+        read_file = get_can_change_keys_env() != "false"
+        return UserConfigSnapshot(**get_user_config(read_file).model_dump())
+
+    def get_snapshot(self) -> UserConfigSnapshot:
+        state = self._get_state()
+        snapshot = self._snapshot
+        if snapshot is not None and state == self._state:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or state != self._state:
+                self._snapshot = self._load()
+                self._state = state
+            return self._snapshot
+
+    def reload(self) -> UserConfigSnapshot:
+        with self._lock:
+            self._snapshot = None
+            self._state = None
+        return self.get_snapshot()
+
+    def refresh(self) -> bool:
+        """
+        Applies the snapshot to the environment for code that still reads
+        it and drops cached LLM clients when the config changed.
+        Returns True if it changed since the last refresh.
+        """
+        snapshot = self.get_snapshot()
+        if snapshot == self._applied:
+            return False
+
+        with self._lock:
+            if get_can_change_keys_env() != "false":
+                update_env_with_user_config(snapshot)
+                # Environment now matches the snapshot, no reload needed for it
+                if self._snapshot is snapshot:
+                    self._state = self._get_state()
+            self._applied = snapshot
+        LLM_CLIENT_REGISTRY.invalidate()
+        return True
+
+
+USER_CONFIG_SERVICE = UserConfigService()
@@ -1,9 +1,9 @@
 import asyncio
-import aiohttp
 from sqlmodel import select
 from enums.webhook_event import WebhookEvent
 from models.sql.webhook_subscription import WebhookSubscription
 from services.database import get_async_session
+from services.http_client_service import HTTP_CLIENT
 
 
 class WebhookService:
@@ -42,13 +42,13 @@ class WebhookService:
             headers["Authorization"] = f"Bearer {subscription.secret}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    subscription.url,
-                    json=data,
-                    headers=headers,
-                ) as _:
-                    pass
+            async with HTTP_CLIENT.post(
+                subscription.url,
+                json=data,
+                headers=headers,
+                trust_env=False,
+            ) as _:
+                pass
 
         except Exception as e:
             print(f"Error sending request to webhook {subscription.id}: {e}")
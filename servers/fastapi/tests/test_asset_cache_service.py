@@ -0,0 +1,187 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.image_prompt import ImagePrompt
+from models.sql.image_asset import ImageAsset
+from models.sql.key_value import KeyValueSqlModel
+from services.asset_cache_service import AssetCacheService
+from services.image_generation_service import ImageGenerationService
+
+
+class TestAssetCacheService:
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AssetCacheService()
+        with patch.dict(os.environ, {"ASSET_CACHE_MAX_ENTRIES": "2"}):
+            cache.set("a", "/a.jpg")
+            cache.set("b", "/b.jpg")
+            cache.get("a")
+            cache.set("c", "/c.jpg")
+
+        assert cache.get("a") == "/a.jpg"
+        assert cache.get("b") is None
+        assert cache.get("c") == "/c.jpg"
+
+    def test_concurrent_fetches_share_one_call(self):
+        cache = AssetCacheService()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "/image.jpg"
+
+        async def run():
+            return await asyncio.gather(
+                *[cache.run_once("key", fetch) for _ in range(3)]
+            )
+
+        results = asyncio.run(run())
+
+        assert calls == 1
+        assert [result for result, _ in results] == ["/image.jpg"] * 3
+        assert [is_owner for _, is_owner in results].count(True) == 1
+
+
+class TestImageAssetReuse:
+
+    def get_service(self, tmp_path, reuse_assets=True):
+        with patch(
+            "services.image_generation_service.is_pixabay_selected", return_value=False
+        ), patch(
+            "services.image_generation_service.is_pixels_selected", return_value=False
+        ), patch(
+            "services.image_generation_service.is_gemini_flash_selected",
+            return_value=False,
+        ), patch(
+            "services.image_generation_service.is_dalle3_selected", return_value=True
+        ):
+            service = ImageGenerationService(str(tmp_path), reuse_assets)
+
+        image_path = tmp_path / "generated.jpg"
+        image_path.write_bytes(b"image")
+        service.image_gen_func = AsyncMock(return_value=str(image_path))
+        service.image_gen_func.__name__ = "generate_image_openai"
+        service.is_stock_provider_selected = lambda: False
+        service.find_generated_image = AsyncMock(return_value=None)
+        service.save_generated_image = AsyncMock()
+        return service
+
+    def test_repeated_prompt_reuses_generated_image(self, tmp_path):
+        service = self.get_service(tmp_path)
+        prompt = ImagePrompt(prompt=f"Reused prompt {tmp_path}")
+
+        async def run():
+            return await asyncio.gather(
+                service.generate_image(prompt), service.generate_image(prompt)
+            )
+
+        first, second = asyncio.run(run())
+        third = asyncio.run(service.generate_image(prompt))
+
+        assert service.image_gen_func.call_count == 1
+        assert isinstance(first, ImageAsset)
+        assert second == first.path
+        assert third == first.path
+
+    def test_reuse_can_be_disabled(self, tmp_path):
+        service = self.get_service(tmp_path, reuse_assets=False)
+        prompt = ImagePrompt(prompt=f"Fresh prompt {tmp_path}")
+
+        asyncio.run(service.generate_image(prompt))
+        asyncio.run(service.generate_image(prompt))
+
+        assert service.image_gen_func.call_count == 2
+
+
+class TestGeneratedImageLookup:
+
+    @pytest.fixture
+    def session_maker(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+        async def create_tables():
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    lambda sync_conn: SQLModel.metadata.create_all(
+                        sync_conn, tables=[KeyValueSqlModel.__table__]
+                    )
+                )
+
+        asyncio.run(create_tables())
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        with patch(
+            "services.image_generation_service.async_session_maker", session_maker
+        ):
+            yield session_maker
+        asyncio.run(engine.dispose())
+
+    def get_service(self, tmp_path):
+        service = TestImageAssetReuse().get_service(tmp_path, reuse_assets=False)
+        del service.find_generated_image
+        del service.save_generated_image
+        return service
+
+    def test_generated_image_is_found_by_indexed_key(self, tmp_path, session_maker):
+        service = self.get_service(tmp_path)
+        prompt = ImagePrompt(prompt="Lookup prompt", theme_prompt="Dark")
+
+        image = asyncio.run(service.generate_image(prompt))
+
+        assert asyncio.run(service.find_generated_image(prompt)) == image.path
+        other_theme = ImagePrompt(prompt="Lookup prompt", theme_prompt="Light")
+        assert asyncio.run(service.find_generated_image(other_theme)) is None
+
+    def test_deleted_image_is_not_reused(self, tmp_path, session_maker):
+        service = self.get_service(tmp_path)
+        prompt = ImagePrompt(prompt="Deleted prompt")
+
+        image = asyncio.run(service.generate_image(prompt))
+        os.remove(image.path)
+
+        assert asyncio.run(service.find_generated_image(prompt)) is None
+
+    def test_least_recently_used_entries_are_pruned(self, tmp_path, session_maker):
+        service = self.get_service(tmp_path)
+        prompts = [ImagePrompt(prompt=f"Prompt {i}") for i in range(3)]
+        now = [1000.0]
+
+        with patch.dict(os.environ, {"GENERATED_IMAGE_CACHE_MAX_ENTRIES": "2"}), patch(
+            "services.image_generation_service.time.time", side_effect=lambda: now[0]
+        ):
+            for prompt in prompts[:2]:
+                asyncio.run(service.generate_image(prompt))
+                now[0] += 1
+            # Using the first image makes the second one the least recent
+            assert asyncio.run(service.find_generated_image(prompts[0]))
+            now[0] += 1
+            asyncio.run(service.generate_image(prompts[2]))
+
+        async def get_keys():
+            async with session_maker() as sql_session:
+                return set(await sql_session.scalars(select(KeyValueSqlModel.key)))
+
+        assert asyncio.run(get_keys()) == {
+            service.get_generated_image_key(prompts[0]),
+            service.get_generated_image_key(prompts[2]),
+        }
+
+    def test_saving_again_updates_the_entry(self, tmp_path, session_maker):
+        service = self.get_service(tmp_path)
+        prompt = ImagePrompt(prompt="Same prompt")
+
+        asyncio.run(service.generate_image(prompt))
+        image = asyncio.run(service.generate_image(prompt))
+
+        async def get_values():
+            async with session_maker() as sql_session:
+                return list(await sql_session.scalars(select(KeyValueSqlModel.value)))
+
+        values = asyncio.run(get_values())
+        assert [value["path"] for value in values] == [image.path]
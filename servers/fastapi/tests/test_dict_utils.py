@@ -0,0 +1,45 @@
+from utils.dict_utils import get_dict_paths_with_key, get_dicts_with_keys, get_dict_at_path
+
+
+SLIDE_CONTENT = {
+    "title": "Our Team",
+    "image": {"__image_prompt__": "Team photo", "__image_url__": ""},
+    "members": [
+        {
+            "name": "Alice",
+            "icon": {"__icon_query__": "user"},
+            "photo": {"__image_prompt__": "Portrait"},
+        },
+        {"name": "Bob", "icon": {"__icon_query__": "user"}},
+    ],
+}
+
+
+def test_get_dicts_with_keys_matches_paths():
+    asset_dicts = get_dicts_with_keys(
+        SLIDE_CONTENT, ["__image_prompt__", "__icon_query__"]
+    )
+
+    for key in ["__image_prompt__", "__icon_query__"]:
+        expected = [
+            get_dict_at_path(SLIDE_CONTENT, path)
+            for path in get_dict_paths_with_key(SLIDE_CONTENT, key)
+        ]
+        assert len(asset_dicts[key]) == len(expected)
+        for found, dict_at_path in zip(asset_dicts[key], expected):
+            assert found is dict_at_path
+
+
+def test_get_dicts_with_keys_returns_references():
+    content = {"items": [{"icon": {"__icon_query__": "chart"}}]}
+
+    icon_dicts = get_dicts_with_keys(content, ["__icon_query__"])["__icon_query__"]
+    icon_dicts[0]["__icon_url__"] = "/static/icons/chart.svg"
+
+    assert content["items"][0]["icon"]["__icon_url__"] == "/static/icons/chart.svg"
+
+
+def test_get_dicts_with_keys_without_matches():
+    assert get_dicts_with_keys({"title": "Hello"}, ["__image_prompt__"]) == {
+        "__image_prompt__": []
+    }
@@ -0,0 +1,130 @@
+import os
+from unittest.mock import patch
+
+from services.document_context_builder import (
+    DocumentContextBuilder,
+    estimate_tokens,
+    get_document_context_token_budget,
+)
+
+
+def test_small_documents_are_kept_whole():
+    builder = DocumentContextBuilder(token_budget=1000)
+    builder.add(0, "# Title\nIntro")
+    builder.add(1, "Notes")
+
+    assert not builder.is_full()
+    assert builder.get_context() == "# Title\nIntro\n\nNotes"
+
+
+def test_sections_are_split_at_headings():
+    builder = DocumentContextBuilder(token_budget=1000)
+    builder.add(0, "Preamble\n# One\nFirst\n## Two\nSecond")
+
+    assert [section.heading for section in builder._sections] == [
+        None,
+        "# One",
+        "## Two",
+    ]
+    assert builder.tokens == sum(
+        estimate_tokens(section.content) for section in builder._sections
+    )
+
+
+def test_best_scored_sections_are_kept_in_order():
+    filler = "x" * 80
+    builder = DocumentContextBuilder(token_budget=60)
+    builder.add(0, f"# Introduction\n{filler}")
+    builder.add(0, f"#### Detail\n{filler}")
+    builder.add(0, f"## Results\n{filler}")
+
+    context = builder.get_context()
+
+    assert builder.tokens > builder.token_budget
+    assert estimate_tokens(context) <= builder.token_budget
+    assert context == f"# Introduction\n{filler}\n\n## Results\n{filler}"
+
+
+def test_builder_is_full_after_reading_twice_the_budget():
+    builder = DocumentContextBuilder(token_budget=10)
+    builder.add(0, "x" * 40)
+    assert not builder.is_full()
+    builder.add(0, "x" * 40)
+    assert builder.is_full()
+
+
+def test_oversized_section_is_truncated():
+    builder = DocumentContextBuilder(token_budget=10)
+    builder.add(0, "x" * 1000)
+
+    assert builder.get_context() == "x" * 40
+
+
+def test_zero_budget_keeps_everything():
+    with patch.dict(os.environ, {"DOCUMENT_CONTEXT_TOKEN_BUDGET": "0"}):
+        builder = DocumentContextBuilder()
+    builder.add(0, "x" * 100000)
+
+    assert get_document_context_token_budget() > 0
+    assert not builder.is_full()
+    assert len(builder.get_context()) == 100000
+
+
+def test_section_continues_over_parts():
+    builder = DocumentContextBuilder(token_budget=64)
+    builder.add(0, "# Introduction\n" + "a" * 40)
+    builder.add(1, "Other document")
+    builder.add(0, "b" * 80)
+    builder.add(0, "#### Detail\n" + "x" * 80)
+    builder.add(0, "## Results\n" + "y" * 80)
+
+    assert [
+        (section.document_index, section.heading) for section in builder._sections
+    ] == [
+        (0, "# Introduction"),
+        (1, None),
+        (0, "#### Detail"),
+        (0, "## Results"),
+    ]
+    assert builder.tokens > builder.token_budget
+    assert builder.tokens == sum(section.tokens for section in builder._sections)
+
+    context = builder.get_context()
+
+    # The continuation is kept together with its heading
+    assert estimate_tokens(context) <= builder.token_budget
+    assert context == (
+        "# Introduction\n"
+        + "a" * 40
+        + "\n"
+        + "b" * 80
+        + "\n\n## Results\n"
+        + "y" * 80
+        + "\n\nOther document"
+    )
+
+
+def test_interleaved_documents_are_kept_apart():
+    builder = DocumentContextBuilder(token_budget=1000)
+    builder.add(0, "# A1\nFirst")
+    builder.add(1, "# B\nSecond document")
+    builder.add(0, "more\n## A2\nLast")
+
+    assert builder.get_context() == (
+        "# A1\nFirst\nmore\n\n## A2\nLast\n\n# B\nSecond document"
+    )
+
+    # Selected sections are in document order too
+    builder.add(1, "#### Detail\n" + "x" * 4000)
+    assert builder.get_context() == (
+        "# A1\nFirst\nmore\n\n## A2\nLast\n\n# B\nSecond document"
+    )
+
+
+def test_preamble_is_scored_like_a_heading():
+    builder = DocumentContextBuilder(token_budget=30)
+    builder.add(0, "p" * 80)
+    builder.add(0, "#### Detail\n" + "x" * 80)
+
+    assert builder.tokens > builder.token_budget
+    assert builder.get_context() == "p" * 80
@@ -0,0 +1,395 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi import HTTPException
+import pytest
+
+from services.docling_pool_service import (
+    DOCLING_POOL_SERVICE,
+    DoclingPoolService,
+    initialize_docling_worker,
+)
+from services.document_cache_service import DocumentCacheService
+from services.documents_loader import DocumentsLoader
+
+
+class BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+class TestDocumentsLoader:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        with patch.dict(
+            os.environ,
+            {
+                "APP_DATA_DIRECTORY": str(tmp_path),
+                "DOCUMENT_CACHE_MAX_SIZE_MB": "1",
+            },
+        ):
+            cache = DocumentCacheService()
+            with patch("services.documents_loader.DOCUMENT_CACHE_SERVICE", cache):
+                yield cache
+
+    @pytest.fixture
+    def pool(self):
+        pool = ThreadPoolExecutor(max_workers=4)
+        with patch.object(DOCLING_POOL_SERVICE, "get_pool", return_value=pool):
+            yield pool
+        pool.shutdown()
+
+    @pytest.fixture
+    def parse(self):
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+        calls = []
+
+        def parse_document_to_markdown(file_path):
+            nonlocal running, max_running
+            with lock:
+                calls.append(file_path)
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return f"# {os.path.basename(file_path)}"
+
+        with patch(
+            "services.docling_pool_service.parse_document_to_markdown",
+            side_effect=parse_document_to_markdown,
+        ):
+            yield calls, lambda: max_running
+
+    def write_file(self, tmp_path, name, content):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+
+    def test_documents_are_parsed_in_parallel_and_in_order(
+        self, tmp_path, cache, pool, parse
+    ):
+        calls, get_max_running = parse
+        file_paths = [
+            self.write_file(tmp_path, f"{index}.pdf", f"pdf {index}".encode())
+            for index in range(3)
+        ]
+        file_paths.append(self.write_file(tmp_path, "notes.txt", b"Notes"))
+
+        loader = DocumentsLoader(file_paths)
+        asyncio.run(loader.load_documents())
+
+        assert loader.documents == ["# 0.pdf", "# 1.pdf", "# 2.pdf", "Notes"]
+        assert loader.images == [[], [], [], []]
+        assert len(calls) == 3
+        assert get_max_running() > 1
+
+    def test_same_contents_are_parsed_once(self, tmp_path, cache, pool, parse):
+        calls, _ = parse
+        first = self.write_file(tmp_path, "first.docx", b"same contents")
+        second = self.write_file(tmp_path, "second.docx", b"same contents")
+
+        asyncio.run(DocumentsLoader([first]).load_documents())
+        loader = DocumentsLoader([second])
+        asyncio.run(loader.load_documents())
+
+        assert calls == [first]
+        assert loader.documents == ["# first.docx"]
+
+    def test_broken_pool_is_retried_on_new_pool(self, tmp_path, cache, parse):
+        calls, _ = parse
+        file_path = self.write_file(tmp_path, "slides.pptx", b"pptx")
+
+        with ThreadPoolExecutor() as pool, patch.object(
+            DOCLING_POOL_SERVICE, "get_pool", side_effect=[BrokenPool(), pool]
+        ):
+            loader = DocumentsLoader([file_path])
+            asyncio.run(loader.load_documents())
+
+        assert loader.documents == ["# slides.pptx"]
+        assert calls == [file_path]
+
+    def test_pool_broken_again_fails_parsing(self, tmp_path, cache, parse):
+        calls, _ = parse
+        file_path = self.write_file(tmp_path, "slides.pptx", b"pptx")
+
+        with patch.object(
+            DOCLING_POOL_SERVICE, "get_pool", return_value=BrokenPool()
+        ), pytest.raises(HTTPException) as exc_info:
+            asyncio.run(DocumentsLoader([file_path]).load_documents())
+
+        assert exc_info.value.status_code == 500
+        # Documents are never converted in the API process
+        assert calls == []
+
+    @pytest.fixture
+    def parse_pages(self):
+        calls = []
+
+        def parse_pages_to_markdown(file_path, first_page, last_page):
+            calls.append((first_page, last_page))
+            return f"## Pages {first_page}-{last_page}\n" + "x" * 400
+
+        with patch(
+            "services.documents_loader.get_pdf_page_count", return_value=25
+        ), patch("services.documents_loader.PDF_PAGES_PER_BATCH", 10), patch(
+            "services.docling_pool_service.parse_pages_to_markdown",
+            side_effect=parse_pages_to_markdown,
+        ):
+            yield calls
+
+    def test_pdf_is_streamed_in_page_batches_and_cached(
+        self, tmp_path, cache, pool, parse_pages
+    ):
+        file_path = self.write_file(tmp_path, "report.pdf", b"pdf")
+
+        async def collect():
+            return [
+                section
+                async for section in DocumentsLoader([file_path]).iter_sections()
+            ]
+
+        sections = asyncio.run(collect())
+
+        assert parse_pages == [(1, 10), (11, 20), (21, 25)]
+        assert [section.split("\n")[0] for _, section in sections] == [
+            "## Pages 1-10",
+            "## Pages 11-20",
+            "## Pages 21-25",
+        ]
+        # Cached as a whole, the second load isn't converted again
+        assert asyncio.run(collect()) == [(0, "\n\n".join(s for _, s in sections))]
+        assert len(parse_pages) == 3
+
+    def test_context_stops_parsing_once_budget_is_filled(
+        self, tmp_path, cache, pool, parse_pages
+    ):
+        file_path = self.write_file(tmp_path, "report.pdf", b"pdf")
+
+        with patch("services.documents_loader.get_pdf_page_count", return_value=100):
+            context = asyncio.run(
+                DocumentsLoader([file_path]).load_context(token_budget=100)
+            )
+
+        assert context.startswith("## Pages 1-10")
+        # Two batches fill twice the budget, only the prefetched one also ran
+        assert parse_pages == [(1, 10), (11, 20), (21, 30)]
+        key = cache.get_key(file_path)
+        assert asyncio.run(cache.get(key)) is None
+
+    def test_page_images_without_temp_dir(self, tmp_path, cache):
+        file_path = self.write_file(tmp_path, "report.pdf", b"pdf")
+        images_dir = tmp_path / "images"
+
+        def get_page_images(file_path, temp_dir):
+            return [os.path.join(temp_dir, "page_1.png")]
+
+        with patch(
+            "services.documents_loader.TEMP_FILE_SERVICE.create_temp_dir",
+            return_value=str(images_dir),
+        ), patch.object(
+            DocumentsLoader, "get_page_images_from_pdf", side_effect=get_page_images
+        ):
+            loader = DocumentsLoader([file_path])
+            asyncio.run(loader.load_documents(load_text=False, load_images=True))
+
+        assert loader.images == [[str(images_dir / "page_1.png")]]
+        assert images_dir.is_dir()
+
+    def test_missing_file_raises_404(self, tmp_path):
+        loader = DocumentsLoader([str(tmp_path / "missing.pdf")])
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(loader.load_documents())
+        assert error.value.status_code == 404
+
+
+class TestDocumentCacheService:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        with patch.dict(
+            os.environ,
+            {
+                "APP_DATA_DIRECTORY": str(tmp_path),
+                "DOCUMENT_CACHE_MAX_SIZE_MB": "1",
+            },
+        ):
+            yield DocumentCacheService()
+
+    def test_key_depends_on_contents(self, cache, tmp_path):
+        first = tmp_path / "a.pdf"
+        first.write_bytes(b"one")
+        second = tmp_path / "b.pdf"
+        second.write_bytes(b"one")
+
+        assert cache.get_key(str(first)) == cache.get_key(str(second))
+        second.write_bytes(b"two")
+        assert cache.get_key(str(first)) != cache.get_key(str(second))
+
+    def test_least_recently_used_are_evicted(self, cache):
+        markdown = "x" * (400 * 1024)
+
+        async def fill():
+            await cache.set("first", markdown)
+            await cache.set("second", markdown)
+            await cache.get("first")
+            await cache.set("third", markdown)
+
+        asyncio.run(fill())
+
+        assert asyncio.run(cache.get("first")) == markdown
+        assert asyncio.run(cache.get("second")) is None
+        assert asyncio.run(cache.get("third")) == markdown
+
+    def test_disabled_cache(self, cache):
+        with patch.dict(os.environ, {"DOCUMENT_CACHE_MAX_SIZE_MB": "0"}):
+            asyncio.run(cache.set("key", "markdown"))
+            assert asyncio.run(cache.get("key")) is None
+
+
+class TestDoclingPoolService:
+
+    @pytest.fixture
+    def service(self):
+        service = DoclingPoolService()
+        yield service
+        service.shutdown()
+
+    def get_thread_pool(self, service):
+        pools = []
+
+        def get_pool():
+            if service._pool is None:
+                service._pool_conversions = 0
+                service._pool = ThreadPoolExecutor(max_workers=2)
+                pools.append(service._pool)
+            return service._pool
+
+        return pools, get_pool
+
+    def test_pool_is_created_with_shared_readiness(self, service):
+        with patch.dict(os.environ, {"DOCUMENT_PARSE_WORKERS": "3"}):
+            pool = service.get_pool()
+
+        assert pool._max_workers == 3
+        # Recycling is done by the service, pings must not count as tasks
+        assert pool._max_tasks_per_child is None
+        assert pool._initializer is initialize_docling_worker
+        assert pool._initargs == (service._started_workers, service._ready_workers)
+
+    def test_worker_initializer_reports_readiness(self):
+        started_workers = multiprocessing.Value("i", 0)
+        ready_workers = multiprocessing.Value("i", 0)
+
+        with patch("services.docling_pool_service.get_docling_service"):
+            initialize_docling_worker(started_workers, ready_workers)
+        with patch(
+            "services.docling_pool_service.get_docling_service",
+            side_effect=RuntimeError("no models"),
+        ):
+            initialize_docling_worker(started_workers, ready_workers)
+
+        assert started_workers.value == 2
+        assert ready_workers.value == 1
+
+    def test_pool_is_recycled_after_max_documents(self, service, tmp_path):
+        pools, get_pool = self.get_thread_pool(service)
+        file_path = str(tmp_path / "report.pdf")
+
+        async def parse(count):
+            for _ in range(count):
+                await service.parse(file_path)
+
+        with patch.dict(
+            os.environ,
+            {
+                "DOCUMENT_PARSE_WORKERS": "2",
+                "DOCLING_MAX_DOCUMENTS_PER_WORKER": "2",
+                "DOCLING_WARM_UP": "false",
+            },
+        ), patch.object(service, "get_pool", side_effect=get_pool), patch(
+            "services.docling_pool_service.parse_document_to_markdown",
+            return_value="# Report",
+        ):
+            asyncio.run(parse(4))
+            assert len(pools) == 1
+            asyncio.run(parse(1))
+
+        assert len(pools) == 2
+        for pool in pools:
+            pool.shutdown()
+
+    def test_health_checks_do_not_recycle_workers(self, service):
+        pools, get_pool = self.get_thread_pool(service)
+
+        async def check_health(count):
+            return [await service.check_health() for _ in range(count)]
+
+        with patch.dict(
+            os.environ,
+            {"DOCUMENT_PARSE_WORKERS": "2", "DOCLING_MAX_DOCUMENTS_PER_WORKER": "1"},
+        ), patch.object(service, "get_pool", side_effect=get_pool):
+            statuses = asyncio.run(check_health(10))
+
+        assert all(status.healthy for status in statuses)
+        assert len(pools) == 1
+        assert service._pool_conversions == 0
+        pools[0].shutdown()
+
+    def test_ready_workers_come_from_shared_counter(self, service):
+        pools, get_pool = self.get_thread_pool(service)
+        service._ready_workers = multiprocessing.Value("i", 2)
+
+        with patch.dict(os.environ, {"DOCUMENT_PARSE_WORKERS": "2"}), patch.object(
+            service, "get_pool", side_effect=get_pool
+        ):
+            status = asyncio.run(service.check_health())
+
+        # One thread answers the ping, both workers are still counted
+        assert status.ready_workers == 2
+        assert status.workers == 2
+        pools[0].shutdown()
+
+    def test_broken_pool_is_unhealthy_and_replaced(self, service):
+        service._pool = BrokenPool()
+
+        status = asyncio.run(service.check_health())
+
+        assert not status.healthy
+        assert service._pool is None
+
+    def test_stale_pool_failure_keeps_current_pool(self, service):
+        current_pool = ThreadPoolExecutor(max_workers=1)
+        warm_up_task = object()
+        service._pool = current_pool
+        service._warm_up_task = warm_up_task
+
+        # The old pool fails after the current one replaced it
+        service._release_broken_pool(BrokenPool())
+
+        assert service._pool is current_pool
+        assert service._warm_up_task is warm_up_task
+        service._warm_up_task = None
+        service._release_broken_pool(current_pool)
+        assert service._pool is None
+
+    def test_warm_up_can_be_disabled(self, service):
+        async def start():
+            service.start_warm_up()
+            return service._warm_up_task
+
+        with patch.dict(os.environ, {"DOCLING_WARM_UP": "false"}):
+            assert asyncio.run(start()) is None
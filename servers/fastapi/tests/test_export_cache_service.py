@@ -0,0 +1,178 @@
+import asyncio
+import os
+from unittest.mock import patch
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.export_cache_service import ExportCacheService
+from utils.export_utils import get_export_cache_key
+
+
+class TestExportCacheService:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        with patch.dict(
+            os.environ,
+            {"APP_DATA_DIRECTORY": str(tmp_path), "EXPORT_CACHE_MAX_SIZE_MB": "1"},
+        ):
+            yield ExportCacheService()
+
+    def get_export(self, tmp_path, name, size):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        return str(path)
+
+    def get_presentation_and_slides(self, title="Title"):
+        presentation = PresentationModel(
+            content="Content", n_slides=1, language="English"
+        )
+        slides = [
+            SlideModel(
+                presentation=presentation.id,
+                layout_group="general",
+                layout="general:intro-slide",
+                index=0,
+                content={"title": title},
+                html_content=None,
+                properties=None,
+            )
+        ]
+        return presentation, slides
+
+    def test_key_depends_on_content_and_format(self, cache):
+        presentation, slides = self.get_presentation_and_slides()
+        key = cache.get_key(presentation, slides, "pptx")
+
+        assert key == cache.get_key(presentation, slides, "pptx")
+        assert key != cache.get_key(presentation, slides, "pdf")
+
+        slides[0].content = {"title": "Changed"}
+        assert key != cache.get_key(presentation, slides, "pptx")
+
+    def test_key_depends_on_template_layout_code(self, cache):
+        presentation, slides = self.get_presentation_and_slides()
+        template_id = uuid.uuid4()
+
+        def get_layout_code(code):
+            return PresentationLayoutCodeModel(
+                presentation=template_id,
+                layout_id="intro",
+                layout_name="Intro",
+                layout_code=code,
+            )
+
+        key = cache.get_key(
+            presentation, slides, "pptx", [get_layout_code("<div>v1</div>")]
+        )
+
+        assert key == cache.get_key(
+            presentation, slides, "pptx", [get_layout_code("<div>v1</div>")]
+        )
+        assert key != cache.get_key(
+            presentation, slides, "pptx", [get_layout_code("<div>v2</div>")]
+        )
+        # Deleting the template's layouts changes the key too
+        assert key != cache.get_key(presentation, slides, "pptx", [])
+
+    def test_set_get_and_invalidate(self, cache, tmp_path):
+        presentation_id = uuid.uuid4()
+        source = self.get_export(tmp_path, "export.pptx", 100)
+        destination = str(tmp_path / "copy.pptx")
+
+        assert not asyncio.run(cache.get(presentation_id, "key", "pptx", destination))
+
+        asyncio.run(cache.set(presentation_id, "key", "pptx", source))
+        assert asyncio.run(cache.get(presentation_id, "key", "pptx", destination))
+        assert os.path.getsize(destination) == 100
+
+        asyncio.run(cache.invalidate(presentation_id))
+        assert not asyncio.run(cache.get(presentation_id, "key", "pptx", destination))
+
+    def test_least_recently_used_exports_are_evicted_over_quota(self, cache, tmp_path):
+        ids = [uuid.uuid4() for _ in range(3)]
+        destination = str(tmp_path / "copy.pptx")
+        for i, presentation_id in enumerate(ids[:2]):
+            source = self.get_export(tmp_path, f"{i}.pptx", 400 * 1024)
+            asyncio.run(cache.set(presentation_id, "key", "pptx", source))
+
+        # Touches the first export so the second one is evicted
+        assert asyncio.run(cache.get(ids[0], "key", "pptx", destination))
+        source = self.get_export(tmp_path, "2.pptx", 400 * 1024)
+        asyncio.run(cache.set(ids[2], "key", "pptx", source))
+
+        assert asyncio.run(cache.get(ids[0], "key", "pptx", destination))
+        assert not asyncio.run(cache.get(ids[1], "key", "pptx", destination))
+        assert asyncio.run(cache.get(ids[2], "key", "pptx", destination))
+
+    def test_disabled_with_zero_quota(self, cache, tmp_path):
+        with patch.dict(os.environ, {"EXPORT_CACHE_MAX_SIZE_MB": "0"}):
+            source = self.get_export(tmp_path, "export.pptx", 100)
+            asyncio.run(cache.set(uuid.uuid4(), "key", "pptx", source))
+            assert not os.path.exists(tmp_path / "cache" / "exports")
+
+
+def test_template_edit_changes_export_key(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    template_id = uuid.uuid4()
+    presentation = PresentationModel(content="Content", n_slides=1, language="English")
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        PresentationModel.__table__,
+                        SlideModel.__table__,
+                        PresentationLayoutCodeModel.__table__,
+                    ],
+                )
+            )
+
+        layout_code = PresentationLayoutCodeModel(
+            presentation=template_id,
+            layout_id="intro",
+            layout_name="Intro",
+            layout_code="<div>v1</div>",
+        )
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            sql_session.add(
+                SlideModel(
+                    presentation=presentation.id,
+                    layout_group=f"custom-{template_id}",
+                    layout="intro",
+                    index=0,
+                    content={"title": "Title"},
+                    html_content=None,
+                    properties=None,
+                )
+            )
+            sql_session.add(layout_code)
+            await sql_session.commit()
+
+        first = await get_export_cache_key(presentation.id, "pptx")
+        async with session_maker() as sql_session:
+            layout_code = await sql_session.get(
+                PresentationLayoutCodeModel, layout_code.id
+            )
+            layout_code.layout_code = "<div>v2</div>"
+            await sql_session.commit()
+        second = await get_export_cache_key(presentation.id, "pptx")
+
+        await engine.dispose()
+        return first, second
+
+    with patch("utils.export_utils.async_session_maker", session_maker):
+        first, second = asyncio.run(run())
+
+    assert first is not None
+    assert first != second
@@ -0,0 +1,81 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client_service import HttpClientService
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def test_get_is_retried_on_retryable_status():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        if len(calls) < 3:
+            return web.Response(status=503)
+        return web.json_response({"ok": True})
+
+    async def run():
+        server = await start_server(handler)
+        client = HttpClientService()
+        try:
+            async with client.get(
+                str(server.make_url("/")), trust_env=False
+            ) as response:
+                return response.status, await response.json()
+        finally:
+            await client.close()
+            await server.close()
+
+    with patch("services.http_client_service.HTTP_CLIENT_RETRY_BACKOFF_SECONDS", 0):
+        assert asyncio.run(run()) == (200, {"ok": True})
+    assert calls == ["GET", "GET", "GET"]
+
+
+def test_post_is_not_retried_by_default():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        return web.Response(status=503)
+
+    async def run():
+        server = await start_server(handler)
+        client = HttpClientService()
+        try:
+            async with client.post(
+                str(server.make_url("/")), trust_env=False
+            ) as response:
+                return response.status
+        finally:
+            await client.close()
+            await server.close()
+
+    with patch("services.http_client_service.HTTP_CLIENT_RETRY_BACKOFF_SECONDS", 0):
+        assert asyncio.run(run()) == 503
+    assert calls == ["POST"]
+
+
+def test_session_is_shared_and_limited_per_host():
+    async def run():
+        client = HttpClientService()
+        session = client.get_session()
+        try:
+            assert client.get_session() is session
+            assert client.get_session(trust_env=False) is not session
+            return session.connector.limit_per_host
+        finally:
+            await client.close()
+
+    with patch.dict(os.environ, {"HTTP_CLIENT_LIMIT_PER_HOST": "4"}):
+        assert asyncio.run(run()) == 4
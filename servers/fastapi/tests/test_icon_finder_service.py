@@ -0,0 +1,187 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from enums.icon_index_state import IconIndexState
+from services.asset_cache_service import ASSET_CACHE_SERVICE
+from services.icon_finder_service import IconFinderService
+
+VECTORS = {
+    "chart": [1.0, 0.0, 0.0],
+    "growth": [0.8, 0.6, 0.0],
+    "user": [0.0, 0.0, 1.0],
+}
+
+
+class FakeEmbeddingFunction:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, documents):
+        self.calls.append(list(documents))
+        return [np.array(VECTORS[each.split()[0]]) for each in documents]
+
+
+@pytest.fixture(autouse=True)
+def clear_asset_cache():
+    ASSET_CACHE_SERVICE.invalidate()
+    yield
+    ASSET_CACHE_SERVICE.invalidate()
+
+
+@pytest.fixture
+def embedding_function():
+    return FakeEmbeddingFunction()
+
+
+@pytest.fixture
+def service(tmp_path, embedding_function, monkeypatch):
+    monkeypatch.setenv("ICON_SEARCH_BACKEND", "numpy")
+    documents = [f"{name} tags" for name in VECTORS]
+    ids = [f"{name}-bold" for name in VECTORS]
+    with patch(
+        "services.icon_finder_service.get_icon_embedding_function",
+        return_value=embedding_function,
+    ), patch(
+        "services.icon_finder_service.get_icon_documents",
+        return_value=(documents, ids),
+    ), patch(
+        "services.icon_finder_service.ICON_INDEX_EMBEDDINGS_PATH",
+        os.path.join(tmp_path, "embeddings.npy"),
+    ), patch(
+        "services.icon_finder_service.ICON_INDEX_IDS_PATH",
+        os.path.join(tmp_path, "ids.json"),
+    ):
+        yield IconFinderService()
+
+
+def test_nothing_is_loaded_until_initialized(service):
+    assert service.get_status().state == IconIndexState.PENDING
+
+
+def test_placeholder_until_ready(service):
+    with patch.object(service, "start_initialization") as start_initialization:
+        icons = asyncio.run(service.search_icons_many(["chart", "user"]))
+
+    assert icons == [
+        ["/static/icons/placeholder.svg"],
+        ["/static/icons/placeholder.svg"],
+    ]
+    start_initialization.assert_called_once()
+    # Placeholders are not cached as search results
+    assert ASSET_CACHE_SERVICE.get(("icons", "chart", 1)) is None
+
+
+def test_initialize_builds_and_saves_index(service, tmp_path):
+    service.initialize()
+
+    assert service.is_ready()
+    assert os.path.exists(os.path.join(tmp_path, "embeddings.npy"))
+    assert asyncio.run(service.search_icons("growth", 2)) == [
+        "/static/icons/bold/growth-bold.svg",
+        "/static/icons/bold/chart-bold.svg",
+    ]
+
+
+def test_initialize_loads_prebuilt_index(service, embedding_function):
+    service.initialize()
+    embedding_function.calls.clear()
+
+    other_service = IconFinderService()
+    other_service.initialize()
+
+    # Icons are not embedded again when the index exists
+    assert embedding_function.calls == []
+    assert other_service.is_ready()
+
+
+def test_start_initialization_runs_in_background(service):
+    service.start_initialization()
+    for _ in range(100):
+        if service.is_ready():
+            break
+        time.sleep(0.01)
+
+    assert service.get_status().state == IconIndexState.READY
+
+
+def test_failed_initialization_is_reported(service):
+    with patch(
+        "services.icon_finder_service.get_icon_embedding_function",
+        side_effect=RuntimeError("model download failed"),
+    ):
+        service.initialize()
+
+    status = service.get_status()
+    assert status.state == IconIndexState.FAILED
+    assert status.error == "model download failed"
+
+
+def test_query_embeddings_are_cached(service, embedding_function):
+    service.initialize()
+    embedding_function.calls.clear()
+
+    async def search():
+        first = await service._search_icons_many(["chart", "user"], 1)
+        second = await service._search_icons_many(["user", "growth"], 1)
+        return first, second
+
+    first, second = asyncio.run(search())
+
+    assert first == [
+        ["/static/icons/bold/chart-bold.svg"],
+        ["/static/icons/bold/user-bold.svg"],
+    ]
+    assert second == [
+        ["/static/icons/bold/user-bold.svg"],
+        ["/static/icons/bold/growth-bold.svg"],
+    ]
+    assert embedding_function.calls == [["chart", "user"], ["growth"]]
+
+
+def test_concurrent_searches_share_one_query(service):
+    service.initialize()
+
+    async def search():
+        with patch.object(
+            service, "_search_icons_many", wraps=service._search_icons_many
+        ) as search_icons_many:
+            results = await asyncio.gather(
+                service.search_icons("chart"),
+                service.search_icons("user"),
+                service.search_icons("chart"),
+            )
+        return results, search_icons_many.call_count
+
+    results, call_count = asyncio.run(search())
+
+    assert results == [
+        ["/static/icons/bold/chart-bold.svg"],
+        ["/static/icons/bold/user-bold.svg"],
+        ["/static/icons/bold/chart-bold.svg"],
+    ]
+    assert call_count == 1
+
+
+def test_generation_waits_for_index(service):
+    icons = asyncio.run(service.search_icons_many(["chart"], wait_for_index=True))
+
+    assert service.is_ready()
+    assert icons == [["/static/icons/bold/chart-bold.svg"]]
+
+
+def test_generation_uses_placeholder_after_timeout(service):
+    def initialize():
+        time.sleep(0.5)
+
+    with patch.object(service, "initialize", side_effect=initialize), patch(
+        "services.icon_finder_service.ICON_INDEX_WAIT_TIMEOUT_SECONDS", 0.05
+    ):
+        icons = asyncio.run(service.search_icons_many(["chart"], wait_for_index=True))
+
+    assert icons == [["/static/icons/placeholder.svg"]]
+    assert ASSET_CACHE_SERVICE.get(("icons", "chart", 1)) is None
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from services.icon_vector_index import IconVectorIndex
+
+
+def fake_embedding_function(documents):
+    vectors = {
+        "chart": [1.0, 0.0, 0.0],
+        "growth": [0.8, 0.6, 0.0],
+        "user": [0.0, 0.0, 2.0],
+    }
+    return [np.array(vectors[each], dtype=np.float32) for each in documents]
+
+
+@pytest.fixture
+def index():
+    return IconVectorIndex.build(
+        ["chart", "growth", "user"],
+        ["chart-bold", "growth-bold", "user-bold"],
+        fake_embedding_function,
+    )
+
+
+def test_build_normalizes_embeddings(index):
+    assert index.embeddings.dtype == np.float32
+    assert np.allclose(np.linalg.norm(index.embeddings, axis=1), 1.0)
+
+
+def test_search_returns_closest_first(index):
+    queries = np.array([[1.0, 0.1, 0.0], [0.0, 0.1, 5.0]], dtype=np.float32)
+
+    assert index.search(queries, k=2) == [
+        ["chart-bold", "growth-bold"],
+        ["user-bold", "growth-bold"],
+    ]
+
+
+def test_search_with_k_larger_than_index(index):
+    results = index.search(np.array([[0.0, 1.0, 0.1]], dtype=np.float32), k=10)
+
+    assert results == [["growth-bold", "user-bold", "chart-bold"]]
+
+
+def test_save_and_load_memory_maps_embeddings(index, tmp_path):
+    embeddings_path = os.path.join(tmp_path, "index", "embeddings.npy")
+    ids_path = os.path.join(tmp_path, "index", "ids.json")
+    index.save(embeddings_path, ids_path)
+
+    loaded = IconVectorIndex.load(embeddings_path, ids_path)
+
+    assert isinstance(loaded.embeddings, np.memmap)
+    assert loaded.ids == index.ids
+    assert loaded.search(np.array([[1.0, 0.0, 0.0]]), k=1) == [["chart-bold"]]
+
+
+def test_mismatched_ids_raise():
+    with pytest.raises(ValueError):
+        IconVectorIndex(np.zeros((2, 3), dtype=np.float32), ["only-one"])
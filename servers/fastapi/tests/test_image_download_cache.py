@@ -0,0 +1,89 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client_service import HTTP_CLIENT
+from services.image_download_cache import ImageDownloadCache
+
+IMAGE = b"\x89PNG image bytes"
+
+
+def run_with_server(cache_control, run):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            body=IMAGE,
+            content_type="image/png",
+            headers={"ETag": '"v1"', "Cache-Control": cache_control},
+        )
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/image", handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await run(str(server.make_url("/image")))
+        finally:
+            await HTTP_CLIENT.close()
+            await server.close()
+
+    return asyncio.run(main()), requests
+
+
+def get_cache(tmp_path):
+    return patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path / "app_data")})
+
+
+def test_fresh_download_is_reused_without_request(tmp_path):
+    with get_cache(tmp_path):
+        cache = ImageDownloadCache()
+
+        async def run(url):
+            first = await cache.download(url, str(tmp_path / "export1"))
+            second = await cache.download(url, str(tmp_path / "export2"))
+            return first, second
+
+        (first, second), requests = run_with_server("max-age=3600", run)
+
+    assert requests == [None]
+    assert first.endswith(".png")
+    with open(second, "rb") as f:
+        assert f.read() == IMAGE
+    # Both exports share the cached file
+    assert os.stat(first).st_ino == os.stat(second).st_ino
+
+
+def test_stale_download_is_revalidated(tmp_path):
+    with get_cache(tmp_path):
+        cache = ImageDownloadCache()
+
+        async def run(url):
+            await cache.download(url, str(tmp_path / "export1"))
+            return await cache.download(url, str(tmp_path / "export2"))
+
+        path, requests = run_with_server("no-cache", run)
+
+    assert requests == [None, '"v1"']
+    with open(path, "rb") as f:
+        assert f.read() == IMAGE
+
+
+def test_same_url_is_downloaded_once_per_batch(tmp_path):
+    with get_cache(tmp_path):
+        cache = ImageDownloadCache()
+
+        async def run(url):
+            return await cache.download_many([url, url], str(tmp_path / "export"))
+
+        paths, requests = run_with_server("max-age=3600", run)
+
+    assert requests == [None]
+    assert paths[0] == paths[1]
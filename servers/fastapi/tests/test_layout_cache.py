@@ -0,0 +1,119 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+import uuid
+
+import pytest
+
+from api.v1.ppt.endpoints.slide_to_html import (
+    LayoutData,
+    SaveLayoutsRequest,
+    save_layouts,
+)
+from utils import get_layout_by_name as layout_module
+from utils.get_layout_by_name import get_layout_by_name, invalidate_layout_cache
+
+
+class MockResponse:
+    def __init__(self, layout_json):
+        self.status = 200
+        self.layout_json = layout_json
+
+    async def json(self):
+        return self.layout_json
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class TestLayoutCache:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        invalidate_layout_cache()
+        yield
+        invalidate_layout_cache()
+
+    @pytest.fixture
+    def http_get(self):
+        layout_json = {
+            "name": "general",
+            "slides": [
+                {"id": "intro", "name": "Intro", "json_schema": {"title": "Intro"}}
+            ],
+        }
+        with patch.object(
+            layout_module.HTTP_CLIENT,
+            "get",
+            side_effect=lambda *args, **kwargs: MockResponse(layout_json),
+        ) as http_get:
+            yield http_get
+
+    @pytest.fixture
+    def now(self):
+        now = [1000.0]
+        with patch.object(layout_module.time, "monotonic", side_effect=lambda: now[0]):
+            yield now
+
+    def test_hit_within_ttl(self, http_get, now):
+        with patch.dict(os.environ, {"LAYOUT_CACHE_TTL": "60"}):
+            first = asyncio.run(get_layout_by_name("general"))
+            now[0] += 59
+            second = asyncio.run(get_layout_by_name("general"))
+
+        assert second is first
+        assert http_get.call_count == 1
+        # The prompt text is built once and kept with the cached layout
+        assert first._string is not None
+        assert first.to_string() is first._string
+
+    def test_expires_after_ttl(self, http_get, now):
+        with patch.dict(os.environ, {"LAYOUT_CACHE_TTL": "60"}):
+            first = asyncio.run(get_layout_by_name("general"))
+            now[0] += 61
+            second = asyncio.run(get_layout_by_name("general"))
+
+        assert second is not first
+        assert http_get.call_count == 2
+
+    def test_zero_ttl_disables_cache(self, http_get, now):
+        with patch.dict(os.environ, {"LAYOUT_CACHE_TTL": "0"}):
+            asyncio.run(get_layout_by_name("general"))
+            asyncio.run(get_layout_by_name("general"))
+
+        assert http_get.call_count == 2
+
+    def test_save_layouts_invalidates_template(self, http_get, now):
+        presentation_id = uuid.uuid4()
+        layout_name = f"custom-{presentation_id}"
+
+        with patch.dict(os.environ, {"LAYOUT_CACHE_TTL": "60"}):
+            asyncio.run(get_layout_by_name(layout_name))
+            asyncio.run(get_layout_by_name("general"))
+
+            session = MagicMock()
+            session.execute = AsyncMock(
+                return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+            )
+            session.commit = AsyncMock()
+            request = SaveLayoutsRequest(
+                layouts=[
+                    LayoutData(
+                        presentation=presentation_id,
+                        layout_id="intro",
+                        layout_name="Intro",
+                        layout_code="export default function Intro() {}",
+                    )
+                ]
+            )
+            asyncio.run(save_layouts(request, session))
+
+            assert layout_name not in layout_module._layout_cache
+            assert "general" in layout_module._layout_cache
+
+            asyncio.run(get_layout_by_name(layout_name))
+
+        assert http_get.call_count == 3
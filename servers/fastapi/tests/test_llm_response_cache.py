@@ -0,0 +1,117 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_response_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        with patch.dict(
+            os.environ,
+            {"APP_DATA_DIRECTORY": str(tmp_path), "LLM_RESPONSE_CACHE": "true"},
+        ):
+            yield LLMResponseCache()
+
+    def get_key(self, cache, outline="Outline", schema=None, **kwargs):
+        return cache.get_key(
+            "openai",
+            "gpt-4.1",
+            [LLMSystemMessage(content="System"), LLMUserMessage(content=outline)],
+            schema or {"type": "object"},
+            False,
+            **kwargs,
+        )
+
+    def test_key_depends_on_inputs(self, cache):
+        assert self.get_key(cache) == self.get_key(cache)
+        assert self.get_key(cache) != self.get_key(cache, outline="Other")
+        assert self.get_key(cache) != self.get_key(cache, schema={"type": "array"})
+
+    def test_key_depends_on_generation_settings(self, cache):
+        assert self.get_key(cache) != self.get_key(cache, max_tokens=1000)
+        assert self.get_key(cache, options={"disable_thinking": False}) != (
+            self.get_key(cache, options={"disable_thinking": True})
+        )
+        assert self.get_key(cache, options={"extended_reasoning": True}) != (
+            self.get_key(cache, options={"extended_reasoning": False})
+        )
+
+    def test_set_and_get(self, cache):
+        key = self.get_key(cache)
+        assert asyncio.run(cache.get(key)) is None
+
+        asyncio.run(cache.set(key, {"title": "Hello"}))
+        assert asyncio.run(cache.get(key)) == {"title": "Hello"}
+
+        # A fresh instance rebuilds its index from disk
+        assert asyncio.run(LLMResponseCache().get(key)) == {"title": "Hello"}
+
+    def test_expired_entries_are_dropped(self, cache):
+        key = self.get_key(cache)
+        asyncio.run(cache.set(key, {"title": "Hello"}))
+
+        with patch.dict(os.environ, {"LLM_RESPONSE_CACHE_TTL": "1"}), patch(
+            "services.llm_response_cache.time.time", return_value=10**12
+        ):
+            assert asyncio.run(cache.get(key)) is None
+        assert asyncio.run(cache.get(key)) is None
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        keys = [self.get_key(cache, outline=f"Outline {i}") for i in range(3)]
+
+        with patch.dict(os.environ, {"LLM_RESPONSE_CACHE_MAX_ENTRIES": "2"}):
+            asyncio.run(cache.set(keys[0], {"index": 0}))
+            asyncio.run(cache.set(keys[1], {"index": 1}))
+            asyncio.run(cache.get(keys[0]))
+            asyncio.run(cache.set(keys[2], {"index": 2}))
+
+        assert asyncio.run(cache.get(keys[0])) == {"index": 0}
+        assert asyncio.run(cache.get(keys[1])) is None
+        assert asyncio.run(cache.get(keys[2])) == {"index": 2}
+
+
+class TestLLMClientResponseCache:
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        with patch.dict(
+            os.environ,
+            {
+                "APP_DATA_DIRECTORY": str(tmp_path),
+                "LLM_RESPONSE_CACHE": "true",
+                "LLM": "openai",
+                "OPENAI_API_KEY": "test-key",
+            },
+        ):
+            from services.llm_client import LLMClient
+
+            yield LLMClient()
+
+    def generate(self, client, use_cache=True):
+        return asyncio.run(
+            client.generate_structured(
+                model="gpt-4.1",
+                messages=[LLMUserMessage(content="Outline")],
+                response_format={"type": "object"},
+                use_cache=use_cache,
+            )
+        )
+
+    def test_repeated_calls_are_served_from_cache(self, client):
+        with patch.object(
+            client,
+            "_generate_openai_structured",
+            AsyncMock(return_value={"title": "Hello"}),
+        ) as mock_generate:
+            assert self.generate(client) == {"title": "Hello"}
+            assert self.generate(client) == {"title": "Hello"}
+            assert mock_generate.call_count == 1
+
+            self.generate(client, use_cache=False)
+            assert mock_generate.call_count == 2
@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import patch
+
+from api.middlewares import UserConfigEnvUpdateMiddleware
+
+MESSAGES = [
+    {"type": "http.response.start", "status": 200, "headers": []},
+    {"type": "http.response.body", "body": b"data: 0\n\n", "more_body": True},
+    {"type": "http.response.body", "body": b"data: 1\n\n", "more_body": True},
+    {"type": "http.response.body", "body": b"", "more_body": False},
+]
+
+
+async def streaming_app(scope, receive, send):
+    for message in MESSAGES:
+        await send(message)
+
+
+def run(scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    with patch("api.middlewares.USER_CONFIG_SERVICE") as user_config_service:
+        asyncio.run(UserConfigEnvUpdateMiddleware(streaming_app)(scope, receive, send))
+    return sent, user_config_service
+
+
+def test_streamed_messages_are_passed_through_as_is():
+    sent, user_config_service = run({"type": "http"})
+
+    assert len(sent) == len(MESSAGES)
+    assert all(each is message for each, message in zip(sent, MESSAGES))
+    user_config_service.refresh.assert_called_once()
+
+
+def test_config_is_not_refreshed_for_other_scopes():
+    _, user_config_service = run({"type": "lifespan"})
+
+    user_config_service.refresh.assert_not_called()
@@ -0,0 +1,182 @@
+import asyncio
+from datetime import datetime, timezone
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.presentation import count_presentations, list_presentations
+from api.v1.ppt.endpoints.slide import get_slides
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import create_missing_indexes
+from utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+    id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+
+
+def test_invalid_cursor():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+class TestPresentationListing:
+
+    @pytest.fixture
+    def session_maker(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'list.db'}")
+
+        async def create_tables():
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    lambda sync_conn: SQLModel.metadata.create_all(
+                        sync_conn,
+                        tables=[PresentationModel.__table__, SlideModel.__table__],
+                    )
+                )
+
+        asyncio.run(create_tables())
+        yield async_sessionmaker(engine, expire_on_commit=False)
+        asyncio.run(engine.dispose())
+
+    def add_presentations(self, session_maker, created_ats, with_slides=True):
+        async def run():
+            async with session_maker() as sql_session:
+                for created_at in created_ats:
+                    presentation = PresentationModel(
+                        content="Content",
+                        n_slides=1,
+                        language="English",
+                        created_at=created_at,
+                    )
+                    sql_session.add(presentation)
+                    if with_slides:
+                        sql_session.add(
+                            SlideModel(
+                                presentation=presentation.id,
+                                layout_group="general",
+                                layout="general:intro-slide",
+                                index=0,
+                                content={"title": "Title"},
+                                html_content=None,
+                                properties=None,
+                            )
+                        )
+                await sql_session.commit()
+
+        asyncio.run(run())
+
+    def list_all(self, session_maker, limit):
+        async def run():
+            pages = []
+            cursor = None
+            async with session_maker() as sql_session:
+                while True:
+                    page = await list_presentations(
+                        limit=limit, cursor=cursor, sql_session=sql_session
+                    )
+                    pages.append(page)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        return pages
+
+        return asyncio.run(run())
+
+    def test_pages_are_ordered_with_equal_created_at(self, session_maker):
+        same = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        newer = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        self.add_presentations(session_maker, [same] * 4 + [newer])
+
+        pages = self.list_all(session_maker, limit=2)
+        items = [item for page in pages for item in page.items]
+
+        assert [len(page.items) for page in pages] == [2, 2, 1]
+        assert len({item.id for item in items}) == 5
+        assert items[0].created_at.replace(tzinfo=timezone.utc) == newer
+        # Equal created_at values are ordered by id, none is skipped or repeated
+        same_ids = [item.id for item in items[1:]]
+        assert same_ids == sorted(same_ids, reverse=True)
+
+    def test_last_page_has_no_next_cursor(self, session_maker):
+        self.add_presentations(
+            session_maker, [datetime(2025, 1, 1, tzinfo=timezone.utc)] * 2
+        )
+
+        (page,) = self.list_all(session_maker, limit=2)
+
+        assert len(page.items) == 2
+        assert page.next_cursor is None
+        assert page.items[0].thumbnail.layout == "general:intro-slide"
+        assert "content" not in page.items[0].thumbnail.model_dump()
+
+    def test_count(self, session_maker):
+        created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.add_presentations(session_maker, [created_at] * 3)
+        # Presentations without slides aren't listed, so aren't counted
+        self.add_presentations(session_maker, [created_at], with_slides=False)
+
+        async def run():
+            async with session_maker() as sql_session:
+                return await count_presentations(sql_session=sql_session)
+
+        assert asyncio.run(run()).count == 3
+
+    def test_thumbnail_slides_are_fetched_in_one_request(self, session_maker):
+        self.add_presentations(
+            session_maker, [datetime(2025, 1, 1, tzinfo=timezone.utc)] * 3
+        )
+        (page,) = self.list_all(session_maker, limit=3)
+        ids = [item.thumbnail.id for item in page.items]
+
+        async def run():
+            async with session_maker() as sql_session:
+                return await get_slides(
+                    ids=ids + [uuid.uuid4()], sql_session=sql_session
+                )
+
+        slides = asyncio.run(run())
+
+        assert {slide.id for slide in slides} == set(ids)
+        assert all(slide.content == {"title": "Title"} for slide in slides)
+
+
+def test_missing_listing_index_is_created(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    tables = [PresentationModel.__table__]
+
+    def get_index_names(sync_conn):
+        return {
+            index["name"] for index in inspect(sync_conn).get_indexes("presentations")
+        }
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables)
+            )
+            # A table created before the index was added
+            await conn.execute(text("DROP INDEX ix_presentations_created_at_id"))
+            assert "ix_presentations_created_at_id" not in await conn.run_sync(
+                get_index_names
+            )
+
+            await conn.run_sync(
+                lambda sync_conn: create_missing_indexes(sync_conn, tables)
+            )
+            # Running again on every startup is harmless
+            await conn.run_sync(
+                lambda sync_conn: create_missing_indexes(sync_conn, tables)
+            )
+            return await conn.run_sync(get_index_names)
+
+    assert "ix_presentations_created_at_id" in asyncio.run(run())
+    asyncio.run(engine.dispose())
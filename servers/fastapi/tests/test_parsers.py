@@ -0,0 +1,21 @@
+from utils.parsers import parse_int_or_default
+
+
+def test_valid_value_is_parsed():
+    assert parse_int_or_default("8", 4, 1, "WORKERS") == 8
+
+
+def test_value_is_raised_to_minimum():
+    assert parse_int_or_default("0", 4, 1, "WORKERS") == 1
+    assert parse_int_or_default("-5", 4, 0, "WORKERS") == 0
+
+
+def test_missing_value_gives_default():
+    assert parse_int_or_default(None, 4, 1, "WORKERS") == 4
+    assert parse_int_or_default("", 4, 1, "WORKERS") == 4
+    assert parse_int_or_default(None, None, 1, "WORKERS") is None
+
+
+def test_invalid_value_gives_default(capsys):
+    assert parse_int_or_default("many", 4, 1, "WORKERS") == 4
+    assert "Invalid WORKERS: many" in capsys.readouterr().out
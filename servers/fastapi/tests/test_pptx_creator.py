@@ -1,7 +1,11 @@
 import asyncio
+import os
+from PIL import Image
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
     PptxFillModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxSlideModel,
@@ -38,3 +42,39 @@ def test_pptx_creator():
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
     asyncio.run(pptx_creator.create_ppt())
     pptx_creator.save("debug/test.pptx")
+
+
+def get_picture_box(path, left=0, border_radius=None):
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=left, top=0, width=100, height=50),
+        border_radius=border_radius,
+        picture=PptxPictureModel(is_network=False, path=path),
+    )
+
+
+def test_pictures_are_processed_once_per_transform(tmp_path):
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (300, 300), (255, 0, 0)).save(image_path)
+
+    model = PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    get_picture_box(image_path),
+                    get_picture_box(image_path, left=200),
+                    get_picture_box(image_path, border_radius=[10, 10, 10, 10]),
+                ]
+            ),
+            PptxSlideModel(shapes=[get_picture_box(image_path, left=400)]),
+        ]
+    )
+    pptx_creator = PptxPresentationCreator(model, str(tmp_path))
+    asyncio.run(pptx_creator.create_ppt())
+
+    processed_paths = list(pptx_creator._processed_pictures.values())
+    assert len(processed_paths) == 2
+    for path in processed_paths:
+        assert Image.open(path).size == (100, 50)
+
+    pptx_creator.save(str(tmp_path / "test.pptx"))
+    assert os.path.exists(tmp_path / "test.pptx")
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+from services.pptx_export_service import PptxExportService
+
+
+def test_exports_are_limited_and_counted():
+    service = PptxExportService()
+    release = threading.Event()
+
+    def export(value):
+        release.wait(5)
+        return value
+
+    async def run():
+        tasks = [asyncio.create_task(service.run(export, i)) for i in range(3)]
+        await asyncio.sleep(0.1)
+
+        status = service.get_status()
+        assert (status.running, status.waiting, status.concurrency) == (1, 2, 1)
+
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    with patch.dict(os.environ, {"PPTX_EXPORT_CONCURRENCY": "1"}):
+        assert asyncio.run(run()) == [0, 1, 2]
+
+    status = service.get_status()
+    assert (status.running, status.waiting) == (0, 0)
+    service.shutdown()
+
+
+def test_export_runs_off_the_event_loop_thread():
+    service = PptxExportService()
+
+    async def run():
+        return await service.run(threading.get_ident)
+
+    assert asyncio.run(run()) != threading.get_ident()
+    service.shutdown()
@@ -0,0 +1,114 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import os
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+import pytest
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_presentation_creator as creator_module
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    reset_picture_process_pool,
+)
+from utils.image_utils import transform_picture
+
+
+def get_picture_model(path: str) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(width=50, height=50),
+        border_radius=[5, 5, 5, 5],
+        picture=PptxPictureModel(is_network=False, path=path),
+    )
+
+
+def write_image(path: str):
+    Image.new("RGB", (100, 100), "red").save(path, format="PNG")
+
+
+def test_truncated_image_is_not_transformed(tmp_path):
+    image_path = str(tmp_path / "image.png")
+    write_image(image_path)
+    with open(image_path, "rb") as f:
+        data = f.read()
+    # The header still opens, reading the pixels fails
+    with open(image_path, "wb") as f:
+        f.write(data[: len(data) // 2])
+
+    output_path = str(tmp_path / "output.png")
+
+    assert not transform_picture(get_picture_model(image_path), output_path)
+    assert not os.path.exists(output_path)
+
+
+class TestProcessPictures:
+
+    def get_creator(self, tmp_path) -> PptxPresentationCreator:
+        image_path = str(tmp_path / "image.png")
+        write_image(image_path)
+        return PptxPresentationCreator(
+            PptxPresentationModel(
+                slides=[PptxSlideModel(shapes=[get_picture_model(image_path)])]
+            ),
+            str(tmp_path),
+        )
+
+    def test_pictures_are_transformed_in_pool(self, tmp_path):
+        creator = self.get_creator(tmp_path)
+
+        with ThreadPoolExecutor() as pool, patch.object(
+            creator_module, "get_picture_process_pool", return_value=pool
+        ):
+            asyncio.run(creator.process_pictures())
+
+        (output_path,) = creator._processed_pictures.values()
+        assert os.path.exists(output_path)
+
+    def test_broken_pool_falls_back_to_threads(self, tmp_path):
+        creator = self.get_creator(tmp_path)
+        broken_pool = MagicMock()
+        broken_pool.submit.side_effect = BrokenProcessPool("worker died")
+
+        with patch.object(
+            creator_module, "get_picture_process_pool", return_value=broken_pool
+        ), patch.object(creator_module, "reset_picture_process_pool") as reset:
+            asyncio.run(creator.process_pictures())
+
+        reset.assert_called_once_with(broken_pool)
+        (output_path,) = creator._processed_pictures.values()
+        assert os.path.exists(output_path)
+
+    def test_other_errors_do_not_reset_pool(self, tmp_path):
+        creator = self.get_creator(tmp_path)
+
+        with ThreadPoolExecutor() as pool, patch.object(
+            creator_module, "get_picture_process_pool", return_value=pool
+        ), patch.object(
+            creator_module, "transform_picture", side_effect=ValueError("bad")
+        ), patch.object(
+            creator_module, "reset_picture_process_pool"
+        ) as reset:
+            with pytest.raises(ValueError):
+                asyncio.run(creator.process_pictures())
+
+        reset.assert_not_called()
+
+
+def test_stale_pool_does_not_reset_current_one():
+    current_pool = MagicMock()
+    with patch.object(creator_module, "_picture_process_pool", current_pool):
+        reset_picture_process_pool(MagicMock())
+        assert creator_module._picture_process_pool is current_pool
+        current_pool.shutdown.assert_not_called()
+
+        reset_picture_process_pool(current_pool)
+        assert creator_module._picture_process_pool is None
+        current_pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
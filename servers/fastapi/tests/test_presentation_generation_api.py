@@ -105,8 +105,7 @@ def patch_presentation_api(monkeypatch, mock_get_layout):
 
     # Setup DocumentsLoader mock
     docs_loader = mocks[2]
-    docs_loader.return_value.load_documents = AsyncMock()
-    docs_loader.return_value.documents = []
+    docs_loader.return_value.load_context = AsyncMock(return_value="")
 
     # Setup PptxPresentationCreator mock for pptx test
     pptx_creator = mocks[9]
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import timedelta
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.presentation_generation_queue import (
+    PRESENTATION_GENERATION_QUEUE,
+    PresentationGenerationQueue,
+)
+from services.presentation_generation_worker import PresentationGenerationWorker
+from utils.datetime_utils import get_current_utc_datetime
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[PresentationGenerationJobModel.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    with patch(
+        "services.presentation_generation_queue.async_session_maker", session_maker
+    ):
+        yield session_maker
+
+
+def enqueue(session_maker, queue, task_id, priority=0):
+    async def run():
+        async with session_maker() as sql_session:
+            queue.enqueue(
+                sql_session,
+                task_id,
+                uuid.uuid4(),
+                GeneratePresentationRequest(content="Content", priority=priority),
+            )
+            await sql_session.commit()
+
+    asyncio.run(run())
+
+
+def update_job(session_maker, **values):
+    async def run():
+        async with session_maker() as sql_session:
+            await sql_session.execute(
+                update(PresentationGenerationJobModel).values(**values)
+            )
+            await sql_session.commit()
+
+    asyncio.run(run())
+
+
+def test_jobs_are_claimed_by_priority(session_maker):
+    queue = PresentationGenerationQueue()
+    enqueue(session_maker, queue, "task-low")
+    enqueue(session_maker, queue, "task-high", priority=5)
+
+    first = asyncio.run(queue.claim("worker-1"))
+    second = asyncio.run(queue.claim("worker-1"))
+
+    assert first.id == "task-high"
+    assert first.status == "leased"
+    assert first.attempts == 1
+    assert second.id == "task-low"
+    assert asyncio.run(queue.claim("worker-1")) is None
+
+
+def test_job_is_claimed_by_one_worker(session_maker):
+    queue = PresentationGenerationQueue()
+    enqueue(session_maker, queue, "task-1")
+
+    async def run():
+        return await asyncio.gather(*[queue.claim(f"worker-{i}") for i in range(4)])
+
+    claimed = [job for job in asyncio.run(run()) if job]
+    assert len(claimed) == 1
+
+
+def test_expired_lease_is_reclaimed(session_maker):
+    queue = PresentationGenerationQueue()
+    enqueue(session_maker, queue, "task-1")
+    asyncio.run(queue.claim("crashed-worker"))
+
+    assert asyncio.run(queue.claim("worker-2")) is None
+
+    update_job(
+        session_maker,
+        lease_expires_at=get_current_utc_datetime() - timedelta(seconds=1),
+    )
+    job = asyncio.run(queue.claim("worker-2"))
+
+    assert job.leased_by == "worker-2"
+    assert job.attempts == 2
+    assert not asyncio.run(queue.complete(job.id, "crashed-worker"))
+    assert asyncio.run(queue.complete(job.id, "worker-2"))
+
+
+def test_retried_job_waits_for_its_delay(session_maker):
+    queue = PresentationGenerationQueue()
+    enqueue(session_maker, queue, "task-1")
+    job = asyncio.run(queue.claim("worker-1"))
+
+    assert asyncio.run(queue.retry(job.id, "worker-1", timedelta(hours=1)))
+    assert asyncio.run(queue.claim("worker-1")) is None
+
+    assert asyncio.run(queue.retry(job.id, "worker-1", timedelta(0))) is False
+
+    update_job(
+        session_maker, available_at=get_current_utc_datetime() - timedelta(seconds=1)
+    )
+    assert asyncio.run(queue.claim("worker-1")).attempts == 2
+
+
+class TestPresentationGenerationWorker:
+
+    def get_job(self):
+        return PresentationGenerationJobModel(
+            id="task-1",
+            presentation_id=uuid.uuid4(),
+            request={},
+            attempts=1,
+            max_attempts=3,
+        )
+
+    def test_job_stops_when_lease_is_lost(self):
+        worker = PresentationGenerationWorker(concurrency=1)
+        cancelled = asyncio.Event()
+
+        async def run_job(job):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def run():
+            await asyncio.wait_for(worker.process_job(self.get_job()), 5)
+
+        with patch.object(worker, "_run_job", side_effect=run_job), patch.object(
+            PRESENTATION_GENERATION_QUEUE,
+            "get_lease_duration",
+            return_value=timedelta(seconds=0.03),
+        ), patch.object(
+            PRESENTATION_GENERATION_QUEUE,
+            "extend_lease",
+            new=AsyncMock(return_value=False),
+        ) as extend_lease:
+            asyncio.run(run())
+
+        assert cancelled.is_set()
+        extend_lease.assert_awaited_with("task-1", worker.worker_id)
+
+    def test_lease_is_kept_while_job_runs(self):
+        worker = PresentationGenerationWorker(concurrency=1)
+
+        async def run_job(job):
+            await asyncio.sleep(0.1)
+            return "done"
+
+        with patch.object(worker, "_run_job", side_effect=run_job), patch.object(
+            PRESENTATION_GENERATION_QUEUE,
+            "get_lease_duration",
+            return_value=timedelta(seconds=0.03),
+        ), patch.object(
+            PRESENTATION_GENERATION_QUEUE,
+            "extend_lease",
+            new=AsyncMock(return_value=True),
+        ) as extend_lease:
+            asyncio.run(worker.process_job(self.get_job()))
+
+        assert extend_lease.await_count >= 2
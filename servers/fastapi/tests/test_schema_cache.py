@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+
+from models.presentation_layout import SlideLayoutModel
+from utils import schema_cache
+from utils.schema_cache import (
+    clear_compiled_schemas,
+    get_slide_response_schema,
+    get_strict_json_schema,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_compiled_schemas()
+    yield
+    clear_compiled_schemas()
+
+
+def get_slide_layout(title_max_length=50):
+    return SlideLayoutModel(
+        id="general:intro-slide",
+        json_schema={
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "maxLength": title_max_length},
+                "image": {
+                    "type": "object",
+                    "properties": {
+                        "__image_url__": {"type": "string"},
+                        "__image_prompt__": {"type": "string"},
+                    },
+                    "required": ["__image_url__", "__image_prompt__"],
+                },
+            },
+            "required": ["title", "image"],
+        },
+    )
+
+
+def test_slide_response_schema():
+    schema = get_slide_response_schema(get_slide_layout())
+
+    image = schema["properties"]["image"]
+    assert "__image_url__" not in image["properties"]
+    assert image["required"] == ["__image_prompt__"]
+    assert "__speaker_note__" in schema["properties"]
+    assert "__speaker_note__" in schema["required"]
+
+
+def test_slide_response_schema_is_compiled_once_per_layout():
+    with patch.object(
+        schema_cache,
+        "remove_fields_from_schema",
+        wraps=schema_cache.remove_fields_from_schema,
+    ) as mock_remove_fields:
+        first = get_slide_response_schema(get_slide_layout())
+        second = get_slide_response_schema(get_slide_layout())
+        assert first == second
+        assert mock_remove_fields.call_count == 1
+
+        # A changed template schema under the same id is compiled again
+        changed = get_slide_response_schema(get_slide_layout(title_max_length=80))
+        assert changed["properties"]["title"]["maxLength"] == 80
+        assert mock_remove_fields.call_count == 2
+
+
+def test_strict_schema_does_not_mutate_input():
+    schema = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+    strict_schema = get_strict_json_schema(schema)
+
+    assert strict_schema["additionalProperties"] is False
+    assert strict_schema["required"] == ["title"]
+    assert "additionalProperties" not in schema
+    assert get_strict_json_schema(schema) == strict_schema
+
+
+def test_returned_schemas_can_be_modified():
+    first = get_slide_response_schema(get_slide_layout())
+    first["properties"]["__speaker_note__"]["maxLength"] = 10
+    first["required"].append("extra")
+
+    second = get_slide_response_schema(get_slide_layout())
+
+    assert second["properties"]["__speaker_note__"]["maxLength"] == 250
+    assert "extra" not in second["required"]
+    assert schema_cache.SPEAKER_NOTE_FIELD["__speaker_note__"]["maxLength"] == 250
+
+
+def test_layout_schema_is_hashed_once():
+    slide_layout = get_slide_layout()
+
+    with patch.object(
+        schema_cache, "get_schema_hash", wraps=schema_cache.get_schema_hash
+    ) as mock_get_schema_hash:
+        get_slide_response_schema(slide_layout)
+        get_slide_response_schema(slide_layout)
+
+    assert mock_get_schema_hash.call_count == 1
@@ -0,0 +1,85 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.slide_diff import save_slides_diff
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slides.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[PresentationModel.__table__, SlideModel.__table__],
+                )
+            )
+
+    asyncio.run(create_tables())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def get_slide(presentation_id, index, title):
+    return SlideModel(
+        presentation=presentation_id,
+        layout_group="general",
+        layout="general:intro-slide",
+        index=index,
+        content={"title": title},
+        html_content=None,
+        properties=None,
+    )
+
+
+def test_only_changed_slides_are_written(session_maker):
+    presentation_id = uuid.uuid4()
+    slides = [get_slide(presentation_id, i, f"Slide {i}") for i in range(3)]
+
+    async def run():
+        async with session_maker() as sql_session:
+            diff = await save_slides_diff(sql_session, presentation_id, slides)
+            await sql_session.commit()
+            assert len(diff.to_insert) == 3
+
+        # Same slides again, nothing to write
+        async with session_maker() as sql_session:
+            diff = await save_slides_diff(sql_session, presentation_id, slides)
+            assert diff.is_empty()
+
+        changed = slides[1].model_copy(update={"content": {"title": "Changed"}})
+        added = get_slide(presentation_id, 2, "Added")
+        async with session_maker() as sql_session:
+            diff = await save_slides_diff(
+                sql_session, presentation_id, [slides[0], changed, added]
+            )
+            await sql_session.commit()
+
+        assert [each["id"] for each in diff.to_update] == [changed.id]
+        assert [each["id"] for each in diff.to_insert] == [added.id]
+        assert diff.to_delete == [slides[2].id]
+
+        async with session_maker() as sql_session:
+            stored = (
+                await sql_session.scalars(
+                    select(SlideModel)
+                    .where(SlideModel.presentation == presentation_id)
+                    .order_by(SlideModel.index)
+                )
+            ).all()
+        return stored
+
+    stored = asyncio.run(run())
+
+    assert [slide.content["title"] for slide in stored] == [
+        "Slide 0",
+        "Changed",
+        "Added",
+    ]
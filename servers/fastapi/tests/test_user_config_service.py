@@ -0,0 +1,103 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+import services.user_config_service as user_config_service
+from services.user_config_service import UserConfigService
+from utils.llm_provider import get_model
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = os.path.join(tmp_path, "userConfig.json")
+    with patch.dict(
+        os.environ,
+        {"USER_CONFIG_PATH": path, "CAN_CHANGE_KEYS": "true", "LLM": "openai"},
+    ):
+        for name in ("OPENAI_MODEL", "IMAGE_PROVIDER"):
+            os.environ.pop(name, None)
+        yield path
+
+
+def write_config(path, config, mtime=None):
+    with open(path, "w") as f:
+        json.dump(config, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def count_loads():
+    return patch.object(
+        user_config_service,
+        "get_user_config",
+        wraps=user_config_service.get_user_config,
+    )
+
+
+def test_snapshot_is_loaded_once(config_path):
+    write_config(config_path, {"OPENAI_MODEL": "gpt-4.1"})
+    service = UserConfigService()
+
+    with count_loads() as get_user_config:
+        for _ in range(10):
+            assert service.get_snapshot().OPENAI_MODEL == "gpt-4.1"
+
+    assert get_user_config.call_count == 1
+
+
+def test_snapshot_reloads_when_file_changes(config_path):
+    write_config(config_path, {"OPENAI_MODEL": "gpt-4.1"}, mtime=1000)
+    service = UserConfigService()
+    assert service.get_snapshot().OPENAI_MODEL == "gpt-4.1"
+
+    write_config(config_path, {"OPENAI_MODEL": "gpt-4o"}, mtime=2000)
+
+    assert service.get_snapshot().OPENAI_MODEL == "gpt-4o"
+
+
+def test_snapshot_reloads_when_env_changes(config_path):
+    service = UserConfigService()
+    assert service.get_snapshot().IMAGE_PROVIDER is None
+
+    with patch.dict(os.environ, {"IMAGE_PROVIDER": "pexels"}):
+        assert service.get_snapshot().IMAGE_PROVIDER == "pexels"
+
+
+def test_file_is_ignored_when_keys_cant_change(config_path):
+    write_config(config_path, {"OPENAI_MODEL": "gpt-4o"})
+    service = UserConfigService()
+
+    with patch.dict(os.environ, {"CAN_CHANGE_KEYS": "false"}):
+        assert service.get_snapshot().OPENAI_MODEL is None
+
+
+def test_snapshot_is_immutable(config_path):
+    snapshot = UserConfigService().get_snapshot()
+
+    with pytest.raises(ValidationError):
+        snapshot.LLM = "google"
+
+
+def test_refresh_applies_changes_once(config_path):
+    write_config(config_path, {"LLM": "google", "GOOGLE_MODEL": "gemini"})
+    service = UserConfigService()
+
+    with patch.object(
+        user_config_service.LLM_CLIENT_REGISTRY, "invalidate"
+    ) as invalidate:
+        assert service.refresh()
+        assert not service.refresh()
+
+    assert os.environ["LLM"] == "google"
+    assert os.environ["GOOGLE_MODEL"] == "gemini"
+    assert invalidate.call_count == 1
+
+
+def test_readers_use_the_snapshot(config_path):
+    write_config(config_path, {"OPENAI_MODEL": "gpt-4o"})
+
+    with patch("utils.llm_provider.USER_CONFIG_SERVICE", UserConfigService()):
+        assert get_model() == "gpt-4o"
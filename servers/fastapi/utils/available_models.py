@@ -18,4 +18,5 @@ async def list_available_anthropic_models(api_key: str) -> list[str]:
 
 async def list_available_google_models(api_key: str) -> list[str]:
     client = genai.Client(api_key=api_key)
-    return list(map(lambda x: x.name, client.models.list(config={"page_size": 50})))
+    models = await client.aio.models.list(config={"page_size": 50})
+    return [model.name async for model in models]
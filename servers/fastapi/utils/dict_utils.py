@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from models.json_path_guide import JsonPathGuide, DictGuide, ListGuide
 
@@ -22,6 +22,31 @@ def get_dict_paths_with_key(data: dict, key: str) -> List[JsonPathGuide]:
     return result
 
 
+def get_dicts_with_keys(data: dict | list, keys: List[str]) -> Dict[str, List[dict]]:
+    """
+    Walks the data once and returns, for every key, the dicts containing it
+    in document order. The dicts are references into data, so updating them
+    updates data in place.
+    """
+    result = {key: [] for key in keys}
+
+    def _find_dicts(obj):
+        if isinstance(obj, dict):
+            for key in keys:
+                if key in obj:
+                    result[key].append(obj)
+            for value in obj.values():
+                if isinstance(value, (dict, list)):
+                    _find_dicts(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                if isinstance(item, (dict, list)):
+                    _find_dicts(item)
+
+    _find_dicts(data)
+    return result
+
+
 def get_dict_at_path(data: dict, path: JsonPathGuide) -> dict:
     current = data
     for guide in path.guides:
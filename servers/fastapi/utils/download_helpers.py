@@ -4,11 +4,24 @@ import mimetypes
 from typing import List, Optional
 from urllib.parse import urlparse
 
-import aiohttp
-
+from constants.http_client import DOWNLOAD_FILES_CONCURRENCY
+from services.http_client_service import HTTP_CLIENT
 import uuid
 
 
+def get_filename_from_headers(headers) -> Optional[str]:
+    content_disposition = headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        return content_disposition.split("filename=")[1].strip("\"'")
+
+    content_type = headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0])
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+    return None
+
+
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
@@ -18,40 +31,22 @@ async def download_file(
         parsed_url = urlparse(url)
         filename = os.path.basename(parsed_url.path)
 
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+        async with HTTP_CLIENT.get(url, headers=headers) as response:
+            if response.status != 200:
+                print(f"Failed to download file. HTTP status: {response.status}")
+                return None
+
+            # Name taken from the response headers instead of a separate HEAD request
+            if not filename or "." not in filename:
+                filename = get_filename_from_headers(response.headers)
+
+            filename = filename or str(uuid.uuid4())
+            save_path = os.path.join(save_directory, filename)
+            with open(save_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(65536):
+                    file.write(chunk)
+            print(f"File downloaded successfully: {save_path}")
+            return save_path
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
@@ -62,7 +57,13 @@ async def download_files(
     urls: List[str], save_directory: str, headers: Optional[dict] = None
 ) -> List[Optional[str]]:
     print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
+    semaphore = asyncio.Semaphore(DOWNLOAD_FILES_CONCURRENCY)
+
+    async def download_file_with_limit(url: str) -> Optional[str]:
+        async with semaphore:
+            return await download_file(url, save_directory, headers)
+
+    coroutines = [download_file_with_limit(url) for url in urls]
     results = await asyncio.gather(*coroutines, return_exceptions=True)
     final_results = []
     for i, result in enumerate(results):
@@ -1,65 +1,133 @@
 import json
 import os
-import aiohttp
-from typing import Literal
+from typing import Literal, Optional
 import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.http_client_service import HTTP_CLIENT
 from services.pptx_presentation_creator import PptxPresentationCreator
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
-import uuid
+from sqlmodel import select
+
+
+async def get_export_cache_key(
+    presentation_id: uuid.UUID, export_as: Literal["pptx", "pdf"]
+) -> Optional[str]:
+    async with async_session_maker() as sql_session:
+        presentation = await sql_session.get(PresentationModel, presentation_id)
+        if not presentation:
+            return None
+        slides = list(
+            await sql_session.scalars(
+                select(SlideModel).where(SlideModel.presentation == presentation_id)
+            )
+        )
+
+        # Slides of custom templates are rendered with the template's layout code
+        template_ids = set()
+        for layout_group in {slide.layout_group for slide in slides}:
+            if layout_group.startswith("custom-"):
+                try:
+                    template_ids.add(uuid.UUID(layout_group.replace("custom-", "")))
+                except ValueError:
+                    pass
+        layout_codes = []
+        if template_ids:
+            layout_codes = await sql_session.scalars(
+                select(PresentationLayoutCodeModel).where(
+                    PresentationLayoutCodeModel.presentation.in_(template_ids)
+                )
+            )
+
+        return EXPORT_CACHE_SERVICE.get_key(
+            presentation, slides, export_as, list(layout_codes)
+        )
 
 
 async def export_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
+) -> PresentationAndPath:
+    cache_key = None
+    if EXPORT_CACHE_SERVICE.is_enabled():
+        cache_key = await get_export_cache_key(presentation_id, export_as)
+
+    # Unchanged presentation, reuse the previous export
+    if cache_key:
+        export_path = os.path.join(
+            get_exports_directory(),
+            f"{sanitize_filename(title or str(uuid.uuid4()))}.{export_as}",
+        )
+        if await EXPORT_CACHE_SERVICE.get(
+            presentation_id, cache_key, export_as, export_path
+        ):
+            return PresentationAndPath(
+                presentation_id=presentation_id,
+                path=export_path,
+            )
+
+    presentation_and_path = await _export_presentation(
+        presentation_id, title, export_as
+    )
+    if cache_key:
+        await EXPORT_CACHE_SERVICE.set(
+            presentation_id, cache_key, export_as, presentation_and_path.path
+        )
+    return presentation_and_path
+
+
+async def _export_presentation(
+    presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
     if export_as == "pptx":
 
         # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+        async with HTTP_CLIENT.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}",
+            trust_env=False,
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
 
         # Create PPTX file using the converted model
         pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
-
         export_directory = get_exports_directory()
         pptx_path = os.path.join(
             export_directory,
             f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
         )
-        pptx_creator.save(pptx_path)
+        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+        await pptx_creator.create_and_save_ppt(pptx_path)
 
         return PresentationAndPath(
             presentation_id=presentation_id,
             path=pptx_path,
         )
     else:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost/api/export-as-pdf",
-                json={
-                    "id": str(presentation_id),
-                    "title": sanitize_filename(title or str(uuid.uuid4())),
-                },
-            ) as response:
-                response_json = await response.json()
+        async with HTTP_CLIENT.post(
+            "http://localhost/api/export-as-pdf",
+            json={
+                "id": str(presentation_id),
+                "title": sanitize_filename(title or str(uuid.uuid4())),
+            },
+            trust_env=False,
+        ) as response:
+            response_json = await response.json()
 
         return PresentationAndPath(
             presentation_id=presentation_id,
@@ -95,3 +95,99 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_slide_generation_concurrency_env():
+    return os.getenv("SLIDE_GENERATION_CONCURRENCY")
+
+
+def get_llm_response_cache_env():
+    return os.getenv("LLM_RESPONSE_CACHE")
+
+
+def get_llm_response_cache_ttl_env():
+    return os.getenv("LLM_RESPONSE_CACHE_TTL")
+
+
+def get_llm_response_cache_max_entries_env():
+    return os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES")
+
+
+def get_layout_cache_ttl_env():
+    return os.getenv("LAYOUT_CACHE_TTL")
+
+
+def get_asset_cache_max_entries_env():
+    return os.getenv("ASSET_CACHE_MAX_ENTRIES")
+
+
+def get_generated_image_cache_max_entries_env():
+    return os.getenv("GENERATED_IMAGE_CACHE_MAX_ENTRIES")
+
+
+def get_run_presentation_worker_env():
+    return os.getenv("RUN_PRESENTATION_WORKER")
+
+
+def get_presentation_worker_concurrency_env():
+    return os.getenv("PRESENTATION_WORKER_CONCURRENCY")
+
+
+def get_presentation_job_max_attempts_env():
+    return os.getenv("PRESENTATION_JOB_MAX_ATTEMPTS")
+
+
+def get_presentation_job_lease_seconds_env():
+    return os.getenv("PRESENTATION_JOB_LEASE_SECONDS")
+
+
+def get_export_cache_max_size_mb_env():
+    return os.getenv("EXPORT_CACHE_MAX_SIZE_MB")
+
+
+def get_pptx_image_workers_env():
+    return os.getenv("PPTX_IMAGE_WORKERS")
+
+
+def get_pptx_export_concurrency_env():
+    return os.getenv("PPTX_EXPORT_CONCURRENCY")
+
+
+def get_http_client_limit_per_host_env():
+    return os.getenv("HTTP_CLIENT_LIMIT_PER_HOST")
+
+
+def get_http_client_timeout_env():
+    return os.getenv("HTTP_CLIENT_TIMEOUT")
+
+
+def get_http_client_retries_env():
+    return os.getenv("HTTP_CLIENT_RETRIES")
+
+
+def get_image_download_cache_max_size_mb_env():
+    return os.getenv("IMAGE_DOWNLOAD_CACHE_MAX_SIZE_MB")
+
+
+def get_icon_search_backend_env():
+    return os.getenv("ICON_SEARCH_BACKEND")
+
+
+def get_document_parse_workers_env():
+    return os.getenv("DOCUMENT_PARSE_WORKERS")
+
+
+def get_document_cache_max_size_mb_env():
+    return os.getenv("DOCUMENT_CACHE_MAX_SIZE_MB")
+
+
+def get_docling_max_documents_per_worker_env():
+    return os.getenv("DOCLING_MAX_DOCUMENTS_PER_WORKER")
+
+
+def get_docling_warm_up_env():
+    return os.getenv("DOCLING_WARM_UP")
+
+
+def get_document_context_token_budget_env():
+    return os.getenv("DOCUMENT_CONTEXT_TOKEN_BUDGET")
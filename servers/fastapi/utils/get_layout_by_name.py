@@ -1,18 +1,51 @@
-import aiohttp
+import time
+from typing import Dict, Optional, Tuple
+
 from fastapi import HTTPException
+
+from constants.presentation import DEFAULT_LAYOUT_CACHE_TTL
 from models.presentation_layout import PresentationLayoutModel
-from typing import List
+from services.http_client_service import HTTP_CLIENT
+from utils.get_env import get_layout_cache_ttl_env
+from utils.parsers import parse_int_or_default
+
+# 模板布局缓存：layout_name -> (过期时间, 解析后的布局)
+_layout_cache: Dict[str, Tuple[float, PresentationLayoutModel]] = {}
+
+
+def get_layout_cache_ttl() -> int:
+    return parse_int_or_default(
+        get_layout_cache_ttl_env(), DEFAULT_LAYOUT_CACHE_TTL, 0, "LAYOUT_CACHE_TTL"
+    )
+
+
+def invalidate_layout_cache(layout_name: Optional[str] = None):
+    if layout_name is None:
+        _layout_cache.clear()
+    else:
+        _layout_cache.pop(layout_name, None)
+
 
 async def get_layout_by_name(layout_name: str) -> PresentationLayoutModel:
+    cached = _layout_cache.get(layout_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
     url = f"http://localhost/api/template?group={layout_name}"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Template '{layout_name}' not found: {error_text}"
-                )
-            layout_json = await response.json()
+    async with HTTP_CLIENT.get(url, trust_env=False) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Template '{layout_name}' not found: {error_text}"
+            )
+        layout_json = await response.json()
     # Parse the JSON into your Pydantic model
-    return PresentationLayoutModel(**layout_json)
+    layout = PresentationLayoutModel(**layout_json)
+    # Precompute the prompt text while the layout is being cached
+    layout.to_string()
+
+    ttl = get_layout_cache_ttl()
+    if ttl:
+        _layout_cache[layout_name] = (time.monotonic() + ttl, layout)
+    return layout
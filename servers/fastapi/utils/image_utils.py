@@ -2,7 +2,12 @@ from typing import List
 
 from PIL import Image, ImageDraw
 
-from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+)
 
 
 def clip_image(
@@ -256,3 +261,66 @@ def fit_image(
         return image.resize((width, height), Image.LANCZOS)
 
     return image
+
+
+def picture_needs_transform(picture_model: PptxPictureBoxModel) -> bool:
+    return bool(
+        picture_model.clip
+        or picture_model.border_radius
+        or picture_model.invert
+        or picture_model.opacity
+        or picture_model.object_fit
+        or picture_model.shape
+    )
+
+
+def transform_picture(picture_model: PptxPictureBoxModel, output_path: str) -> bool:
+    """
+    Applies the clip, fit, corner, shape, invert and opacity settings of a
+    picture box to its image and saves the result as png. Runs in worker
+    processes, returns False if the image could not be opened or processed.
+    """
+    try:
+        image = Image.open(picture_model.picture.path)
+    except:
+        print(f"Could not open image: {picture_model.picture.path}")
+        return False
+
+    try:
+        return _transform_image(image, picture_model, output_path)
+    except Exception as e:
+        # e.g. a truncated image only fails once its data is read
+        print(f"Could not process image {picture_model.picture.path}: {e}")
+        return False
+
+
+def _transform_image(
+    image: Image.Image, picture_model: PptxPictureBoxModel, output_path: str
+) -> bool:
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.object_fit:
+        image = fit_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+            picture_model.object_fit,
+        )
+    elif picture_model.clip:
+        image = clip_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+        )
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+        image = create_circle_image(image)
+    if picture_model.invert:
+        image = invert_image(image)
+    if picture_model.opacity:
+        image = set_image_opacity(image, picture_model.opacity)
+    image.save(output_path, format="PNG")
+    return True
@@ -6,7 +6,7 @@ from models.sql.slide import SlideModel
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.schema_cache import get_slide_response_schema
 
 
 def get_system_prompt(
@@ -44,8 +44,8 @@ def get_user_prompt(prompt: str, slide_data: dict, language: str):
         ## Icon Query And Image Prompt Language
         English
 
-        ## Current Date and Time
-        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        ## Current Date
+        {datetime.now().strftime("%Y-%m-%d")}
 
         ## Slide Content Language
         {language}
@@ -87,21 +87,7 @@ async def get_edited_slide_content(
 ):
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
-    )
+    response_schema = get_slide_response_schema(slide_layout)
 
     client = LLMClient()
     try:
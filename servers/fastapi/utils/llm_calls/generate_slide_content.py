@@ -6,7 +6,7 @@ from models.presentation_outline_model import SlideOutlineModel
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.schema_cache import get_slide_response_schema
 
 
 def get_system_prompt(
@@ -66,8 +66,8 @@ def get_system_prompt(
 
 def get_user_prompt(outline: str, language: str):
     return f"""
-        ## Current Date and Time
-        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        ## Current Date
+        {datetime.now().strftime("%Y-%m-%d")}
 
         ## Icon Query And Image Prompt Language
         English
@@ -105,25 +105,12 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    use_cache: bool = True,
 ):
     client = LLMClient()
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
-    )
+    response_schema = get_slide_response_schema(slide_layout)
 
     try:
         response = await client.generate_structured(
@@ -137,6 +124,7 @@ async def get_slide_content_from_type_and_outline(
             ),
             response_format=response_schema,
             strict=False,
+            use_cache=use_cache,
         )
         return response
 
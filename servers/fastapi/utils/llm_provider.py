@@ -4,21 +4,17 @@ from constants.llm import (
     DEFAULT_ANTHROPIC_MODEL,
     DEFAULT_GOOGLE_MODEL,
     DEFAULT_OPENAI_MODEL,
+    DEFAULT_SLIDE_GENERATION_CONCURRENCY,
 )
 from enums.llm_provider import LLMProvider
-from utils.get_env import (
-    get_anthropic_model_env,
-    get_custom_model_env,
-    get_google_model_env,
-    get_llm_provider_env,
-    get_ollama_model_env,
-    get_openai_model_env,
-)
+from services.user_config_service import USER_CONFIG_SERVICE
+from utils.get_env import get_slide_generation_concurrency_env
+from utils.parsers import parse_int_or_default
 
 
 def get_llm_provider():
     try:
-        return LLMProvider(get_llm_provider_env())
+        return LLMProvider(USER_CONFIG_SERVICE.get_snapshot().LLM)
     except:
         raise HTTPException(
             status_code=500,
@@ -47,19 +43,32 @@ def is_custom_llm_selected():
 
 
 def get_model():
+    user_config = USER_CONFIG_SERVICE.get_snapshot()
     selected_llm = get_llm_provider()
     if selected_llm == LLMProvider.OPENAI:
-        return get_openai_model_env() or DEFAULT_OPENAI_MODEL
+        return user_config.OPENAI_MODEL or DEFAULT_OPENAI_MODEL
     elif selected_llm == LLMProvider.GOOGLE:
-        return get_google_model_env() or DEFAULT_GOOGLE_MODEL
+        return user_config.GOOGLE_MODEL or DEFAULT_GOOGLE_MODEL
     elif selected_llm == LLMProvider.ANTHROPIC:
-        return get_anthropic_model_env() or DEFAULT_ANTHROPIC_MODEL
+        return user_config.ANTHROPIC_MODEL or DEFAULT_ANTHROPIC_MODEL
     elif selected_llm == LLMProvider.OLLAMA:
-        return get_ollama_model_env()
+        return user_config.OLLAMA_MODEL
     elif selected_llm == LLMProvider.CUSTOM:
-        return get_custom_model_env()
+        return user_config.CUSTOM_MODEL
     else:
         raise HTTPException(
             status_code=500,
             detail=f"Invalid LLM provider. Please select one of: openai, google, anthropic, ollama, custom",
         )
+
+
+def get_slide_generation_concurrency() -> int:
+    concurrency = parse_int_or_default(
+        get_slide_generation_concurrency_env(),
+        None,
+        1,
+        "SLIDE_GENERATION_CONCURRENCY",
+    )
+    if concurrency is None:
+        return DEFAULT_SLIDE_GENERATION_CONCURRENCY.get(get_llm_provider().value, 4)
+    return concurrency
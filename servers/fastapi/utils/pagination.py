@@ -0,0 +1,21 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+import uuid
+
+from fastapi import HTTPException
+
+
+# 游标分页：游标编码最后一条记录的 (created_at, id)
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
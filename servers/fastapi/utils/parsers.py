@@ -2,3 +2,18 @@ def parse_bool_or_none(value: str | None) -> bool | None:
     if value is None:
         return None
     return value.lower() == "true"
+
+
+def parse_int_or_default(
+    value: str | None, default: int | None, minimum: int, name: str
+) -> int | None:
+    """
+    Parses an integer setting, at least minimum. Missing or invalid values
+    give the default, invalid ones are reported with the setting name.
+    """
+    if value:
+        try:
+            return max(int(value), minimum)
+        except ValueError:
+            print(f"Invalid {name}: {value}")
+    return default
@@ -1,12 +1,20 @@
 import asyncio
 from typing import List, Tuple
+from constants.presentation import ICON_PLACEHOLDER_URL
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from models.sql.slide import SlideModel
 from services.icon_finder_service import ICON_FINDER_SERVICE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
-from utils.dict_utils import get_dict_at_path, get_dict_paths_with_key, set_dict_at_path
+from utils.dict_utils import get_dicts_with_keys
+
+
+def get_image_and_icon_dicts(slide_content: dict) -> Tuple[List[dict], List[dict]]:
+    asset_dicts = get_dicts_with_keys(
+        slide_content, ["__image_prompt__", "__icon_query__"]
+    )
+    return asset_dicts["__image_prompt__"], asset_dicts["__icon_query__"]
 
 
 async def process_slide_and_fetch_assets(
@@ -14,45 +22,35 @@ async def process_slide_and_fetch_assets(
     slide: SlideModel,
 ) -> List[ImageAsset]:
 
-    async_tasks = []
+    image_dicts, icon_dicts = get_image_and_icon_dicts(slide.content)
 
-    image_paths = get_dict_paths_with_key(slide.content, "__image_prompt__")
-    icon_paths = get_dict_paths_with_key(slide.content, "__icon_query__")
-
-    for image_path in image_paths:
-        __image_prompt__parent = get_dict_at_path(slide.content, image_path)
-        async_tasks.append(
-            image_generation_service.generate_image(
-                ImagePrompt(
-                    prompt=__image_prompt__parent["__image_prompt__"],
+    images, icons = await asyncio.gather(
+        asyncio.gather(
+            *[
+                image_generation_service.generate_image(
+                    ImagePrompt(
+                        prompt=image_dict["__image_prompt__"],
+                    )
                 )
-            )
-        )
-
-    for icon_path in icon_paths:
-        __icon_query__parent = get_dict_at_path(slide.content, icon_path)
-        async_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(__icon_query__parent["__icon_query__"])
-        )
-
-    results = await asyncio.gather(*async_tasks)
-    results.reverse()
+                for image_dict in image_dicts
+            ]
+        ),
+        ICON_FINDER_SERVICE.search_icons_many(
+            [icon_dict["__icon_query__"] for icon_dict in icon_dicts],
+            wait_for_index=True,
+        ),
+    )
 
     return_assets = []
-    for image_path in image_paths:
-        image_dict = get_dict_at_path(slide.content, image_path)
-        result = results.pop()
+    for image_dict, result in zip(image_dicts, images):
         if isinstance(result, ImageAsset):
             return_assets.append(result)
             image_dict["__image_url__"] = result.path
         else:
             image_dict["__image_url__"] = result
-        set_dict_at_path(slide.content, image_path, image_dict)
 
-    for icon_path in icon_paths:
-        icon_dict = get_dict_at_path(slide.content, icon_path)
-        icon_dict["__icon_url__"] = results.pop()[0]
-        set_dict_at_path(slide.content, icon_path, icon_dict)
+    for icon_dict, fetched_icons in zip(icon_dicts, icons):
+        icon_dict["__icon_url__"] = fetched_icons[0]
 
     return return_assets
 
@@ -62,125 +60,80 @@ async def process_old_and_new_slides_and_fetch_assets(
     old_slide_content: dict,
     new_slide_content: dict,
 ) -> List[ImageAsset]:
-    # Finds all old images
-    old_image_dict_paths = get_dict_paths_with_key(
-        old_slide_content, "__image_prompt__"
-    )
-    old_image_dicts = [
-        get_dict_at_path(old_slide_content, path) for path in old_image_dict_paths
-    ]
-    old_image_prompts = [
-        old_image_dict["__image_prompt__"] for old_image_dict in old_image_dicts
-    ]
-
-    # Finds all old icons
-    old_icon_dict_paths = get_dict_paths_with_key(old_slide_content, "__icon_query__")
-    old_icon_dicts = [
-        get_dict_at_path(old_slide_content, path) for path in old_icon_dict_paths
-    ]
-    old_icon_queries = [
-        old_icon_dict["__icon_query__"] for old_icon_dict in old_icon_dicts
-    ]
-
-    # Finds all new images
-    new_image_dict_paths = get_dict_paths_with_key(
-        new_slide_content, "__image_prompt__"
-    )
-    new_image_dicts = [
-        get_dict_at_path(new_slide_content, path) for path in new_image_dict_paths
-    ]
-
-    # Finds all new icons
-    new_icon_dict_paths = get_dict_paths_with_key(new_slide_content, "__icon_query__")
-    new_icon_dicts = [
-        get_dict_at_path(new_slide_content, path) for path in new_icon_dict_paths
-    ]
-
-    # Creates async tasks for fetching new images
-    async_image_fetch_tasks = []
-    new_images_fetch_status = []
-
-    # Creates async tasks for fetching new icons
-    async_icon_fetch_tasks = []
-    new_icons_fetch_status = []
-
-    # Creates async tasks for fetching new images
-    # Use old image url if prompt is same
-    for new_image in new_image_dicts:
-        if new_image["__image_prompt__"] in old_image_prompts:
-            old_image_url = old_image_dicts[
-                old_image_prompts.index(new_image["__image_prompt__"])
-            ]["__image_url__"]
-            new_image["__image_url__"] = old_image_url
-            new_images_fetch_status.append(False)
-            continue
-
-        async_image_fetch_tasks.append(
-            image_generation_service.generate_image(
-                ImagePrompt(
-                    prompt=new_image["__image_prompt__"],
-                )
+    # Maps old image prompts and icon queries to their urls
+    old_image_dicts, old_icon_dicts = get_image_and_icon_dicts(old_slide_content)
+    old_image_urls = {}
+    for old_image_dict in old_image_dicts:
+        if "__image_url__" in old_image_dict:
+            old_image_urls.setdefault(
+                old_image_dict["__image_prompt__"], old_image_dict["__image_url__"]
+            )
+    old_icon_urls = {}
+    for old_icon_dict in old_icon_dicts:
+        if "__icon_url__" in old_icon_dict:
+            old_icon_urls.setdefault(
+                old_icon_dict["__icon_query__"], old_icon_dict["__icon_url__"]
             )
-        )
-        new_images_fetch_status.append(True)
-
-    # Creates async tasks for fetching new icons
-    # Use old icon url if query is same
-    for new_icon in new_icon_dicts:
-        if new_icon["__icon_query__"] in old_icon_queries:
-            old_icon_url = old_icon_dicts[
-                old_icon_queries.index(new_icon["__icon_query__"])
-            ]["__icon_url__"]
-            new_icon["__icon_url__"] = old_icon_url
-            new_icons_fetch_status.append(False)
-            continue
-
-        async_icon_fetch_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(new_icon["__icon_query__"])
-        )
-        new_icons_fetch_status.append(True)
-
-    new_images = await asyncio.gather(*async_image_fetch_tasks)
-    new_icons = await asyncio.gather(*async_icon_fetch_tasks)
 
-    # list of new assets
-    new_assets = []
+    new_image_dicts, new_icon_dicts = get_image_and_icon_dicts(new_slide_content)
 
-    # Sets new image and icon urls for assets that were fetched
-    for i, new_image in enumerate(new_images):
-        if new_images_fetch_status[i]:
-            fetched_image = new_images[i]
-            if isinstance(fetched_image, ImageAsset):
-                new_assets.append(fetched_image)
-                image_url = fetched_image.path
-            else:
-                image_url = fetched_image
-            new_image_dicts[i]["__image_url__"] = image_url
+    # Use old image url if prompt is same, otherwise fetch a new one
+    images_to_fetch = []
+    for new_image_dict in new_image_dicts:
+        if new_image_dict["__image_prompt__"] in old_image_urls:
+            new_image_dict["__image_url__"] = old_image_urls[
+                new_image_dict["__image_prompt__"]
+            ]
+        else:
+            images_to_fetch.append(new_image_dict)
+
+    # Use old icon url if query is same, otherwise search a new one
+    icons_to_fetch = []
+    for new_icon_dict in new_icon_dicts:
+        if new_icon_dict["__icon_query__"] in old_icon_urls:
+            new_icon_dict["__icon_url__"] = old_icon_urls[
+                new_icon_dict["__icon_query__"]
+            ]
+        else:
+            icons_to_fetch.append(new_icon_dict)
 
-    for i, new_icon in enumerate(new_icons):
-        if new_icons_fetch_status[i]:
-            new_icon_dicts[i]["__icon_url__"] = new_icons[i][0]
+    new_images, new_icons = await asyncio.gather(
+        asyncio.gather(
+            *[
+                image_generation_service.generate_image(
+                    ImagePrompt(prompt=image_dict["__image_prompt__"])
+                )
+                for image_dict in images_to_fetch
+            ]
+        ),
+        ICON_FINDER_SERVICE.search_icons_many(
+            [icon_dict["__icon_query__"] for icon_dict in icons_to_fetch],
+            wait_for_index=True,
+        ),
+    )
 
-    for i, new_image_dict in enumerate(new_image_dicts):
-        set_dict_at_path(new_slide_content, new_image_dict_paths[i], new_image_dict)
+    # list of new assets
+    new_assets = []
+
+    for image_dict, fetched_image in zip(images_to_fetch, new_images):
+        if isinstance(fetched_image, ImageAsset):
+            new_assets.append(fetched_image)
+            image_dict["__image_url__"] = fetched_image.path
+        else:
+            image_dict["__image_url__"] = fetched_image
 
-    for i, new_icon_dict in enumerate(new_icon_dicts):
-        set_dict_at_path(new_slide_content, new_icon_dict_paths[i], new_icon_dict)
+    for icon_dict, fetched_icons in zip(icons_to_fetch, new_icons):
+        icon_dict["__icon_url__"] = fetched_icons[0]
 
     return new_assets
 
 
 def process_slide_add_placeholder_assets(slide: SlideModel):
 
-    image_paths = get_dict_paths_with_key(slide.content, "__image_prompt__")
-    icon_paths = get_dict_paths_with_key(slide.content, "__icon_query__")
+    image_dicts, icon_dicts = get_image_and_icon_dicts(slide.content)
 
-    for image_path in image_paths:
-        image_dict = get_dict_at_path(slide.content, image_path)
+    for image_dict in image_dicts:
         image_dict["__image_url__"] = "/static/images/placeholder.jpg"
-        set_dict_at_path(slide.content, image_path, image_dict)
 
-    for icon_path in icon_paths:
-        icon_dict = get_dict_at_path(slide.content, icon_path)
-        icon_dict["__icon_url__"] = "/static/icons/placeholder.svg"
-        set_dict_at_path(slide.content, icon_path, icon_dict)
+    for icon_dict in icon_dicts:
+        icon_dict["__icon_url__"] = ICON_PLACEHOLDER_URL
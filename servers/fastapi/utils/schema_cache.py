@@ -0,0 +1,101 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Callable, Hashable
+
+from models.presentation_layout import SlideLayoutModel
+from utils.schema_utils import (
+    add_field_in_schema,
+    ensure_strict_json_schema,
+    flatten_json_schema,
+    remove_fields_from_schema,
+    remove_titles_from_schema,
+)
+
+MAX_COMPILED_SCHEMAS = 512
+
+SPEAKER_NOTE_FIELD = {
+    "__speaker_note__": {
+        "type": "string",
+        "minLength": 100,
+        "maxLength": 250,
+        "description": "Speaker note for the slide",
+    }
+}
+
+# 编译后的 schema 在所有请求间共享，每次返回副本
+_compiled_schemas: OrderedDict[Hashable, dict] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_schema_hash(schema: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def get_slide_layout_schema_hash(slide_layout: SlideLayoutModel) -> str:
+    # Layouts are reused through the layout cache, so this is hashed once
+    if slide_layout._schema_hash is None:
+        slide_layout._schema_hash = get_schema_hash(slide_layout.json_schema)
+    return slide_layout._schema_hash
+
+
+def get_compiled_schema(key: Hashable, build: Callable[[], dict]) -> dict:
+    """
+    Returns a copy of the schema compiled for key, callers are free to
+    modify it.
+    """
+    with _lock:
+        schema = _compiled_schemas.get(key)
+        if schema is not None:
+            _compiled_schemas.move_to_end(key)
+            return deepcopy(schema)
+
+    schema = build()
+    with _lock:
+        _compiled_schemas[key] = schema
+        _compiled_schemas.move_to_end(key)
+        while len(_compiled_schemas) > MAX_COMPILED_SCHEMAS:
+            _compiled_schemas.popitem(last=False)
+    return deepcopy(schema)
+
+
+def clear_compiled_schemas():
+    with _lock:
+        _compiled_schemas.clear()
+
+
+def get_slide_response_schema(slide_layout: SlideLayoutModel) -> dict:
+    """
+    Schema the LLM fills for a slide layout: asset urls removed and a
+    required speaker note added.
+    """
+
+    def build():
+        schema = remove_fields_from_schema(
+            slide_layout.json_schema, ["__image_url__", "__icon_url__"]
+        )
+        return add_field_in_schema(schema, deepcopy(SPEAKER_NOTE_FIELD), True)
+
+    return get_compiled_schema(
+        ("slide", slide_layout.id, get_slide_layout_schema_hash(slide_layout)),
+        build,
+    )
+
+
+def get_strict_json_schema(schema: dict) -> dict:
+    def build():
+        strict_schema = deepcopy(schema)
+        return ensure_strict_json_schema(strict_schema, path=(), root=strict_schema)
+
+    return get_compiled_schema(("strict", get_schema_hash(schema)), build)
+
+
+def get_google_json_schema(schema: dict) -> dict:
+    return get_compiled_schema(
+        ("google", get_schema_hash(schema)),
+        lambda: remove_titles_from_schema(flatten_json_schema(schema)),
+    )
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+import hashlib
+import json
+from typing import List
+import uuid
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from models.sql.slide import SlideModel
+
+# 参与比较的字段，id 和所属 presentation 不计入内容哈希
+SLIDE_HASH_FIELDS = (
+    "layout_group",
+    "layout",
+    "index",
+    "content",
+    "html_content",
+    "speaker_note",
+    "properties",
+)
+
+
+@dataclass
+class SlidesDiff:
+    to_insert: List[dict] = field(default_factory=list)
+    to_update: List[dict] = field(default_factory=list)
+    to_delete: List[uuid.UUID] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.to_insert or self.to_update or self.to_delete)
+
+
+def get_slide_hash(slide: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            {key: slide.get(key) for key in SLIDE_HASH_FIELDS},
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def diff_slides(existing: List[dict], incoming: List[SlideModel]) -> SlidesDiff:
+    """
+    Compares the stored slides with the ones sent by the editor by id and
+    content hash. Only new, changed and removed slides end up in the diff.
+    """
+    existing_hashes = {slide["id"]: get_slide_hash(slide) for slide in existing}
+
+    diff = SlidesDiff()
+    incoming_ids = set()
+    for slide in incoming:
+        slide_dict = slide.model_dump()
+        incoming_ids.add(slide.id)
+
+        existing_hash = existing_hashes.get(slide.id)
+        if existing_hash is None:
+            diff.to_insert.append(slide_dict)
+        elif existing_hash != get_slide_hash(slide_dict):
+            diff.to_update.append(slide_dict)
+
+    diff.to_delete = [id for id in existing_hashes if id not in incoming_ids]
+    return diff
+
+
+async def save_slides_diff(
+    sql_session: AsyncSession, presentation_id: uuid.UUID, slides: List[SlideModel]
+) -> SlidesDiff:
+    """
+    Writes only the slides that changed, with one bulk statement per kind
+    of change. The caller commits, so the diff is applied in one transaction.
+    """
+    columns = [SlideModel.id] + [getattr(SlideModel, key) for key in SLIDE_HASH_FIELDS]
+    result = await sql_session.execute(
+        select(*columns).where(SlideModel.presentation == presentation_id)
+    )
+    existing = [dict(row._mapping) for row in result]
+
+    diff = diff_slides(existing, slides)
+    if diff.to_delete:
+        await sql_session.execute(
+            delete(SlideModel).where(SlideModel.id.in_(diff.to_delete))
+        )
+    if diff.to_update:
+        await sql_session.execute(update(SlideModel), diff.to_update)
+    if diff.to_insert:
+        await sql_session.execute(insert(SlideModel), diff.to_insert)
+    return diff
@@ -1,5 +1,6 @@
 import os
 import json
+from typing import Optional
 
 from models.user_config import UserConfig
 from utils.get_env import (
@@ -48,12 +49,12 @@ from utils.set_env import (
 )
 
 
-def get_user_config():
+def get_user_config(read_file: bool = True):
     user_config_path = get_user_config_path_env()
 
     existing_config = UserConfig()
     try:
-        if os.path.exists(user_config_path):
+        if read_file and user_config_path and os.path.exists(user_config_path):
             with open(user_config_path, "r") as f:
                 existing_config = UserConfig(**json.load(f))
     except Exception as e:
@@ -101,8 +102,14 @@ def get_user_config():
     )
 
 
-def update_env_with_user_config():
-    user_config = get_user_config()
+def update_env_with_user_config(user_config: Optional[UserConfig] = None) -> bool:
+    """
+    Applies user config to environment variables, the one read from the
+    config file when none is given.
+    Returns True if any environment variable was changed.
+    """
+    previous_env = dict(os.environ)
+    user_config = user_config or get_user_config()
     if user_config.LLM:
         set_llm_provider_env(user_config.LLM)
     if user_config.OPENAI_API_KEY:
@@ -141,3 +148,5 @@ def update_env_with_user_config():
         set_extended_reasoning_env(str(user_config.EXTENDED_REASONING))
     if user_config.WEB_GROUNDING is not None:
         set_web_grounding_env(str(user_config.WEB_GROUNDING))
+
+    return dict(os.environ) != previous_env
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import os
+import signal
+
+from services.database import create_db_and_tables
+from services.docling_pool_service import DOCLING_POOL_SERVICE
+from services.http_client_service import HTTP_CLIENT
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.presentation_generation_worker import PresentationGenerationWorker
+from utils.get_env import get_app_data_directory_env
+
+
+async def main(concurrency: int | None):
+    os.makedirs(get_app_data_directory_env(), exist_ok=True)
+    await create_db_and_tables()
+    ICON_FINDER_SERVICE.start_initialization()
+    DOCLING_POOL_SERVICE.start_warm_up()
+
+    worker = PresentationGenerationWorker(concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        DOCLING_POOL_SERVICE.shutdown()
+        await HTTP_CLIENT.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a worker for async presentation generation jobs"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of presentations generated at once",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency))
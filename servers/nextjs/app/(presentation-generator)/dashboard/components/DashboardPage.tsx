@@ -13,6 +13,8 @@ const DashboardPage: React.FC = () => {
   const [presentations, setPresentations] = useState<any>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     const loadData = async () => {
@@ -26,11 +28,8 @@ const DashboardPage: React.FC = () => {
       setIsLoading(true);
       setError(null);
       const data = await DashboardApi.getPresentations();
-      data.sort(
-        (a: any, b: any) =>
-          new Date(b.updated_at).getTime() - new Date(a.updated_at).getTime()
-      );
-      setPresentations(data);
+      setPresentations(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(null);
       setPresentations([]);
@@ -39,6 +38,20 @@ const DashboardPage: React.FC = () => {
     }
   };
 
+  const fetchMorePresentations = async () => {
+    if (!nextCursor) return;
+    try {
+      setIsLoadingMore(true);
+      const data = await DashboardApi.getPresentations(nextCursor);
+      setPresentations((prev: any) => [...(prev || []), ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error("Error fetching more presentations:", err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const removePresentation = (presentationId: string) => {
     setPresentations((prev: any) =>
       prev ? prev.filter((p: any) => p.id !== presentationId) : []
@@ -61,6 +74,17 @@ const DashboardPage: React.FC = () => {
               error={error}
               onPresentationDeleted={removePresentation}
             />
+            {!isLoading && nextCursor && (
+              <div className="flex justify-center mt-8">
+                <button
+                  onClick={fetchMorePresentations}
+                  disabled={isLoadingMore}
+                  className="px-6 py-2 rounded-lg bg-white/70 hover:bg-white/90 border border-gray-400 text-gray-700 disabled:opacity-50 transition-all duration-300"
+                >
+                  {isLoadingMore ? "Loading..." : "Load more"}
+                </button>
+              </div>
+            )}
           </section>
         </main>
       </Wrapper>
@@ -1,4 +1,4 @@
-import React, { useMemo } from "react";
+import React from "react";
 
 import { Card } from "@/components/ui/card";
 import { DashboardApi } from "@/app/(presentation-generator)/services/api/dashboard";
@@ -22,7 +22,7 @@ export const PresentationCard = ({
   id: string;
   title: string;
   created_at: string;
-  slide: any;
+  slide?: any | null;
   onDeleted?: (presentationId: string) => void;
 }) => {
   const router = useRouter();
@@ -92,7 +92,7 @@ export const PresentationCard = ({
         >
           <div className="absolute bg-transparent z-40 top-0 left-0 w-full h-full" />
           <div className="transform scale-[0.2] flex justify-center items-center origin-top-left  w-[500%] h-[500%]">
-            {renderSlideContent(slide, false)}
+            {slide && renderSlideContent(slide, false)}
           </div>
         </div>
 
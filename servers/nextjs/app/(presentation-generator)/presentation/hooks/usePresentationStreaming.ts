@@ -48,10 +48,14 @@ export const usePresentationStreaming = (
                   partialData.slides.length !== previousSlidesLength.current &&
                   partialData.slides.length > 0
                 ) {
+                  // Slides can arrive out of order when generated concurrently
+                  const orderedSlides = [...partialData.slides].sort(
+                    (a: any, b: any) => (a?.index ?? 0) - (b?.index ?? 0)
+                  );
                   dispatch(
                     setPresentationData({
                       ...partialData,
-                      slides: partialData.slides,
+                      slides: orderedSlides,
                     })
                   );
                   previousSlidesLength.current = partialData.slides.length;
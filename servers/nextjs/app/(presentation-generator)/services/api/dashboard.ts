@@ -18,16 +18,35 @@ export interface PresentationResponse {
     user_id: string;
     vector_store: any;
 
-    thumbnail: string;
-    slides: any[];
+    // Reference to the first slide
+    thumbnail: SlideThumbnail;
+    // First slide with its content, fetched for the whole page with getSlides
+    slide?: any | null;
+}
+
+export interface SlideThumbnail {
+  id: string;
+  layout_group: string;
+  layout: string;
+}
+
+export interface PresentationPageResponse {
+  items: PresentationResponse[];
+  next_cursor: string | null;
 }
 
 export class DashboardApi {
 
-  static async getPresentations(): Promise<PresentationResponse[]> {
+  static async getPresentations(
+    cursor?: string | null
+  ): Promise<PresentationPageResponse> {
     try {
+      const params = new URLSearchParams({ limit: "20" });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
       const response = await fetch(
-        `/api/v1/ppt/presentation/all`,
+        `/api/v1/ppt/presentation/list?${params.toString()}`,
         {
           method: "GET",
         }
@@ -36,10 +55,11 @@ export class DashboardApi {
       // Handle the special case where 404 means "no presentations found"
       if (response.status === 404) {
         console.log("No presentations found");
-        return [];
+        return { items: [], next_cursor: null };
       }
       
-      return await ApiResponseHandler.handleResponse(response, "Failed to fetch presentations");
+      const page: PresentationPageResponse = await ApiResponseHandler.handleResponse(response, "Failed to fetch presentations");
+      return { ...page, items: await DashboardApi.withSlides(page.items) };
     } catch (error) {
       console.error("Error fetching presentations:", error);
       throw error;
@@ -62,6 +82,46 @@ export class DashboardApi {
     }
   }
   
+  static async getSlides(ids: string[]): Promise<any[]> {
+    try {
+      const params = new URLSearchParams();
+      ids.forEach((id) => params.append("ids", id));
+      const response = await fetch(
+        `/api/v1/ppt/slide/batch?${params.toString()}`,
+        {
+          method: "GET",
+        }
+      );
+
+      return await ApiResponseHandler.handleResponse(response, "Failed to fetch slides");
+    } catch (error) {
+      console.error("Error fetching slides:", error);
+      throw error;
+    }
+  }
+
+  // Attaches the first slide of every presentation, one request per page
+  static async withSlides(
+    items: PresentationResponse[]
+  ): Promise<PresentationResponse[]> {
+    if (items.length === 0) {
+      return items;
+    }
+    try {
+      const slides = await DashboardApi.getSlides(
+        items.map((item) => item.thumbnail.id)
+      );
+      const slidesById = new Map(slides.map((slide) => [slide.id, slide]));
+      return items.map((item) => ({
+        ...item,
+        slide: slidesById.get(item.thumbnail.id) ?? null,
+      }));
+    } catch (error) {
+      // Cards are still listed without their preview
+      return items;
+    }
+  }
+
   static async deletePresentation(presentation_id: string) {
     try {
       const response = await fetch(